@@ -0,0 +1,149 @@
+# pipeline/db/backtest.py: Bankroll simulation of many staking strategies at once over priced historical bets
+
+from __future__ import annotations
+
+import itertools
+from typing import Iterable, Optional, Sequence
+
+import duckdb
+from . import pricing
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+STAKINGS = ('flat', 'kelly')
+
+# A bankroll at or below this (rounding left over from staking all of it) counts as ruined
+RUIN_BANKROLL = 1e-9
+
+# Strategies simulated per block, sized so each strategies x bets array of a block stays near 16 MB
+_BLOCK_CELLS = 2_000_000
+
+
+def load_bets(con: duckdb.DuckDBPyConnection, seasons: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """Candidate bets from features.market_edges with their results and closing lines, in game-date order.
+
+    Each game and side keeps its best-priced book. closing_prob is the side's de-vigged probability at the
+    closing consensus line in raw.odds (NaN when the game has none), the reference for closing-line value.
+    """
+    season_filter = "AND g.season IN (SELECT UNNEST($seasons))" if seasons is not None else ""
+    bets = con.execute(f"""
+        SELECT e.game_id, g.game_date, e.book, e.side, e.decimal_odds, e.fair_prob, e.model_prob,
+            CASE WHEN e.side = 'home' THEN g.home_runs > g.away_runs ELSE g.away_runs > g.home_runs END AS won,
+            o.moneyline_home, o.moneyline_away
+        FROM features.market_edges e
+        JOIN raw.games g USING (game_id)
+        LEFT JOIN raw.odds o USING (game_id)
+        WHERE e.model_prob IS NOT NULL AND g.home_runs IS NOT NULL AND g.away_runs IS NOT NULL {season_filter}
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY e.game_id, e.side ORDER BY e.decimal_odds DESC, e.book) = 1
+        ORDER BY g.game_date, e.game_id, e.side;
+    """, {'seasons': list(seasons)} if seasons is not None else {}).fetchdf()
+    closing = bets[['moneyline_home', 'moneyline_away']].to_numpy(dtype=float)
+    fair = pricing.devig(pricing.implied_probability(pricing.american_to_decimal(closing)), 'multiplicative')
+    bets['closing_prob'] = np.where(bets['side'] == 'home', fair[:, 0], fair[:, 1])
+    return bets.drop(columns=['moneyline_home', 'moneyline_away'])
+
+
+def strategy_grid(stakings: Sequence[str] = STAKINGS, sizes: Sequence[float] = (0.01, 0.25, 0.5),
+                  min_edges: Sequence[float] = (0.0, 0.02, 0.04), max_stakes: Sequence[float] = (0.05,)) -> pd.DataFrame:
+    """Every combination of staking rule, size, edge threshold and stake cap, one strategy per row.
+
+    `size` is the share of the starting bankroll staked per bet for flat staking and the Kelly fraction for
+    kelly staking; `max_stake` caps any single bet as a share of the bankroll it is sized from.
+    """
+    grid = pd.DataFrame(list(itertools.product(stakings, sizes, min_edges, max_stakes)),
+                        columns=['staking', 'size', 'min_edge', 'max_stake'])
+    unknown = set(grid['staking']) - set(STAKINGS)
+    if unknown:
+        raise ValueError(f"Unknown staking rules {sorted(unknown)}; expected some of {STAKINGS}.")
+    return grid
+
+
+def simulate(bets: pd.DataFrame, strategies: pd.DataFrame) -> pd.DataFrame:
+    """Simulate every strategy over the same bets and report bets, staked, ROI, drawdown and CLV per strategy.
+
+    Stakes are sized from the bankroll at the start of each game day, so a day's bets settle together.
+    Flat stakes are fixed units of the starting bankroll (profits add up); Kelly stakes are shares of the
+    current bankroll (profits compound). A day's stakes are scaled down to at most the current bankroll,
+    and a strategy that loses everything stops betting at 0. Strategies are rows and bets are columns of
+    every array, and days are summed with a segmented reduction, so there is no loop over bets; only flat
+    strategies that run short of a day's stakes are replayed day by day. Bankrolls start at 1.
+    """
+    if bets.empty:
+        return strategies.reset_index(drop=True).assign(bets=0, staked=0.0, profit=0.0, roi=np.nan,
+                                                        final_bankroll=1.0, max_drawdown=0.0, clv=np.nan)
+    decimal = bets['decimal_odds'].to_numpy(dtype=float)
+    edge = (bets['model_prob'] - bets['fair_prob']).to_numpy(dtype=float)
+    kelly = pricing.kelly_stake(bets['model_prob'].to_numpy(dtype=float), decimal, fraction=1.0)
+    returns = np.where(bets['won'].to_numpy(dtype=bool), decimal - 1, -1.0)
+    clv = bets['closing_prob'].to_numpy(dtype=float) * decimal - 1
+    _, day_start = np.unique(bets['game_date'].to_numpy(), return_index=True)
+    day_of_bet = np.repeat(np.arange(len(day_start)), np.diff(np.append(day_start, len(bets))))
+
+    block = max(1, _BLOCK_CELLS // max(1, len(bets)))
+    results = [_simulate_block(strategies.iloc[i:i + block], edge, kelly, returns, clv, day_start, day_of_bet)
+               for i in range(0, len(strategies), block)]
+    return pd.concat([strategies.reset_index(drop=True), pd.concat(results, ignore_index=True)], axis=1)
+
+
+def _simulate_block(strategies: pd.DataFrame, edge: np.ndarray, kelly: np.ndarray, returns: np.ndarray,
+                    clv: np.ndarray, day_start: np.ndarray, day_of_bet: np.ndarray) -> pd.DataFrame:
+    n = len(strategies)
+    compounding = (strategies['staking'].to_numpy() == 'kelly')[:, None]
+    size = strategies['size'].to_numpy(dtype=float)[:, None]
+    cap = strategies['max_stake'].to_numpy(dtype=float)[:, None]
+    taken = edge[None, :] >= strategies['min_edge'].to_numpy(dtype=float)[:, None]
+    # Share of the sizing bankroll staked on each bet: the starting bankroll for flat, the day's for Kelly
+    share = np.where(taken, np.minimum(np.where(compounding, size * kelly[None, :], size), cap), 0.0)
+    # A day's Kelly bets never stake more than the whole bankroll; larger totals are scaled down pro rata
+    day_total = np.add.reduceat(share, day_start, axis=1)
+    share = np.where(compounding, share / np.maximum(day_total, 1.0)[:, day_of_bet], share)
+    day_total = np.where(compounding, np.minimum(day_total, 1.0), day_total)
+    daily = np.add.reduceat(share * returns[None, :], day_start, axis=1)
+
+    # Bankroll at the end of every day: additive for flat, multiplicative for Kelly. Once a day ends with
+    # nothing left the bettor is ruined: the bankroll stays at 0 and no later bet is placed.
+    path = np.where(compounding, np.cumprod(1 + daily, axis=1), 1 + np.cumsum(daily, axis=1))
+    # Flat units can add up to more than a losing strategy has left; those days are cut to the bankroll,
+    # which makes the path depend on every earlier day, so such strategies are replayed day by day
+    short = ~compounding[:, 0] & (day_total > np.hstack([np.ones((n, 1)), path[:, :-1]])).any(axis=1)
+    if short.any():
+        path[short] = _capped_flat_path(day_total[short], daily[short])
+    path = np.where(np.maximum.accumulate(path <= RUIN_BANKROLL, axis=1), 0.0, path)
+    # ... and at the start of every day and after the last
+    path = np.hstack([np.ones((n, 1)), path])
+    start = path[:, :-1]
+    cut = np.divide(start, day_total, out=np.ones_like(start), where=day_total > 0)
+    share = share * np.where(compounding, start > 0, np.minimum(cut, 1.0))[:, day_of_bet]
+    stake = share * np.where(compounding, path[:, day_of_bet], 1.0)
+    drawdown = 1 - path / np.maximum.accumulate(path, axis=1)
+
+    placed = stake > 0
+    bets = placed.sum(axis=1)
+    staked = stake.sum(axis=1)
+    profit = path[:, -1] - 1
+    priced = placed & ~np.isnan(clv)[None, :]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({
+            'bets': bets,
+            'staked': staked,
+            'profit': profit,
+            'roi': np.where(staked > 0, profit / staked, np.nan),
+            'final_bankroll': path[:, -1],
+            'max_drawdown': drawdown.max(axis=1),
+            # Mean closing-line value of the bets placed that have a closing line
+            'clv': np.where(priced, np.nan_to_num(clv)[None, :], 0).sum(axis=1) / priced.sum(axis=1),
+        })
+
+
+def _capped_flat_path(day_total: np.ndarray, daily: np.ndarray) -> np.ndarray:
+    """End-of-day bankrolls of flat strategies (rows) whose stakes on each day are cut to the bankroll."""
+    path = np.empty_like(daily)
+    bankroll = np.ones(len(daily))
+    for day in range(daily.shape[1]):
+        cut = np.divide(bankroll, day_total[:, day], out=np.ones_like(bankroll), where=day_total[:, day] > 0)
+        bankroll = bankroll + np.minimum(cut, 1.0) * daily[:, day]
+        bankroll[bankroll <= RUIN_BANKROLL] = 0.0
+        path[:, day] = bankroll
+    return path
@@ -0,0 +1,193 @@
+# pipeline/db/cache.py: In-process caches for fetched data frames
+
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+
+class FrameCache:
+    """Thread-safe LRU cache with a per-entry time-to-live.
+
+    Entries are evicted when the cache holds more than `max_entries` items (least recently used first)
+    or when they are older than `ttl_seconds`. A `ttl_seconds` of None disables expiry.
+    """
+
+    def __init__(self, max_entries: int = 8, ttl_seconds: Optional[float] = 6 * 60 * 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._loading: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries beyond max_entries."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader() and caching its result on a miss.
+
+        Concurrent misses on the same key wait for a single loader call instead of each downloading.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self.get(key)
+            if value is None:
+                value = loader()
+                self.put(key, value)
+        with self._lock:
+            self._loading.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def write_parquet(frame: "pd.DataFrame", path: str, compression: str = 'zstd') -> int:
+    """Write a frame to Parquet atomically (temp file, then rename); returns the file size in bytes.
+
+    Columns mixing types (numbers and '--' placeholders) cannot be typed, so those are stored as text.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        try:
+            frame.to_parquet(tmp, compression=compression)
+        except Exception:
+            mixed = [c for c in frame.columns if frame[c].dtype == object]
+            print(f"Warning: Writing {os.path.basename(path)} with {mixed} as strings.")
+            frame.astype({c: 'string' for c in mixed}).to_parquet(tmp, compression=compression)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return os.path.getsize(path)
+
+
+class ParquetCache:
+    """Size-bounded LRU cache of frames on disk as compressed Parquet, kept across restarts.
+
+    Entries live at <directory>/<namespace>/<key>.parquet; a file's modification time is when it was
+    stored and its access time when it was last read, so a new process picks up both freshness and LRU
+    order from one directory scan. Once the files exceed `max_bytes`, the least recently read are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 2 * 1024 ** 3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.expired = self.evictions = 0
+        self._lock = threading.Lock()
+        # path -> size, least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        found = []
+        if os.path.isdir(directory):
+            for namespace in os.scandir(directory):
+                if namespace.is_dir():
+                    found += [(e.stat().st_atime, e.path, e.stat().st_size) for e in os.scandir(namespace.path)
+                              if e.name.endswith('.parquet')]
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+
+    def path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.directory, namespace, re.sub(r'[^\w.-]', '-', key) + '.parquet')
+
+    def get(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> Optional["pd.DataFrame"]:
+        """Return the stored frame, or None if missing or stored more than `ttl_seconds` ago (None: never expires)."""
+        path = self.path(namespace, key)
+        with self._lock:
+            if path not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                stored_at = os.stat(path).st_mtime
+            except FileNotFoundError:
+                del self._entries[path]
+                self.misses += 1
+                return None
+            if ttl_seconds is not None and time.time() - stored_at > ttl_seconds:
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+        os.utime(path, (time.time(), stored_at))
+        return pd.read_parquet(path)
+
+    def contains(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> bool:
+        """Whether get() would return a frame, without reading it or counting a hit or miss."""
+        path = self.path(namespace, key)
+        with self._lock:
+            if path not in self._entries:
+                return False
+        try:
+            stored_at = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return False
+        return ttl_seconds is None or time.time() - stored_at <= ttl_seconds
+
+    def put(self, namespace: str, key: str, frame: "pd.DataFrame") -> None:
+        """Store a frame, evicting the least recently read entries beyond max_bytes."""
+        path = self.path(namespace, key)
+        size = write_parquet(frame, path)
+        with self._lock:
+            self._entries[path] = size
+            self._entries.move_to_end(path)
+            total = sum(self._entries.values())
+            while total > self.max_bytes and len(self._entries) > 1:
+                evicted, evicted_size = self._entries.popitem(last=False)
+                total -= evicted_size
+                self.evictions += 1
+                try:
+                    os.remove(evicted)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, expiry and eviction counts since start, plus the entries and bytes on disk."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'expired': self.expired, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': sum(self._entries.values())}
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        with self._lock:
+            for path in self._entries:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
@@ -0,0 +1,209 @@
+# pipeline/db/export.py: Season-partitioned Parquet snapshots of the raw and features layers
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import duckdb
+from .pool import DEFAULT_DATABASE
+from .refresh import DERIVED_TABLES, refresh
+from .schema import bootstrap
+from .lazy import lazy_import
+
+pa = lazy_import('pyarrow')
+
+EXPORT_SCHEMAS = ('raw', 'features')
+MANIFEST = 'manifest.json'
+PARTITION_COLUMN = 'season'
+
+
+def _tables(con: duckdb.DuckDBPyConnection, tables: Optional[Iterable[str]]) -> Dict[str, List[List[str]]]:
+    """Columns and types, in table order, of every exported table (or of `tables`)."""
+    rows = con.execute("""
+        SELECT table_schema || '.' || table_name, column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema IN (SELECT UNNEST($schemas)) AND table_catalog = current_database()
+        ORDER BY table_schema, table_name, ordinal_position;
+    """, {'schemas': list(EXPORT_SCHEMAS)}).fetchall()
+    columns: Dict[str, List[List[str]]] = {}
+    for table, column, data_type in rows:
+        columns.setdefault(table, []).append([column, data_type])
+    if tables is not None:
+        unknown = sorted(set(tables) - set(columns))
+        if unknown:
+            raise ValueError(f"Cannot export {unknown}; expected tables of the {EXPORT_SCHEMAS} schemas.")
+        columns = {table: columns[table] for table in tables}
+    return columns
+
+
+def _quote(path: str) -> str:
+    return "'" + path.replace("'", "''") + "'"
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No snapshot manifest at {path}; run db-export first.")
+    with open(path) as f:
+        return json.load(f)
+
+
+def export_parquet(con: duckdb.DuckDBPyConnection, directory: str, tables: Optional[Iterable[str]] = None,
+                   seasons: Optional[Iterable[int]] = None, compression: str = 'zstd') -> Dict[str, Any]:
+    """Write raw.* and features.* tables as Parquet under `directory` and record them in manifest.json.
+
+    Tables with a season column are written hive-style, one <schema>/<table>/season=<n>/ directory per
+    season; the others as a single file. With `seasons`, only those partitions are rewritten and the rest
+    of an earlier export is kept (unpartitioned tables are always rewritten whole). Returns the manifest.
+    """
+    manifest_path = os.path.join(directory, MANIFEST)
+    manifest = read_manifest(directory) if os.path.exists(manifest_path) else {'tables': {}}
+    seasons = sorted(set(seasons)) if seasons is not None else None
+    for table, columns in _tables(con, tables).items():
+        path = os.path.join(directory, *table.split('.'))
+        partitioned = any(name == PARTITION_COLUMN for name, _ in columns)
+        previous = manifest['tables'].get(table, {}).get('partitions') or {}
+        if partitioned and seasons is not None:
+            for season in seasons:
+                shutil.rmtree(os.path.join(path, f"{PARTITION_COLUMN}={season}"), ignore_errors=True)
+            where = f"WHERE {PARTITION_COLUMN} IN ({', '.join(str(int(s)) for s in seasons)})"
+            partitions = {k: v for k, v in previous.items() if int(k) not in seasons}
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+            where, partitions = '', {}
+        os.makedirs(path, exist_ok=True)
+
+        if partitioned:
+            counts = con.execute(f"SELECT {PARTITION_COLUMN}, COUNT(*) FROM {table} {where} GROUP BY ALL").fetchall()
+            partitions.update({str(season): rows for season, rows in counts if season is not None})
+            if counts:
+                con.execute(f"""
+                    COPY (SELECT * FROM {table} {where}) TO {_quote(path)}
+                    (FORMAT parquet, COMPRESSION {compression}, PARTITION_BY ({PARTITION_COLUMN}), OVERWRITE_OR_IGNORE);
+                """)
+        else:
+            rows = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            if rows:
+                con.execute(f"""
+                    COPY {table} TO {_quote(os.path.join(path, 'data_0.parquet'))}
+                    (FORMAT parquet, COMPRESSION {compression});
+                """)
+        manifest['tables'][table] = {
+            'columns': columns,
+            'partition_by': PARTITION_COLUMN if partitioned else None,
+            'partitions': dict(sorted(partitions.items())) if partitioned else None,
+            'rows': sum(partitions.values()) if partitioned else rows,
+            'bytes': sum(os.path.getsize(os.path.join(root, name))
+                         for root, _, names in os.walk(path) for name in names),
+        }
+    manifest['exported_at'] = datetime.now(timezone.utc).isoformat()
+    manifest['tables'] = dict(sorted(manifest['tables'].items()))
+    tmp = f"{manifest_path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
+    return manifest
+
+
+def _scan(directory: str, table: str, spec: Dict[str, Any]) -> str:
+    """SQL reading one exported table with its original column order and types."""
+    columns = ', '.join(f'"{name}"' for name, _ in spec['columns'])
+    if not spec['rows']:
+        typed = ', '.join(f'CAST(NULL AS {data_type}) AS "{name}"' for name, data_type in spec['columns'])
+        return f"SELECT {typed} WHERE false"
+    files = _quote(os.path.join(directory, *table.split('.'), '**', '*.parquet'))
+    if spec['partition_by']:
+        partition_type = dict(spec['columns'])[spec['partition_by']]
+        return (f"SELECT {columns} FROM read_parquet({files}, hive_partitioning = true, "
+                f"hive_types = {{'{spec['partition_by']}': {partition_type}}})")
+    return f"SELECT {columns} FROM read_parquet({files})"
+
+
+def attach_parquet(con: duckdb.DuckDBPyConnection, directory: str,
+                   tables: Optional[Sequence[str]] = None) -> List[str]:
+    """Expose an exported snapshot as views named like the original tables (raw.games, ...); returns them.
+
+    Nothing is read until a view is queried, and filters on season skip every other partition's files.
+    Use a connection without the pipeline's own tables, e.g. duckdb.connect().
+    """
+    manifest = read_manifest(directory)
+    names = list(tables) if tables is not None else list(manifest['tables'])
+    for table in names:
+        schema = table.split('.')[0]
+        con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        exists = con.execute("""
+            SELECT COUNT(*) FROM information_schema.tables
+            WHERE table_schema || '.' || table_name = $table AND table_type = 'BASE TABLE'
+        """, {'table': table}).fetchone()[0]
+        if exists:
+            raise ValueError(f"{table} already exists as a table; attach snapshots to a fresh connection.")
+        con.execute(f"CREATE OR REPLACE VIEW {table} AS {_scan(directory, table, manifest['tables'][table])}")
+    return names
+
+
+def restore_parquet(con: duckdb.DuckDBPyConnection, directory: str) -> Dict[str, int]:
+    """Replace a pipeline database's tables with an exported snapshot and rebuild the derived tables.
+
+    Derived tables in the snapshot are skipped, since the full refresh rebuilds them from raw. Returns the
+    rows written per table.
+    """
+    manifest = read_manifest(directory)
+    bootstrap(con)
+    derived = {t.name for t in DERIVED_TABLES}
+    written = {}
+    con.execute("BEGIN TRANSACTION")
+    try:
+        for table, spec in manifest['tables'].items():
+            if table in derived:
+                continue
+            columns = ', '.join(f'"{name}"' for name, _ in spec['columns'])
+            con.execute(f"DELETE FROM {table}")
+            written[table] = con.execute(f"""
+                INSERT INTO {table} ({columns}) {_scan(directory, table, spec)}
+            """).fetchone()[0]
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    refresh(con, full=True)
+    return written
+
+
+def dataset(directory: str, table: str):
+    """A pyarrow dataset over one exported table, read through memory maps rather than copies.
+
+    Filter on season (`.to_table(filter=pyarrow.dataset.field('season') == 2024)`) to read one partition.
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.fs as fs
+    spec = read_manifest(directory)['tables'][table]
+    partitioning = None
+    if spec['partition_by']:
+        partitioning = ds.partitioning(pa.schema([(spec['partition_by'], pa.int32())]), flavor='hive')
+    return ds.dataset(os.path.join(directory, *table.split('.')), format='parquet', partitioning=partitioning,
+                      filesystem=fs.LocalFileSystem(use_mmap=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export raw and features tables as season-partitioned Parquet.")
+    parser.add_argument('directory', help="Snapshot directory (manifest.json plus <schema>/<table>/ files).")
+    parser.add_argument('--tables', nargs='+', default=None, help="Tables to export (default: all raw.* and features.*).")
+    parser.add_argument('--seasons', type=int, nargs='+', default=None, help="Only rewrite these seasons' partitions.")
+    parser.add_argument('--database', default=DEFAULT_DATABASE, help="DuckDB database to export from.")
+    args = parser.parse_args()
+    con = duckdb.connect(database=args.database, read_only=True)
+    try:
+        manifest = export_parquet(con, args.directory, args.tables, args.seasons)
+    finally:
+        con.close()
+    for table, spec in manifest['tables'].items():
+        print(f"{table:<40}{spec['rows']:>10} rows{spec['bytes'] / 1e6:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# pipeline/db/fetch.py: Cached access to pybaseball data sources
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from . import trace
+from .cache import FrameCache, ParquetCache
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+pyb = lazy_import('pybaseball')
+
+# Full-league leaderboards are large and change at most a few times a day, so keep a handful of seasons in memory
+_season_frames = FrameCache(max_entries=8, ttl_seconds=6 * 60 * 60)
+
+
+class PybaseballBackend:
+    """Live source: every call goes to pybaseball (and the sites behind it)."""
+
+    def batting_stats(self, season: int) -> pd.DataFrame:
+        return pyb.batting_stats(season, ind=1, qual=0)
+
+    def pitching_stats(self, season: int) -> pd.DataFrame:
+        return pyb.pitching_stats(season, ind=1, qual=0)
+
+    def team_batting(self, season: int) -> pd.DataFrame:
+        return pyb.team_batting(season)
+
+    def team_pitching(self, season: int) -> pd.DataFrame:
+        return pyb.team_pitching(season)
+
+    def schedule_and_record(self, season: int, team: str) -> pd.DataFrame:
+        return pyb.schedule_and_record(season, team)
+
+    def chadwick_register(self) -> pd.DataFrame:
+        return pyb.chadwick_register()
+
+    def statcast(self, start: str, end: str) -> pd.DataFrame:
+        # Callers parallelize across date windows, so pybaseball's own day-level pool stays off
+        return pyb.statcast(start, end, verbose=False, parallel=False)
+
+
+# Seconds a cached response of an in-progress season stays fresh; responses for past seasons never expire
+ENDPOINT_TTLS = {
+    'batting_stats': 6 * 60 * 60,
+    'pitching_stats': 6 * 60 * 60,
+    'team_batting': 6 * 60 * 60,
+    'team_pitching': 6 * 60 * 60,
+    'schedule_and_record': 60 * 60,  # results land during game days
+    'chadwick_register': 7 * 24 * 60 * 60,
+}
+
+# On-disk response cache of the live backend; BASEBALL_FETCH_CACHE=off fetches everything live
+DEFAULT_CACHE_DIR = os.environ.get('BASEBALL_FETCH_CACHE', './data/cache/pybaseball')
+DEFAULT_CACHE_BYTES = int(os.environ.get('BASEBALL_FETCH_CACHE_BYTES', 2 * 1024 ** 3))
+
+
+class CachedBackend:
+    """Backend answering from a ParquetCache when it can and from `backend` otherwise.
+
+    Entries are keyed by endpoint and arguments. An endpoint's first integer argument is its season:
+    seasons before the current year never expire, others expire after the endpoint's TTL. Endpoints
+    without a TTL (statcast, which is checkpointed into raw.statcast instead) pass straight through, and
+    empty responses are not stored, so a failed download is retried instead of cached.
+    """
+
+    def __init__(self, backend: Any, cache: ParquetCache, ttls: Mapping[str, float] = ENDPOINT_TTLS,
+                 today: Callable[[], date] = date.today):
+        self.backend = backend
+        self.cache = cache
+        self.ttls = dict(ttls)
+        self.today = today
+
+    def _entry(self, name: str, args: Tuple[Any, ...]) -> Tuple[str, Optional[float]]:
+        """Cache key and TTL of one call."""
+        season = next((arg for arg in args if isinstance(arg, int)), None)
+        ttl = None if season is not None and season < self.today().year else self.ttls[name]
+        return '_'.join(str(arg) for arg in args) or 'all', ttl
+
+    def is_cached(self, name: str, *args) -> bool:
+        """Whether calling `name(*args)` would be answered from the cache."""
+        return name in self.ttls and self.cache.contains(name, *self._entry(name, args))
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        fetch = getattr(self.backend, name)
+        if name not in self.ttls:
+            return fetch
+
+        def cached(*args):
+            key, ttl = self._entry(name, args)
+            frame = self.cache.get(name, key, ttl)
+            if frame is None:
+                frame = fetch(*args)
+                if not frame.empty:
+                    self.cache.put(name, key, frame)
+            return frame
+        return cached
+
+
+# Where the functions below get their frames; see set_backend and BASEBALL_FETCH_BACKEND
+_backend: Optional[Any] = None
+_backend_lock = threading.Lock()
+
+
+def backend_from_spec(spec: str) -> Any:
+    """Build a backend from a spec: 'live', 'replay:<dir>' or 'synthetic[:teams=300,seasons=2015-2024,seed=0]'.
+
+    The live backend sits behind the on-disk response cache unless BASEBALL_FETCH_CACHE is 'off'.
+    """
+    kind, _, arg = spec.partition(':')
+    if kind == 'live':
+        if DEFAULT_CACHE_DIR == 'off':
+            return PybaseballBackend()
+        return CachedBackend(PybaseballBackend(), ParquetCache(DEFAULT_CACHE_DIR, DEFAULT_CACHE_BYTES))
+    from . import offline
+    if kind == 'replay':
+        return offline.Replay(arg)
+    if kind == 'synthetic':
+        return offline.SyntheticLeague.from_spec(arg)
+    raise ValueError(f"Unknown fetch backend '{spec}'; expected live, replay:<dir> or synthetic[:options].")
+
+
+def get_backend() -> Any:
+    """Return the active backend, built from BASEBALL_FETCH_BACKEND (default 'live') on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = backend_from_spec(os.environ.get('BASEBALL_FETCH_BACKEND', 'live'))
+    return _backend
+
+
+def set_backend(backend: Any) -> Any:
+    """Route every fetch through `backend` (an object with this module's fetch methods); returns the previous one.
+
+    Cached leaderboards are dropped so nothing fetched from the old backend is served afterwards.
+    """
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    clear_cache()
+    return previous
+
+
+def _call(name: str, *args) -> pd.DataFrame:
+    """Call the active backend, timed as a 'fetch' span when tracing is enabled."""
+    return trace.call('fetch', name, getattr(get_backend(), name), *args)
+
+
+def reaches_network(name: str, *args) -> bool:
+    """Whether `name(*args)` on the active backend would go to pybaseball's sites rather than a cache or files.
+
+    Callers throttle only these calls, so a warm restart served from the response cache never waits.
+    """
+    backend = get_backend()
+    while not isinstance(backend, PybaseballBackend):
+        if isinstance(backend, CachedBackend) and backend.is_cached(name, *args):
+            return False
+        # CachedBackend and offline.Recorder wrap another backend; Replay and SyntheticLeague never fetch
+        backend = vars(backend).get('backend')
+        if backend is None:
+            return False
+    return True
+
+
+def batting_stats(season: int) -> pd.DataFrame:
+    """Return the full individual batting leaderboard (every player, no qualifier) for a season."""
+    return _season_frames.get_or_load(('batting', season), lambda: _call('batting_stats', season))
+
+
+def pitching_stats(season: int) -> pd.DataFrame:
+    """Return the full individual pitching leaderboard (every player, no qualifier) for a season."""
+    return _season_frames.get_or_load(('pitching', season), lambda: _call('pitching_stats', season))
+
+
+def team_batting(season: int) -> pd.DataFrame:
+    """Return season team batting totals for every team."""
+    return _call('team_batting', season)
+
+
+def team_pitching(season: int) -> pd.DataFrame:
+    """Return season team pitching totals for every team."""
+    return _call('team_pitching', season)
+
+
+def schedule_and_record(season: int, team: str) -> pd.DataFrame:
+    """Return one team's game-by-game schedule and results for a season."""
+    return _call('schedule_and_record', season, team)
+
+
+def chadwick_register() -> pd.DataFrame:
+    """Return the Chadwick player register (MLB players only) with MLBAM, FanGraphs and BBRef IDs."""
+    return _call('chadwick_register')
+
+
+def statcast(start: str, end: str) -> pd.DataFrame:
+    """Return every Statcast pitch thrown from `start` to `end` (ISO dates, inclusive)."""
+    return _call('statcast', start, end)
+
+
+def clear_cache() -> None:
+    """Drop all cached season leaderboards."""
+    _season_frames.clear()
+
+
+def cache_stats() -> Optional[Dict[str, int]]:
+    """Hit and miss counters of the active backend's response cache, or None if it has none."""
+    cache = getattr(get_backend(), 'cache', None)
+    return cache.stats() if isinstance(cache, ParquetCache) else None
@@ -0,0 +1,305 @@
+# pipeline/db/futures.py: Monte Carlo simulation of the rest of a season and its playoffs for futures pricing
+
+from __future__ import annotations
+
+import argparse
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Mapping, Optional, Tuple
+
+import duckdb
+from .pool import DEFAULT_DATABASE
+from .schema import bootstrap
+from .teams import DIVISIONS, TEAMS, franchise
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+OUTCOMES = ['division', 'wild_card', 'playoffs', 'bye', 'pennant', 'title']
+
+# Default ratings shrink each team's record toward .500 by this many phantom games
+PRIOR_GAMES = 60
+# Home win probability between equal teams
+HOME_EDGE = 0.54
+# Seasons simulated per draw in a worker; bounds the seasons x games Bernoulli matrix near 50 MB
+_CHUNK = 5_000
+
+# Division and league membership as team indices into TEAMS
+_INDEX = {team: i for i, team in enumerate(TEAMS)}
+_DIVISIONS = [[_INDEX[team] for team in teams] for teams in DIVISIONS.values()]
+_LEAGUES = {league: [d for d, name in enumerate(DIVISIONS) if name.startswith(league)] for league in ('AL', 'NL')}
+_DIVISION_OF = [next(d for d, teams in enumerate(_DIVISIONS) if i in teams) for i in range(len(TEAMS))]
+_LEAGUE_OF = [next(l for l, ids in enumerate(_LEAGUES.values()) if d in ids) for d in _DIVISION_OF]
+
+
+def log5(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Probability that a team of strength `a` beats one of strength `b` (strengths as win probabilities vs .500)."""
+    return a * (1 - b) / (a * (1 - b) + b * (1 - a))
+
+
+def _season_games(con: duckdb.DuckDBPyConnection, season: int, as_of: Optional[date] = None) -> pd.DataFrame:
+    """Every game of `season` with whether it counts as played by `as_of`, teams as TEAMS entries."""
+    played = "home_runs IS NOT NULL AND away_runs IS NOT NULL" + (" AND game_date < $as_of" if as_of else "")
+    params = {'season': season, **({'as_of': as_of} if as_of else {})}
+    games = con.execute(f"""
+        SELECT game_id, game_date, home_team, away_team, COALESCE({played}, false) AS played,
+            COALESCE(home_runs > away_runs, false) AS home_won
+        FROM raw.games WHERE season = $season
+        ORDER BY game_date, game_id;
+    """, params).fetchdf()
+    for side in ('home_team', 'away_team'):
+        games[side] = games[side].map(franchise)
+    return games
+
+
+def season_state(con: duckdb.DuckDBPyConnection, season: int,
+                 as_of: Optional[date] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Return (standings, remaining): each team's wins and games played before `as_of`, and every other game.
+
+    Without `as_of`, every game that has a result counts as played. Teams listed under another
+    Baseball-Reference code (teams.TEAM_CODES) count as their franchise.
+    """
+    games = _season_games(con, season, as_of)
+    results = games[games['played']]
+    winners = np.where(results['home_won'], results['home_team'], results['away_team'])
+    standings = pd.DataFrame({'team': TEAMS})
+    standings['wins'] = standings['team'].map(pd.Series(winners).value_counts()).fillna(0)
+    standings['games'] = standings['team'].map(
+        pd.concat([results['home_team'], results['away_team']]).value_counts()).fillna(0)
+    remaining = games.loc[~games['played'], ['game_id', 'game_date', 'home_team', 'away_team']]
+    return standings, remaining.reset_index(drop=True)
+
+
+def head_to_head(con: duckdb.DuckDBPyConnection, season: int, as_of: Optional[date] = None) -> np.ndarray:
+    """Wins of team i over team j (indices into TEAMS) in the games played before `as_of`."""
+    games = _season_games(con, season, as_of)
+    results = games[games['played'] & games['home_team'].isin(_INDEX) & games['away_team'].isin(_INDEX)]
+    home, away = results['home_team'].map(_INDEX).to_numpy(), results['away_team'].map(_INDEX).to_numpy()
+    won = results['home_won'].to_numpy(dtype=bool)
+    h2h = np.zeros((len(TEAMS), len(TEAMS)))
+    np.add.at(h2h, (np.where(won, home, away), np.where(won, away, home)), 1)
+    return h2h
+
+
+def default_ratings(standings: pd.DataFrame) -> Dict[str, float]:
+    """Each team's win percentage so far, shrunk toward .500 by PRIOR_GAMES."""
+    strength = (standings['wins'] + PRIOR_GAMES / 2) / (standings['games'] + PRIOR_GAMES)
+    return dict(zip(standings['team'], strength))
+
+
+def game_probabilities(remaining: pd.DataFrame, ratings: Mapping[str, float],
+                       probs: Optional[pd.DataFrame] = None) -> np.ndarray:
+    """Home-win probability of every remaining game.
+
+    `probs` may hold game_id and home_prob (a scored slate) or home_team, away_team and home_prob (a scored
+    matchup matrix); games it does not cover fall back to log5 on `ratings` with home-field advantage.
+    """
+    home = remaining['home_team'].map(ratings).to_numpy(dtype=float)
+    away = remaining['away_team'].map(ratings).to_numpy(dtype=float)
+    neutral = log5(home, away)
+    edge = np.log(HOME_EDGE / (1 - HOME_EDGE))
+    prob = 1 / (1 + np.exp(-(np.log(neutral / (1 - neutral)) + edge)))
+    if probs is not None and not probs.empty:
+        keys = ['game_id'] if 'game_id' in probs else ['home_team', 'away_team']
+        model = remaining[keys].merge(probs[keys + ['home_prob']].drop_duplicates(keys), on=keys, how='left')
+        prob = np.where(model['home_prob'].isna(), prob, model['home_prob'].to_numpy(dtype=float))
+    return prob
+
+
+def strength_matrix(ratings: Mapping[str, float], probs: Optional[pd.DataFrame] = None) -> np.ndarray:
+    """Neutral-site probability that team i beats team j, for playoff games.
+
+    From a scored matchup matrix, both venues are averaged; otherwise log5 on the ratings.
+    """
+    strength = np.array([ratings.get(team, 0.5) for team in TEAMS])
+    neutral = log5(strength[:, None], strength[None, :])
+    if probs is not None and {'home_team', 'away_team'} <= set(probs.columns) and 'game_id' not in probs:
+        home = np.full((len(TEAMS), len(TEAMS)), np.nan)
+        rows = probs[probs['home_team'].isin(_INDEX) & probs['away_team'].isin(_INDEX)]
+        home[rows['home_team'].map(_INDEX), rows['away_team'].map(_INDEX)] = rows['home_prob']
+        averaged = (home + 1 - home.T) / 2
+        neutral = np.where(np.isnan(averaged), neutral, averaged)
+    np.fill_diagonal(neutral, 0.5)
+    return neutral
+
+
+def series_probability(p: np.ndarray, games: int) -> np.ndarray:
+    """Probability of winning a best-of-`games` series with per-game win probability `p`."""
+    need = games // 2 + 1
+    return sum(math.comb(need - 1 + losses, losses) * p ** need * (1 - p) ** losses for losses in range(need))
+
+
+def _series(rng, neutral: np.ndarray, a: np.ndarray, b: np.ndarray, games: int) -> np.ndarray:
+    """Winner of each simulated series between team-index arrays a and b."""
+    return np.where(rng.random(len(a)) < series_probability(neutral[a, b], games), a, b)
+
+
+def _tiebreak_key(rng, total: np.ndarray, won: np.ndarray, meetings: np.ndarray, group: np.ndarray,
+                  intradivision: np.ndarray) -> np.ndarray:
+    """Sort key per season and team: wins, then MLB's first tiebreakers, then chance.
+
+    Teams level on wins within the same `group` are split by their combined record in the games among them
+    (head-to-head, for two teams), then by intradivision record. Each step is scaled below the smallest gap
+    the one before can leave, since every record is over at most a few hundred games.
+    """
+    tied = (total[:, :, None] == total[:, None, :]) & (group[:, :, None] == group[:, None, :])
+    tied &= ~np.eye(total.shape[1], dtype=bool)
+    tied_games = (meetings * tied).sum(axis=2)
+    h2h = np.where(tied_games > 0, (won * tied).sum(axis=2) / np.maximum(tied_games, 1), 0.5)
+    return total.astype(np.float64) + (h2h + (intradivision + rng.random(total.shape) / 1e4) / 1e6) / 2
+
+
+def simulate_chunk(seed: int, seasons: int, home: np.ndarray, away: np.ndarray, prob: np.ndarray,
+                   wins: np.ndarray, played: np.ndarray, neutral: np.ndarray) -> Dict[str, np.ndarray]:
+    """Simulate `seasons` completions of the schedule and the 12-team playoffs; returns per-team counts.
+
+    Regular-season games are one Bernoulli matrix (seasons x games) turned into win totals by two matrix
+    products with the home and away one-hot team matrices; `played` holds the head-to-head wins so far.
+    Ties for a division, a division winner's seed or a wild card go to the better record in the games among
+    the tied teams, then intradivision record (see _tiebreak_key). MLB's later steps (intraleague record,
+    record over the second half of intraleague games, ...) are not modelled; ties that survive the first two
+    are broken at random.
+    """
+    rng = np.random.default_rng(seed)
+    teams = len(TEAMS)
+    # Games sorted by pairing, so each season's head-to-head results are one reduceat per pair
+    order = np.argsort(np.minimum(home, away) * teams + np.maximum(home, away), kind='stable')
+    home, away, prob = home[order], away[order], prob[order]
+    home_onehot = np.zeros((len(home), teams), dtype=np.float32)
+    home_onehot[np.arange(len(home)), home] = 1
+    away_onehot = np.zeros((len(away), teams), dtype=np.float32)
+    away_onehot[np.arange(len(away)), away] = 1
+    pairs, starts = np.unique(np.minimum(home, away) * teams + np.maximum(home, away), return_index=True)
+    pair_low, pair_high = np.divmod(pairs, teams)
+    pair_games = np.diff(np.append(starts, len(home)))
+    low_is_home = home < away
+    meetings = (played + played.T).astype(np.float32)
+    np.add.at(meetings, (pair_low, pair_high), pair_games)
+    np.add.at(meetings, (pair_high, pair_low), pair_games)
+    division_of, league_of = np.array(_DIVISION_OF), np.array(_LEAGUE_OF)
+    same_division = (division_of[:, None] == division_of[None, :]) & ~np.eye(teams, dtype=bool)
+    division_games = (meetings * same_division).sum(axis=1)
+    counts = {name: np.zeros(teams) for name in OUTCOMES + ['wins']}
+    for start in range(0, seasons, _CHUNK):
+        n = min(_CHUNK, seasons - start)
+        home_won = (rng.random((n, len(prob)), dtype=np.float32) < prob).astype(np.float32)
+        total = wins + home_won @ home_onehot + (1 - home_won) @ away_onehot
+        counts['wins'] += total.sum(axis=0)
+        won = np.repeat(played[None].astype(np.float32), n, axis=0)
+        if len(home):
+            low_won = np.where(low_is_home, home_won, 1 - home_won)
+            by_pair = np.add.reduceat(low_won, starts, axis=1)
+            won[:, pair_low, pair_high] += by_pair
+            won[:, pair_high, pair_low] += pair_games - by_pair
+        intradivision = np.where(division_games > 0,
+                                 (won * same_division).sum(axis=2) / np.maximum(division_games, 1), 0.5)
+
+        rows = np.arange(n)[:, None]
+        divisions = np.array(_DIVISIONS)
+        division_key = _tiebreak_key(rng, total, won, meetings, np.broadcast_to(division_of, total.shape),
+                                     intradivision)
+        leaders = divisions[np.arange(len(divisions)), division_key[:, divisions].argmax(axis=2)]  # (n, divisions)
+        # Division winners are seeded among themselves and the wild cards among the rest of their league
+        champions = np.zeros(total.shape, dtype=bool)
+        champions[rows, leaders] = True
+        key = _tiebreak_key(rng, total, won, meetings, league_of * 2 + champions, intradivision)
+        pennants = []
+        for league, division_ids in _LEAGUES.items():
+            winners = leaders[:, division_ids]
+            winners = winners[rows, np.argsort(-key[rows, winners], axis=1)]  # seeds 1-3
+            members = divisions[division_ids].ravel()
+            others = key[:, members].copy()
+            others[(members[None, :, None] == winners[:, None, :]).any(axis=2)] = -np.inf
+            wild = members[np.argsort(-others, axis=1)[:, :3]]  # seeds 4-6
+            np.add.at(counts['division'], winners.ravel(), 1)
+            np.add.at(counts['wild_card'], wild.ravel(), 1)
+            np.add.at(counts['bye'], winners[:, :2].ravel(), 1)
+            seeds = np.hstack([winners, wild])
+            wc_a = _series(rng, neutral, seeds[:, 2], seeds[:, 5], 3)
+            wc_b = _series(rng, neutral, seeds[:, 3], seeds[:, 4], 3)
+            ds_a = _series(rng, neutral, seeds[:, 0], wc_b, 5)
+            ds_b = _series(rng, neutral, seeds[:, 1], wc_a, 5)
+            pennant = _series(rng, neutral, ds_a, ds_b, 7)
+            np.add.at(counts['pennant'], pennant, 1)
+            pennants.append(pennant)
+        np.add.at(counts['title'], _series(rng, neutral, pennants[0], pennants[1], 7), 1)
+    counts['playoffs'] = counts['division'] + counts['wild_card']
+    return counts
+
+
+def simulate_season(con: duckdb.DuckDBPyConnection, season: int, as_of: Optional[date] = None,
+                    probs: Optional[pd.DataFrame] = None, ratings: Optional[Mapping[str, float]] = None,
+                    simulations: int = 100_000, max_workers: Optional[int] = None,
+                    seed: Optional[int] = None) -> pd.DataFrame:
+    """Simulate the rest of `season` many times and upsert per-team probabilities into features.season_simulations.
+
+    Game probabilities come from `probs` (the model) where given and from `ratings` (default: shrunk win
+    percentages) otherwise. Simulations are split into one independent random stream per worker process.
+    Returns the written rows.
+    """
+    standings, remaining = season_state(con, season, as_of)
+    unknown = sorted((set(remaining['home_team']) | set(remaining['away_team'])) - set(_INDEX))
+    if unknown:
+        raise ValueError(f"Schedule has teams outside the current divisions: {unknown}")
+    ratings = dict(ratings or default_ratings(standings))
+    args = (
+        remaining['home_team'].map(_INDEX).to_numpy(), remaining['away_team'].map(_INDEX).to_numpy(),
+        game_probabilities(remaining, ratings, probs).astype(np.float32),
+        standings.set_index('team').loc[list(TEAMS), 'wins'].to_numpy(dtype=np.float32),
+        head_to_head(con, season, as_of),
+        strength_matrix(ratings, probs),
+    )
+    workers = max(1, min(max_workers or os.cpu_count() or 1, simulations // _CHUNK or 1))
+    seeds = np.random.SeedSequence(seed).generate_state(workers).tolist()
+    shares = [simulations // workers + (i < simulations % workers) for i in range(workers)]
+    if workers == 1:
+        parts = [simulate_chunk(seeds[0], simulations, *args)]
+    else:
+        # Spawned workers: forking a process that has DuckDB threads running is unsafe
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            parts = list(pool.map(simulate_chunk, seeds, shares, *[[arg] * workers for arg in args]))
+
+    totals = {name: sum(part[name] for part in parts) for name in parts[0]}
+    results = pd.DataFrame({
+        'season': season,
+        'team': list(TEAMS),
+        'as_of': as_of or date.today(),
+        'simulations': simulations,
+        'mean_wins': totals['wins'] / simulations,
+        **{name: totals[name] / simulations for name in OUTCOMES},
+    })
+    columns = list(results.columns)
+    con.register('temp_simulations', results)
+    try:
+        con.execute(f"""
+            INSERT OR REPLACE INTO features.season_simulations ({', '.join(columns)})
+            SELECT {', '.join(columns)} FROM temp_simulations;
+        """)
+    finally:
+        con.unregister('temp_simulations')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the rest of a season for division, pennant and title odds.")
+    parser.add_argument('--season', type=int, default=date.today().year, help="Season to simulate.")
+    parser.add_argument('--as-of', type=date.fromisoformat, default=None, help="Simulate games from this date on.")
+    parser.add_argument('--simulations', type=int, default=100_000, help="Seasons to simulate.")
+    parser.add_argument('--workers', type=int, default=None, help="Simulation processes (defaults to CPU count).")
+    args = parser.parse_args()
+    con = duckdb.connect(database=DEFAULT_DATABASE, read_only=False)
+    try:
+        bootstrap(con)
+        results = simulate_season(con, args.season, args.as_of, simulations=args.simulations,
+                                  max_workers=args.workers)
+        print(results.sort_values('title', ascending=False).to_string(index=False))
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# pipeline/db/games.py: League-wide schedule ingestion into the canonical raw.games table
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Sequence
+
+import duckdb
+from . import fetch, transform
+from .refresh import mark_dirty
+from .teams import TEAMS, bref_code, franchise
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Baseball-Reference throttles aggressive clients, so schedule requests are spaced out across all workers
+MIN_REQUEST_INTERVAL = 3.0
+
+GAMES_RAW = [
+    'game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+    'home_runs', 'away_runs', 'innings', 'day_night'
+]
+
+
+class _RateLimiter:
+    """Allow at most one call every `interval` seconds across threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def fetch_schedules(seasons: Iterable[int], teams: Sequence[str] = TEAMS, max_workers: int = 4,
+                    min_interval: float = MIN_REQUEST_INTERVAL) -> pd.DataFrame:
+    """Fetch every team's schedule for the given seasons concurrently, spacing the requests that go live.
+
+    Each team is requested under its code for that season, and teams (`Tm` and `Opp`) come back as TEAMS
+    entries. Returns all schedules concatenated with a `season` column added; failed fetches are skipped
+    with a warning.
+    """
+    limiter = _RateLimiter(min_interval)
+
+    def fetch_one(season: int, team: str) -> Optional[pd.DataFrame]:
+        try:
+            code = bref_code(team, season)
+            if fetch.reaches_network('schedule_and_record', season, code):
+                limiter.wait()
+            frame = fetch.schedule_and_record(season, code)
+            return frame.assign(season=season, Tm=team, Opp=frame['Opp'].map(franchise))
+        except Exception as e:
+            print(f"Warning: Could not fetch schedule for {team} {season}: {e}")
+            return None
+
+    jobs = [(season, team) for season in seasons for team in teams]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = [frame for frame in pool.map(lambda job: fetch_one(*job), jobs) if frame is not None]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def normalize_games(schedules: pd.DataFrame) -> pd.DataFrame:
+    """Collapse per-team schedule rows into one row per game, working on whole columns.
+
+    Each game appears in both teams' schedules; both rows map to the same home-team game_id, and the
+    home team's row is kept when both are present.
+    """
+    if schedules.empty:
+        return pd.DataFrame(columns=GAMES_RAW)
+    is_home = schedules['Home_Away'].eq('Home').to_numpy()
+    team, opp = schedules['Tm'].to_numpy(), schedules['Opp'].to_numpy()
+    runs = pd.to_numeric(schedules['R'], errors='coerce').to_numpy()
+    runs_against = pd.to_numeric(schedules['RA'], errors='coerce').to_numpy()
+
+    game_date = transform.schedule_dates(schedules['Date'], schedules['season'])
+    game_num = schedules['Date'].str.extract(r'\((\d)\)$', expand=False).fillna('0').astype(int)
+
+    games = pd.DataFrame({
+        'season': schedules['season'].astype(int),
+        'game_date': game_date,
+        'game_num': game_num,
+        'home_team': np.where(is_home, team, opp),
+        'away_team': np.where(is_home, opp, team),
+        'home_runs': np.where(is_home, runs, runs_against),
+        'away_runs': np.where(is_home, runs_against, runs),
+        'innings': pd.to_numeric(schedules.get('Inn'), errors='coerce'),
+        'day_night': schedules.get('D/N'),
+        'is_home': is_home,
+    }).dropna(subset=['game_date'])
+    # Unplayed games carry no runs (and a placeholder inning count)
+    games.loc[games['home_runs'].isna(), 'innings'] = np.nan
+    games['game_id'] = games['home_team'] + games['game_date'].dt.strftime('%Y%m%d') + games['game_num'].astype(str)
+    games = games.sort_values('is_home', ascending=False).drop_duplicates('game_id')
+    games['game_date'] = games['game_date'].dt.date
+    for col in ('home_runs', 'away_runs', 'innings'):
+        games[col] = games[col].astype('Int64')
+    return games.sort_values(['game_date', 'home_team', 'game_num'])[GAMES_RAW].reset_index(drop=True)
+
+
+def write_games(con: duckdb.DuckDBPyConnection, games: pd.DataFrame) -> int:
+    """Upsert games into raw.games in one statement and mark their team-seasons dirty; results overwrite
+    earlier scheduled-only rows."""
+    if games.empty:
+        return 0
+    con.register('temp_games', games)
+    try:
+        rows = con.execute(f"""
+            INSERT OR REPLACE INTO raw.games ({', '.join(GAMES_RAW)})
+            SELECT {', '.join(GAMES_RAW)} FROM temp_games;
+        """).fetchone()[0]
+        mark_dirty(con, 'raw.games', 'temp_games')
+        return rows
+    finally:
+        con.unregister('temp_games')
+
+
+def ingest_games(seasons: Iterable[int], con: duckdb.DuckDBPyConnection, teams: Sequence[str] = TEAMS,
+                 max_workers: int = 4, min_interval: float = MIN_REQUEST_INTERVAL) -> int:
+    """Fetch, normalize and write every game for the given seasons; returns rows written."""
+    schedules = fetch_schedules(seasons, teams, max_workers, min_interval)
+    return write_games(con, normalize_games(schedules))
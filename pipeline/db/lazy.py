@@ -0,0 +1,25 @@
+# pipeline/db/lazy.py: Deferred imports for heavy dependencies
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return `name` as a module that is only executed on first attribute access.
+
+    pybaseball (and the scraping and plotting stack under it) and pandas dominate startup, while most
+    invocations only run SQL against the existing database. Modules that take `pd`/`pyb` from here pay for
+    the import on the first code path that actually uses it. Annotations in those modules must be lazy
+    too (`from __future__ import annotations`), or defining a function would trigger the import.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
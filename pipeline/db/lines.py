@@ -0,0 +1,91 @@
+# pipeline/db/lines.py: Append-only odds snapshot store and point-in-time line lookups
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Mapping, Optional, Sequence, Union
+
+import duckdb
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+SNAPSHOTS_RAW = ['game_id', 'book', 'market', 'captured_at', 'line', 'home_price', 'away_price']
+
+MARKETS = ('moneyline', 'total')
+
+
+def snapshot_rows(odds: pd.DataFrame, captured_at: datetime, book: str = 'consensus') -> pd.DataFrame:
+    """Turn raw.odds-shaped rows (one polled page) into snapshot rows for every market they price."""
+    moneyline = pd.DataFrame({
+        'game_id': odds['game_id'], 'market': 'moneyline', 'line': None,
+        'home_price': odds['moneyline_home'], 'away_price': odds['moneyline_away'],
+    }).dropna(subset=['home_price', 'away_price'], how='all')
+    total = pd.DataFrame({
+        'game_id': odds['game_id'], 'market': 'total', 'line': odds['total'],
+        'home_price': None, 'away_price': None,
+    }).dropna(subset=['line'])
+    rows = pd.concat([moneyline, total], ignore_index=True)
+    rows['book'] = book
+    rows['captured_at'] = pd.Timestamp(captured_at)
+    return rows[SNAPSHOTS_RAW]
+
+
+def append_snapshots(con: duckdb.DuckDBPyConnection, snapshots: pd.DataFrame) -> int:
+    """Append snapshots in capture order; a snapshot already stored under the same key is left as is."""
+    if snapshots.empty:
+        return 0
+    con.register('temp_snapshots', snapshots)
+    try:
+        return con.execute(f"""
+            INSERT OR IGNORE INTO raw.odds_snapshots ({', '.join(SNAPSHOTS_RAW)})
+            SELECT {', '.join(SNAPSHOTS_RAW)} FROM temp_snapshots
+            ORDER BY captured_at, game_id;
+        """).fetchone()[0]
+    finally:
+        con.unregister('temp_snapshots')
+
+
+def lines_as_of(con: duckdb.DuckDBPyConnection, game_ids: Iterable[str],
+                as_of: Union[datetime, Mapping[str, datetime]], market: str = 'moneyline',
+                books: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Return, per game and book, the latest snapshot captured at or before the cutoff.
+
+    `as_of` is one cutoff for every game or a mapping of game_id to its own cutoff (e.g. first pitch).
+    One ASOF JOIN probes each (game, book) pair against the history, so no snapshot is ranked; history
+    is bounded by the latest cutoff, which lets time-ordered row groups be skipped. Pairs with no line
+    by their cutoff are omitted.
+    """
+    if market not in MARKETS:
+        raise ValueError(f"Unknown market '{market}'; expected one of {MARKETS}.")
+    game_ids = list(game_ids)
+    if isinstance(as_of, Mapping):
+        cutoffs = pd.to_datetime([as_of.get(game_id) for game_id in game_ids])
+    else:
+        cutoffs = pd.Timestamp(as_of)
+    probes = pd.DataFrame({'game_id': game_ids, 'as_of': cutoffs}).dropna()
+    if probes.empty:
+        return pd.DataFrame(columns=['game_id', 'book', 'captured_at', 'line', 'home_price', 'away_price'])
+    book_filter = "AND book IN (SELECT UNNEST($books))" if books else ""
+    params = {'market': market, 'latest': probes['as_of'].max().to_pydatetime()}
+    if books:
+        params['books'] = list(books)
+    con.register('temp_probes', probes)
+    try:
+        return con.execute(f"""
+            WITH history AS (
+                SELECT * FROM raw.odds_snapshots
+                WHERE market = $market AND captured_at <= $latest
+                    AND game_id IN (SELECT game_id FROM temp_probes) {book_filter}
+            ),
+            probes AS (
+                SELECT DISTINCT h.game_id, h.book, p.as_of
+                FROM (SELECT DISTINCT game_id, book FROM history) h JOIN temp_probes p USING (game_id)
+            )
+            SELECT p.game_id, p.book, s.captured_at, s.line, s.home_price, s.away_price
+            FROM probes p
+            ASOF JOIN history s ON s.game_id = p.game_id AND s.book = p.book AND s.captured_at <= p.as_of
+            ORDER BY p.game_id, p.book;
+        """, params).fetchdf()
+    finally:
+        con.unregister('temp_probes')
@@ -0,0 +1,204 @@
+# pipeline/db/loader.py: Full-league, multi-season bulk loader for the raw layer
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import duckdb
+from . import fetch, games, transform
+from .pool import DEFAULT_DATABASE
+from .refresh import RAW_KEYS, mark_dirty, refresh
+from .register import PlayerRegister
+from .schema import bootstrap
+from .teams import TEAMS
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+# Primary key of each raw table, used to de-duplicate a batch before INSERT OR REPLACE
+RAW_PRIMARY_KEYS = {
+    'raw.pybaseball_team_batting': ('season', 'team'),
+    'raw.pybaseball_team_pitching': ('season', 'team'),
+    'raw.games': ('game_id',),
+    'raw.pybaseball_player_batting': ('season', 'player_id'),
+    'raw.pybaseball_player_pitching': ('season', 'player_id'),
+}
+
+# Player leaderboards are keyed by FanGraphs ID; player_id (MLBAM) is filled from the register on write
+_PLAYER_TABLES = ('raw.pybaseball_player_batting', 'raw.pybaseball_player_pitching')
+
+
+@dataclass
+class LoadReport:
+    """Rows written and time spent for one raw table."""
+    table: str
+    rows: int = 0
+    fetch_seconds: float = 0.0  # summed across workers
+    write_seconds: float = 0.0
+    failures: int = 0
+
+
+def _fetch_jobs(seasons: Sequence[int]) -> List[tuple]:
+    """Build (table, label, job) triples; each job fetches one frame and converts it to raw rows."""
+    jobs = []
+    for season in seasons:
+        jobs += [
+            ('raw.pybaseball_team_batting', f'team_batting {season}',
+             lambda s=season: transform.team_batting_rows(fetch.team_batting(s), s)),
+            ('raw.pybaseball_team_pitching', f'team_pitching {season}',
+             lambda s=season: transform.team_pitching_rows(fetch.team_pitching(s), s)),
+            ('raw.pybaseball_player_batting', f'batting_stats {season}',
+             lambda s=season: transform.player_batting_rows(fetch.batting_stats(s), s)),
+            ('raw.pybaseball_player_pitching', f'pitching_stats {season}',
+             lambda s=season: transform.player_pitching_rows(fetch.pitching_stats(s), s)),
+        ]
+    return jobs
+
+
+def _timed(job: Callable[[], pd.DataFrame]) -> tuple:
+    start = time.perf_counter()
+    frame = job()
+    return frame, time.perf_counter() - start
+
+
+def fetch_frames(seasons: Sequence[int], max_workers: int = 8,
+                 reports: Optional[Dict[str, LoadReport]] = None) -> Dict[str, List[pd.DataFrame]]:
+    """Fetch every season leaderboard in a bounded worker pool, grouped by raw table."""
+    reports = reports if reports is not None else {}
+    frames: Dict[str, List[pd.DataFrame]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_timed, job): (table, label) for table, label, job in _fetch_jobs(seasons)}
+        for future in as_completed(futures):
+            table, label = futures[future]
+            report = reports.setdefault(table, LoadReport(table))
+            try:
+                frame, seconds = future.result()
+            except Exception as e:
+                print(f"Warning: Could not fetch {label}: {e}")
+                report.failures += 1
+                continue
+            report.fetch_seconds += seconds
+            if not frame.empty:
+                frames.setdefault(table, []).append(frame)
+    return frames
+
+
+def upsert(con: duckdb.DuckDBPyConnection, table: str, frame: pd.DataFrame) -> int:
+    """Write a batch into a raw table with one set-based INSERT OR REPLACE on its primary key.
+
+    Where the batch repeats a key, its last row wins, as it would writing row by row. Player rows whose
+    FanGraphs ID is not in the register have no player_id and are dropped with a warning.
+    """
+    key = ', '.join(RAW_PRIMARY_KEYS[table])
+    columns = list(frame.columns)
+    register = """
+        SELECT key_fangraphs, ANY_VALUE(key_mlbam) AS key_mlbam
+        FROM raw.player_register
+        WHERE key_mlbam IS NOT NULL AND key_fangraphs IS NOT NULL
+        GROUP BY key_fangraphs
+    """
+    if table in _PLAYER_TABLES:
+        select = ', '.join('r.key_mlbam' if c == 'player_id' else f'f.{c}' for c in columns)
+        source = f"temp_load f JOIN ({register}) r ON r.key_fangraphs = TRY_CAST(f.idfg AS INTEGER)"
+        key = key.replace('player_id', 'r.key_mlbam')
+    else:
+        select = ', '.join(f'f.{c}' for c in columns)
+        source = 'temp_load f'
+    con.register('temp_load', frame.assign(load_seq=range(len(frame))))
+    try:
+        if table in _PLAYER_TABLES:
+            unmatched = con.execute(f"""
+                SELECT f.idfg FROM temp_load f
+                ANTI JOIN ({register}) r ON r.key_fangraphs = TRY_CAST(f.idfg AS INTEGER)
+                ORDER BY f.load_seq;
+            """).fetchall()
+            if unmatched:
+                print(f"Warning: Dropping {len(unmatched)} {table} rows with FanGraphs IDs not in the player "
+                      f"register: {[idfg for idfg, in unmatched[:5]]}")
+        return con.execute(f"""
+            INSERT OR REPLACE INTO {table} ({', '.join(columns)})
+            SELECT {select} FROM {source}
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY f.load_seq DESC) = 1;
+        """).fetchone()[0]
+    finally:
+        con.unregister('temp_load')
+
+
+def load(seasons: Iterable[int], con: Optional[duckdb.DuckDBPyConnection] = None, teams: Sequence[str] = TEAMS,
+         max_workers: int = 8, full_refresh: bool = False,
+         min_interval: float = games.MIN_REQUEST_INTERVAL) -> List[LoadReport]:
+    """Ingest every team, game and player for the given seasons into the raw layer.
+
+    Source frames are fetched concurrently, then each raw table is written in a single upsert inside one
+    transaction. The loaded seasons are refreshed downstream incrementally (or everything, with full_refresh),
+    including the point-in-time team form derived from raw.games.
+    """
+    seasons = sorted(set(seasons))
+    own_connection = con is None
+    if own_connection:
+        os.makedirs(os.path.dirname(DEFAULT_DATABASE) or '.', exist_ok=True)
+        con = duckdb.connect(database=DEFAULT_DATABASE, read_only=False)
+    try:
+        bootstrap(con)
+        PlayerRegister(con).ensure_loaded()
+
+        reports: Dict[str, LoadReport] = {table: LoadReport(table) for table in RAW_PRIMARY_KEYS}
+        frames = fetch_frames(seasons, max_workers, reports)
+        # One polite pass over every team's schedule feeds raw.games, the only game-level table written
+        start = time.perf_counter()
+        schedules = games.fetch_schedules(seasons, teams, max_workers, min_interval)
+        reports['raw.games'].fetch_seconds = time.perf_counter() - start
+        if not schedules.empty:
+            frames['raw.games'] = [games.normalize_games(schedules)]
+        if not frames:
+            raise RuntimeError(f"No data could be fetched for seasons {seasons}.")
+
+        con.execute("BEGIN TRANSACTION")
+        try:
+            for table, parts in frames.items():
+                start = time.perf_counter()
+                reports[table].rows = upsert(con, table, pd.concat(parts, ignore_index=True))
+                if table in RAW_KEYS:
+                    season_list = ', '.join(str(season) for season in seasons)
+                    mark_dirty(con, table, f"(SELECT * FROM {table} WHERE season IN ({season_list}))")
+                reports[table].write_seconds = time.perf_counter() - start
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+
+        start = time.perf_counter()
+        refresh(con, full=full_refresh)
+        reports['derived'] = LoadReport('processed/features', write_seconds=time.perf_counter() - start)
+    finally:
+        if own_connection:
+            con.close()
+
+    print_reports(list(reports.values()))
+    return list(reports.values())
+
+
+def print_reports(reports: List[LoadReport]) -> None:
+    """Print rows and seconds per table."""
+    print(f"{'table':<36}{'rows':>10}{'fetch s':>10}{'write s':>10}{'failed':>8}")
+    for r in reports:
+        print(f"{r.table:<36}{r.rows:>10}{r.fetch_seconds:>10.2f}{r.write_seconds:>10.2f}{r.failures:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load pybaseball data for a range of seasons.")
+    parser.add_argument('--start', type=int, default=2024, help="First season to load.")
+    parser.add_argument('--end', type=int, default=None, help="Last season to load (defaults to --start).")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent fetches.")
+    parser.add_argument('--full-refresh', action='store_true', help="Rebuild every derived table afterwards.")
+    args = parser.parse_args()
+    load(range(args.start, (args.end or args.start) + 1), max_workers=args.workers, full_refresh=args.full_refresh)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,19 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Optional
-import pandas as pd
+from typing import List, Optional
+from .hydrate import frame_to_models
+from ..lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+# Source column -> field remaps (pybaseball names and cleaned rate columns)
+PLAYER_BATTING_ALIASES = {
+    '2B': 'double', '3B': 'triple',
+    'avg_clean': 'avg', 'obp_clean': 'obp', 'slg_clean': 'slg', 'ops_clean': 'ops',
+}
 
-@dataclass
+@dataclass(slots=True)
 class PlayerBattingStats:
     """Represents player batting statistics for a season."""
     season: int
@@ -37,29 +48,15 @@ class PlayerBattingStats:
         """Create from DataFrame row."""
         if df.empty:
             return None
-        row = df.iloc[row_idx].to_dict()
-        # Map if needed (e.g., '2B' -> 'double')
-        row['double'] = row.get('2B', row.get('double', 0))
-        row.pop('2B', None)
-        row['triple'] = row.get('3B', row.get('triple', 0))
-        row.pop('3B', None)
-
-        # Some special stats
-        row['avg'] = row.get('avg_clean', row.get('avg', 0))
-        row.pop('avg_clean', None)
-
-        row['obp'] = row.get('obp_clean', row.get('obp', 0))
-        row.pop('obp_clean', None)
+        return cls.from_frame(df.iloc[[row_idx]])[0]
 
-        row['slg'] = row.get('slg_clean', row.get('slg', 0))
-        row.pop('slg_clean', None)
-
-        row['ops'] = row.get('ops_clean', row.get('ops', 0))
-        row.pop('ops_clean', None)
-        return cls.from_dict(row)  # Fixed: Call from_dict instead of from_row
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> List['PlayerBattingStats']:
+        """Create one instance per DataFrame row, remapping columns once for the whole frame."""
+        return frame_to_models(cls, df, PLAYER_BATTING_ALIASES)
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamBattingStats:
     """Represents team batting statistics for a season."""
     season: int
@@ -76,4 +73,9 @@ class TeamBattingStats:
 
     @classmethod
     def from_row(cls, row: dict) -> 'TeamBattingStats':
-        return cls(**{k: row.get(k, 0) for k in cls.__dataclass_fields__})
\ No newline at end of file
+        return cls(**{k: row.get(k, 0) for k in cls.__dataclass_fields__})
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> List['TeamBattingStats']:
+        """Create one instance per DataFrame row."""
+        return frame_to_models(cls, df)
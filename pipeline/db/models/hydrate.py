@@ -0,0 +1,28 @@
+# pipeline/db/models/hydrate.py: Bulk DataFrame -> dataclass conversion shared by the stats models
+
+from __future__ import annotations
+
+from itertools import starmap
+from typing import Dict, List, Type, TypeVar
+from ..lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+T = TypeVar('T')
+
+
+def frame_to_models(cls: Type[T], df: pd.DataFrame, aliases: Dict[str, str] = None) -> List[T]:
+    """Build one `cls` per row of `df`, remapping and projecting columns once for the whole frame.
+
+    `aliases` maps source column -> field name and wins over a column already named like the field
+    (e.g. 'avg_clean' over 'avg'). Fields with no column default to 0, as in the models' from_row.
+    """
+    if df.empty:
+        return []
+    aliases = {src: dst for src, dst in (aliases or {}).items() if src in df.columns}
+    if aliases:
+        df = df.drop(columns=[dst for dst in aliases.values() if dst in df.columns]).rename(columns=aliases)
+    fields = list(cls.__dataclass_fields__)
+    df = df.reindex(columns=fields, fill_value=0)
+    # tolist() yields Python scalars column by column instead of boxing every cell through a row Series
+    return list(starmap(cls, zip(*(df[field].tolist() for field in fields))))
@@ -1,10 +1,15 @@
 # pipeline/db/models/pitching.py
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-# from typing import Optional
-# import pandas as pd
+from typing import List, Optional
+from .hydrate import frame_to_models
+from ..lazy import lazy_import
+
+pd = lazy_import('pandas')
 
-@dataclass
+@dataclass(slots=True)
 class PlayerPitchingStats:
     """Represents player pitching statistics for a season."""
     season: int
@@ -23,4 +28,16 @@ class PlayerPitchingStats:
 
     @classmethod
     def from_row(cls, row: dict) -> 'PlayerPitchingStats':
-        return cls(**{k: row.get(k, 0) for k in cls.__dataclass_fields__})
\ No newline at end of file
+        return cls(**{k: row.get(k, 0) for k in cls.__dataclass_fields__})
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame, row_idx: int = 0) -> Optional['PlayerPitchingStats']:
+        """Create from DataFrame row."""
+        if df.empty:
+            return None
+        return cls.from_frame(df.iloc[[row_idx]])[0]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> List['PlayerPitchingStats']:
+        """Create one instance per DataFrame row."""
+        return frame_to_models(cls, df)
@@ -0,0 +1,236 @@
+# pipeline/db/odds.py: Streaming parser for saved odds pages and the raw.odds ingestion stage
+
+from __future__ import annotations
+
+import argparse
+import glob
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Sequence
+
+import duckdb
+from . import lines
+from .pool import DEFAULT_DATABASE
+from .schema import bootstrap
+from .teams import TEAM_NAMES
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+ODDS_RAW = [
+    'game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team', 'home_score', 'away_score',
+    'moneyline_home', 'moneyline_away', 'total', 'bookmakers', 'source'
+]
+
+# Fields of one parsed page row, before typing
+_PARSED = ['date', 'time', 'home', 'away', 'home_score', 'away_score', 'ml_home', 'ml_away', 'total', 'bookmakers']
+
+# "New York Yankees 6–7 Los Angeles Dodgers" (played) or "New York Yankees – Los Angeles Dodgers" (upcoming)
+_RESULT = re.compile(r'(.+?)\s+(\d+)\s*[–:-]\s*(\d+)\s+(.+)')
+_FIXTURE = re.compile(r'(.+?)\s+[–-]\s+(.+)')
+_TIME = re.compile(r'\d{1,2}:\d{2}')
+_DATE = re.compile(r'(\d{1,2})\s+([A-Za-z]{3})[a-z]*\s+(\d{4})')
+
+
+class OddsPageParser(HTMLParser):
+    """Single pass over an odds results page.
+
+    Date header rows (`tr.table-dummyrow`) set the date carried forward onto every game row that follows,
+    so no row ever looks backwards through the document. Game rows are those with at least four cells:
+    [time,] game, home moneyline, away moneyline, total[, bookmaker count].
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rows: List[tuple] = []
+        self._date: Optional[str] = None
+        self._row_class: Optional[str] = None
+        self._cells: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self._end_row()
+            self._row_class = dict(attrs).get('class') or ''
+            self._cells, self._text = [], []
+        elif tag in ('td', 'th') and self._cells is not None:
+            self._end_cell()
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th'):
+            self._end_cell()
+        elif tag in ('tr', 'table'):
+            self._end_row()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        elif self._cells is not None:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._end_row()
+
+    def _end_cell(self):
+        if self._cell is not None:
+            self._cells.append(' '.join(''.join(self._cell).split()))
+            self._cell = None
+
+    def _end_row(self):
+        if self._cells is None:
+            return
+        self._end_cell()
+        cells, self._cells = self._cells, None
+        if 'table-dummyrow' in self._row_class:
+            match = _DATE.search(' '.join(self._text + cells))
+            self._date = ' '.join(match.groups()) if match else None
+            return
+        time = None
+        if cells and _TIME.fullmatch(cells[0]):
+            time, cells = cells[0], cells[1:]
+        if len(cells) < 4 or self._date is None:
+            return
+        result = _RESULT.fullmatch(cells[0])
+        if result:
+            home, home_score, away_score, away = result.groups()
+        else:
+            fixture = _FIXTURE.fullmatch(cells[0])
+            if not fixture:
+                return
+            (home, away), home_score, away_score = fixture.groups(), None, None
+        self.rows.append((self._date, time, home, away, home_score, away_score,
+                          cells[1], cells[2], cells[3], cells[4] if len(cells) > 4 else None))
+
+
+def parse_page(path: str, chunk_size: int = 1 << 16) -> List[tuple]:
+    """Stream one saved page through the parser in chunks; returns its raw row tuples tagged with the file name."""
+    parser = OddsPageParser()
+    with open(path, encoding='utf-8', errors='replace') as f:
+        while chunk := f.read(chunk_size):
+            parser.feed(chunk)
+    parser.close()
+    source = os.path.basename(path)
+    return [row + (source,) for row in parser.rows]
+
+
+def american_odds(prices: pd.Series) -> pd.Series:
+    """Convert odds strings to American odds: '+115' and '-135' pass through, decimal '2.15' is converted.
+
+    Unparseable prices ('-', 'N/A', '') become NULL.
+    """
+    prices = prices.fillna('').astype(str).str.strip()
+    signed = pd.to_numeric(prices.where(prices.str.fullmatch(r'[+-]\d+')), errors='coerce')
+    decimal = pd.to_numeric(prices.where(prices.str.fullmatch(r'\d+(?:\.\d+)?')), errors='coerce')
+    decimal = decimal.where(decimal > 1)
+    converted = np.where(decimal >= 2, (decimal - 1) * 100, -100 / (decimal - 1))
+    return signed.fillna(pd.Series(converted, index=prices.index)).round().astype('Int64')
+
+
+def odds_rows(records: Sequence[tuple]) -> pd.DataFrame:
+    """Type parsed page rows into raw.odds rows, working on whole columns.
+
+    Teams are mapped to Baseball-Reference abbreviations (rows with unknown names are dropped with a
+    warning) and doubleheaders are numbered by start time, so game_id matches raw.games.
+    """
+    parsed = pd.DataFrame.from_records(list(records), columns=_PARSED + ['source'])
+    if parsed.empty:
+        return pd.DataFrame(columns=ODDS_RAW)
+    out = pd.DataFrame({
+        'game_date': pd.to_datetime(parsed['date'], format='%d %b %Y', errors='coerce'),
+        'time': parsed['time'].str.zfill(5),
+        'home_team': parsed['home'].map(TEAM_NAMES),
+        'away_team': parsed['away'].map(TEAM_NAMES),
+        'home_score': pd.to_numeric(parsed['home_score'], errors='coerce').astype('Int64'),
+        'away_score': pd.to_numeric(parsed['away_score'], errors='coerce').astype('Int64'),
+        'moneyline_home': american_odds(parsed['ml_home']),
+        'moneyline_away': american_odds(parsed['ml_away']),
+        'total': pd.to_numeric(parsed['total'].str.extract(r'(\d+(?:\.\d+)?)', expand=False), errors='coerce'),
+        'bookmakers': pd.to_numeric(parsed['bookmakers'], errors='coerce').astype('Int64'),
+        'source': parsed['source'],
+    })
+    unknown = out['home_team'].isna() | out['away_team'].isna() | out['game_date'].isna()
+    if unknown.any():
+        names = sorted((set(parsed.loc[unknown, 'home']) | set(parsed.loc[unknown, 'away'])) - set(TEAM_NAMES))
+        print(f"Warning: Dropping {int(unknown.sum())} odds rows with unknown teams or dates: {names[:5]}")
+        out = out[~unknown]
+    # A page lists each game once; the same game seen on several pages keeps its last occurrence
+    out = out.drop_duplicates(['game_date', 'home_team', 'away_team', 'time'], keep='last')
+    out = out.sort_values(['game_date', 'home_team', 'time'], na_position='last', kind='stable')
+    games = out.groupby(['game_date', 'home_team'], sort=False)
+    out['game_num'] = np.where(games['away_team'].transform('size') > 1, games.cumcount() + 1, 0)
+    out['season'] = out['game_date'].dt.year
+    # Integer YYYYMMDD avoids strftime, which formats row by row
+    ymd = out['game_date'].dt.year * 10000 + out['game_date'].dt.month * 100 + out['game_date'].dt.day
+    out['game_id'] = out['home_team'] + ymd.astype(str) + out['game_num'].astype(str)
+    out['game_date'] = out['game_date'].dt.date
+    return out[ODDS_RAW].reset_index(drop=True)
+
+
+def parse_pages(paths: Iterable[str], max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Parse many saved pages (in worker processes when max_workers != 1) into one typed frame."""
+    paths = list(paths)
+    if max_workers == 1 or len(paths) < 2:
+        pages = map(parse_page, paths)
+        return odds_rows([row for page in pages for row in page])
+    workers = max_workers or os.cpu_count() or 1
+    # Spawned workers: forking a process that has DuckDB threads running is unsafe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        pages = pool.map(parse_page, paths, chunksize=max(1, len(paths) // (4 * workers)))
+        return odds_rows([row for page in pages for row in page])
+
+
+def write_odds(con: duckdb.DuckDBPyConnection, odds: pd.DataFrame) -> int:
+    """Upsert typed odds rows into raw.odds in one statement."""
+    if odds.empty:
+        return 0
+    con.register('temp_odds', odds)
+    try:
+        return con.execute(f"""
+            INSERT OR REPLACE INTO raw.odds ({', '.join(ODDS_RAW)})
+            SELECT {', '.join(ODDS_RAW)} FROM temp_odds
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY game_id) = 1;
+        """).fetchone()[0]
+    finally:
+        con.unregister('temp_odds')
+
+
+def ingest_odds(paths: Iterable[str], con: duckdb.DuckDBPyConnection, max_workers: Optional[int] = None,
+                captured_at: Optional[datetime] = None) -> int:
+    """Parse saved odds pages and write them to raw.odds; returns rows written.
+
+    Pages polled live pass the time they were captured, which also appends their lines to raw.odds_snapshots.
+    """
+    frame = parse_pages(paths, max_workers)
+    rows = write_odds(con, frame)
+    if captured_at is not None:
+        lines.append_snapshots(con, lines.snapshot_rows(frame, captured_at))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load saved odds result pages into raw.odds.")
+    parser.add_argument('pages', nargs='+', help="HTML files or directories of them.")
+    parser.add_argument('--workers', type=int, default=None, help="Parser processes (defaults to CPU count).")
+    parser.add_argument('--captured-at', type=datetime.fromisoformat, default=None,
+                        help="UTC capture time of live pages; also appends their lines to raw.odds_snapshots.")
+    args = parser.parse_args()
+    paths = [p for arg in args.pages
+             for p in (sorted(glob.glob(os.path.join(arg, '*.htm*'))) if os.path.isdir(arg) else [arg])]
+    con = duckdb.connect(database=DEFAULT_DATABASE, read_only=False)
+    try:
+        bootstrap(con)
+        print(f"Wrote {ingest_odds(paths, con, args.workers, args.captured_at)} odds rows from {len(paths)} pages.")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
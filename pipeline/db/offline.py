@@ -0,0 +1,324 @@
+# pipeline/db/offline.py: Recorded and synthetic stand-ins for pybaseball, for offline tests and benchmarks
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+from datetime import date
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from . import transform
+from .cache import write_parquet
+from .teams import TEAMS, bref_code
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+_FIRST_NAMES = (
+    'Alex', 'Ben', 'Carlos', 'Dan', 'Eli', 'Felix', 'Gabe', 'Hector', 'Ian', 'Jose', 'Kyle', 'Luis', 'Matt',
+    'Nate', 'Omar', 'Pete', 'Rafael', 'Sam', 'Tony', 'Victor', 'Will', 'Yusei', 'Zack',
+)
+_LAST_NAMES = (
+    'Adams', 'Bell', 'Castro', 'Diaz', 'Evans', 'Flores', 'Garcia', 'Hill', 'Ito', 'Jones', 'Kim', 'Lopez',
+    'Moore', 'Nunez', 'Ortiz', 'Perez', 'Reyes', 'Smith', 'Torres', 'Urias', 'Vargas', 'Walker', 'Young',
+)
+
+
+def _response_path(directory: str, name: str, args: Tuple[Any, ...]) -> str:
+    """File of one recorded call: <directory>/<function>/<args joined by _>.parquet ('all' without args)."""
+    key = '_'.join(re.sub(r'[^\w.-]', '-', str(arg)) for arg in args) or 'all'
+    return os.path.join(directory, name, f"{key}.parquet")
+
+
+class Replay:
+    """Fetch backend answering every call from responses recorded as Parquet files under `directory`.
+
+    Any function name works (team_batting, schedule_and_record, playerid_lookup, ...), so whatever was
+    recorded can be replayed; a call that was never recorded raises FileNotFoundError.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def replay(*args):
+            path = _response_path(self.directory, name, args)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"No recorded response for {name}{args} at {path}.")
+            return pd.read_parquet(path)
+        return replay
+
+
+class Recorder:
+    """Fetch backend that forwards every call to `backend` and saves each response for Replay."""
+
+    def __init__(self, backend: Any, directory: str):
+        self.backend = backend
+        self.directory = directory
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def record(*args):
+            frame = getattr(self.backend, name)(*args)
+            write_parquet(frame, _response_path(self.directory, name, args))
+            return frame
+        return record
+
+
+class SyntheticLeague:
+    """Fetch backend generating a deterministic league in pybaseball's frame shapes.
+
+    `teams` (an even number) may exceed the 30 real franchises, which are used first; extra teams are named
+    X030, X031, ... Every team plays `games` games per season, one a day from March 28, against a random
+    opponent; results come from fixed per-team offense and defense ratings. Schedules agree between
+    opponents, team totals add up to the games, and every player is in the register, so a load is
+    internally consistent. Games after `played_through` have no result yet. Same arguments, same frames.
+    """
+
+    def __init__(self, teams: int = 30, seasons: Sequence[int] = (2024,), games: int = 162,
+                 players: int = 26, seed: int = 0, played_through: Optional[date] = None):
+        if teams % 2:
+            raise ValueError(f"A synthetic league needs an even number of teams, got {teams}.")
+        self.teams = tuple(TEAMS[:teams]) + tuple(f"X{i:03d}" for i in range(len(TEAMS), teams))
+        self.seasons = tuple(seasons)
+        self.games = games
+        self.players = players
+        self.seed = seed
+        self.played_through = played_through
+        rng = np.random.default_rng([seed, 0])
+        self._offense = rng.normal(0, 0.12, teams)
+        self._defense = rng.normal(0, 0.12, teams)
+        self._schedules: Dict[int, Dict[str, pd.DataFrame]] = {}
+
+    @classmethod
+    def from_spec(cls, spec: str) -> SyntheticLeague:
+        """Build from 'teams=300,seasons=2015-2024,games=162,players=26,seed=0' (every option optional)."""
+        options = dict(part.split('=', 1) for part in spec.split(',') if part)
+        kwargs: Dict[str, Any] = {k: int(v) for k, v in options.items() if k in ('teams', 'games', 'players', 'seed')}
+        if 'seasons' in options:
+            first, _, last = options['seasons'].partition('-')
+            kwargs['seasons'] = range(int(first), int(last or first) + 1)
+        return cls(**kwargs)
+
+    def _season(self, season: int) -> Dict[str, pd.DataFrame]:
+        """Every team's schedule for a season, generated once: both sides of each game from one draw."""
+        if season in self._schedules:
+            return self._schedules[season]
+        rng = np.random.default_rng([self.seed, season])
+        n = len(self.teams)
+        pairs = rng.permuted(np.tile(np.arange(n), (self.games, 1)), axis=1)
+        home, away = pairs[:, :n // 2].ravel(), pairs[:, n // 2:].ravel()
+        day = np.repeat(np.arange(self.games), n // 2)
+        dates = pd.Timestamp(season, 3, 28) + pd.to_timedelta(day, unit='D')
+        home_runs = rng.poisson(4.6 * np.exp(self._offense[home] - self._defense[away])).astype(float)
+        away_runs = rng.poisson(4.4 * np.exp(self._offense[away] - self._defense[home])).astype(float)
+        # Ties go to extra innings, one run to a coin-flip winner
+        tied = home_runs == away_runs
+        home_wins_extra = rng.random(len(home)) < 0.5
+        home_runs += tied & home_wins_extra
+        away_runs += tied & ~home_wins_extra
+        innings = np.where(tied, 9 + rng.geometric(0.5, len(home)), 9).astype(float)
+        if self.played_through is not None:
+            unplayed = (dates > pd.Timestamp(self.played_through)).to_numpy()
+            home_runs[unplayed] = away_runs[unplayed] = np.nan
+        labels = pd.Series(dates.day_name()) + ', ' + dates.strftime('%b') + ' ' + pd.Series(dates.day.astype(str))
+        night = np.where(rng.random(len(home)) < 0.7, 'N', 'D')
+        teams = np.array(self.teams)
+
+        def side(is_home: bool) -> pd.DataFrame:
+            team, opp = (home, away) if is_home else (away, home)
+            runs, allowed = (home_runs, away_runs) if is_home else (away_runs, home_runs)
+            return pd.DataFrame({
+                'Date': labels, 'Tm': teams[team], 'Home_Away': 'Home' if is_home else '@', 'Opp': teams[opp],
+                'W/L': np.where(np.isnan(runs), None, np.where(runs > allowed, 'W', 'L')),
+                'R': runs, 'RA': allowed, 'Inn': innings, 'GB': None, 'D/N': night, 'day': day,
+            })
+
+        both = pd.concat([side(True), side(False)], ignore_index=True).sort_values(['Tm', 'day'], kind='stable')
+        self._schedules[season] = {team: frame.drop(columns='day').reset_index(drop=True)
+                                   for team, frame in both.groupby('Tm', sort=False)}
+        return self._schedules[season]
+
+    def schedule_and_record(self, season: int, team: str) -> pd.DataFrame:
+        schedules = self._season(season)
+        if team not in schedules:
+            raise ValueError(f"Team '{team}' is not in this synthetic league.")
+        return schedules[team].copy()
+
+    def _team_totals(self, season: int) -> pd.DataFrame:
+        played = pd.concat(self._season(season).values()).dropna(subset=['R'])
+        return played.groupby('Tm', sort=False).agg(G=('R', 'size'), R=('R', 'sum'), RA=('RA', 'sum'),
+                                                    W=('W/L', lambda wl: (wl == 'W').sum()))
+
+    def team_batting(self, season: int) -> pd.DataFrame:
+        totals = self._team_totals(season)
+        rng = np.random.default_rng([self.seed, season, 1])
+        g = totals['G'].to_numpy()
+        ab = np.round(g * rng.normal(33.8, 0.6, len(g))).astype(int)
+        avg = rng.normal(0.245, 0.01, len(g))
+        return pd.DataFrame({
+            'Team': totals.index, 'G': g, 'AB': ab, 'R': totals['R'].astype(int).to_numpy(),
+            'H': np.round(ab * avg).astype(int), 'HR': np.round(g * rng.normal(1.2, 0.15, len(g))).astype(int),
+            'RBI': np.round(totals['R'].to_numpy() * 0.96).astype(int), 'SB': rng.integers(40, 180, len(g)),
+            'OBP': np.round(avg + rng.normal(0.07, 0.006, len(g)), 3),
+            'SLG': np.round(avg + rng.normal(0.165, 0.015, len(g)), 3),
+        })
+
+    def team_pitching(self, season: int) -> pd.DataFrame:
+        totals = self._team_totals(season)
+        rng = np.random.default_rng([self.seed, season, 2])
+        g = totals['G'].to_numpy()
+        ip = np.round(g * 8.95, 1)
+        return pd.DataFrame({
+            'Team': totals.index, 'W': totals['W'].to_numpy(), 'L': g - totals['W'].to_numpy(),
+            'ERA': np.round(totals['RA'].to_numpy() * 0.92 * 9 / ip, 2), 'IP': ip,
+            'SO': np.round(ip * rng.normal(1.0, 0.08, len(g))).astype(int),
+            'WHIP': np.round(rng.normal(1.27, 0.06, len(g)), 2), 'FIP': np.round(rng.normal(4.1, 0.3, len(g)), 2),
+        })
+
+    def _roster(self, pitchers: bool) -> pd.DataFrame:
+        """Stable players: FanGraphs IDs 100000 + team * 100 + slot (pitchers from slot 50)."""
+        hitters = self.players // 2
+        count = self.players - hitters if pitchers else hitters
+        team = np.repeat(np.arange(len(self.teams)), count)
+        slot = np.tile(np.arange(count), len(self.teams)) + (50 if pitchers else 0)
+        ids = 100000 + team * 100 + slot
+        return pd.DataFrame({
+            'IDfg': ids, 'Team': np.array(self.teams)[team],
+            'name_first': np.array(_FIRST_NAMES)[ids % len(_FIRST_NAMES)],
+            'name_last': np.array(_LAST_NAMES)[(ids // len(_FIRST_NAMES)) % len(_LAST_NAMES)],
+            'born': 1990 + ids % 12,
+        })
+
+    def batting_stats(self, season: int) -> pd.DataFrame:
+        roster = self._roster(pitchers=False)
+        rng = np.random.default_rng([self.seed, season, 3])
+        n = len(roster)
+        pa = rng.integers(40, 700, n)
+        ab = np.round(pa * 0.89).astype(int)
+        h = rng.binomial(ab, np.clip(rng.normal(0.25, 0.03, n), 0.15, 0.35))
+        doubles, triples, hr = rng.binomial(h, 0.2), rng.binomial(h, 0.02), rng.binomial(h, 0.13)
+        bb, hbp = rng.binomial(pa, 0.085), rng.binomial(pa, 0.01)
+        obp = (h + bb + hbp) / pa
+        slg = (h + doubles + 2 * triples + 3 * hr) / np.maximum(ab, 1)
+        return pd.DataFrame({
+            'IDfg': roster['IDfg'], 'Name': roster['name_first'] + ' ' + roster['name_last'], 'Team': roster['Team'],
+            'Age': season - roster['born'], 'G': np.minimum(162, pa // 4 + 1), 'PA': pa, 'AB': ab,
+            'R': rng.binomial(pa, 0.12), 'H': h, '2B': doubles, '3B': triples, 'HR': hr,
+            'RBI': rng.binomial(pa, 0.11), 'SB': rng.binomial(pa, 0.02), 'CS': rng.binomial(pa, 0.005),
+            'BB': bb, 'SO': rng.binomial(pa, 0.22), 'HBP': hbp, 'AVG': np.round(h / np.maximum(ab, 1), 3),
+            'OBP': np.round(obp, 3), 'SLG': np.round(slg, 3), 'OPS': np.round(obp + slg, 3),
+        })
+
+    def pitching_stats(self, season: int) -> pd.DataFrame:
+        roster = self._roster(pitchers=True)
+        rng = np.random.default_rng([self.seed, season, 4])
+        n = len(roster)
+        starter = (roster['IDfg'] % 100 - 50 < 5).to_numpy()
+        g = np.where(starter, rng.integers(20, 33, n), rng.integers(20, 70, n))
+        ip = np.round(np.where(starter, g * rng.normal(5.5, 0.4, n), g * rng.normal(1.0, 0.1, n)), 1)
+        er = rng.poisson(ip * np.clip(rng.normal(4.1, 0.8, n), 1.5, 8) / 9)
+        h, bb = rng.poisson(ip * 0.9), rng.poisson(ip * 0.33)
+        w = rng.binomial(np.where(starter, g, g // 4), 0.45)
+        return pd.DataFrame({
+            'IDfg': roster['IDfg'], 'Name': roster['name_first'] + ' ' + roster['name_last'], 'Team': roster['Team'],
+            'Age': season - roster['born'], 'W': w, 'L': rng.binomial(np.where(starter, g, g // 4), 0.4),
+            'ERA': np.round(er * 9 / ip, 2), 'G': g, 'GS': np.where(starter, g, 0), 'IP': ip, 'H': h,
+            'R': er + rng.poisson(0.08 * er + 0.01), 'ER': er, 'BB': bb, 'SO': rng.poisson(ip * 1.0),
+            'WHIP': np.round((h + bb) / ip, 2),
+        })
+
+    def statcast(self, start: str, end: str) -> pd.DataFrame:
+        """Pitch rows for the played games from `start` to `end`, in pybaseball's column names (a subset).
+
+        About 290 pitches a game, drawn per game day, so any split of a date range into windows yields the
+        same rows. Strings are plain object columns and missing values NaN, as pybaseball's.
+        """
+        first, last = pd.Timestamp(start), pd.Timestamp(end)
+        days = []
+        for season in range(first.year, last.year + 1):
+            if season not in self.seasons:
+                continue
+            schedule = pd.concat(self._season(season).values())
+            home = schedule[(schedule['Home_Away'] == 'Home') & schedule['R'].notna()].copy()
+            home['game_date'] = transform.schedule_dates(home['Date'], season)
+            home['game_pk'] = season * 100_000 + np.arange(len(home))
+            home = home[(home['game_date'] >= first) & (home['game_date'] <= last)]
+            days += [self._pitches(day, games) for day, games in home.groupby('game_date')]
+        return pd.concat(days, ignore_index=True) if days else pd.DataFrame()
+
+    def _pitches(self, day: pd.Timestamp, games: pd.DataFrame) -> pd.DataFrame:
+        rng = np.random.default_rng([self.seed, int(day.strftime('%Y%m%d'))])
+        per_game = rng.integers(250, 330, len(games))
+        game = np.repeat(np.arange(len(games)), per_game)
+        n = len(game)
+        pitch_in_game = np.arange(n) - np.repeat(np.cumsum(per_game) - per_game, per_game)
+        at_bat = pitch_in_game // 4 + 1
+        last_pitch = np.append(at_bat[1:] != at_bat[:-1], True)
+        in_play = last_pitch & (rng.random(n) < 0.65)
+        kinds = np.array(['FF', 'SL', 'CH', 'CU', 'SI', 'FC'])
+        names = np.array(['4-Seam Fastball', 'Slider', 'Changeup', 'Curveball', 'Sinker', 'Cutter'])
+        pitch = rng.integers(0, len(kinds), n)
+        events = np.where(in_play, rng.choice(['single', 'field_out', 'double', 'home_run', 'strikeout'], n), None)
+        hand = np.array(['L', 'R'])
+        return pd.DataFrame({
+            'pitch_type': kinds[pitch], 'game_date': day,
+            'release_speed': np.round(rng.normal(92, 3, n) - 6 * (pitch > 0), 1),
+            'player_name': 'Synthetic, Player', 'batter': 400000 + rng.integers(0, 5000, n),
+            'pitcher': 400000 + rng.integers(0, 5000, n), 'events': events,
+            'description': np.where(in_play, 'hit_into_play', rng.choice(['ball', 'called_strike', 'foul'], n)),
+            'zone': rng.integers(1, 15, n).astype(float), 'game_type': 'R', 'stand': hand[rng.integers(0, 2, n)],
+            'p_throws': hand[rng.integers(0, 2, n)], 'home_team': games['Tm'].to_numpy()[game],
+            'away_team': games['Opp'].to_numpy()[game],
+            'type': np.where(in_play, 'X', rng.choice(['B', 'S'], n)),
+            'bb_type': np.where(in_play, rng.choice(['ground_ball', 'line_drive', 'fly_ball', 'popup'], n), None),
+            'balls': rng.integers(0, 4, n), 'strikes': rng.integers(0, 3, n),
+            'pfx_x': rng.normal(0, 0.8, n), 'pfx_z': rng.normal(1, 0.6, n),
+            'plate_x': rng.normal(0, 0.8, n), 'plate_z': rng.normal(2.4, 0.9, n),
+            'on_1b': np.where(rng.random(n) < 0.3, 400000.0 + rng.integers(0, 5000, n), np.nan),
+            'outs_when_up': rng.integers(0, 3, n), 'inning': np.minimum(at_bat // 8 + 1, 9),
+            'inning_topbot': np.where(at_bat % 2 == 1, 'Top', 'Bot'),
+            'launch_speed': np.where(in_play, np.round(rng.normal(89, 14, n), 1), np.nan),
+            'launch_angle': np.where(in_play, np.round(rng.normal(12, 25, n)), np.nan),
+            'release_spin_rate': np.round(rng.normal(2300, 250, n)), 'game_pk': games['game_pk'].to_numpy()[game],
+            'at_bat_number': at_bat, 'pitch_number': np.where(last_pitch, 4, pitch_in_game % 4 + 1),
+            'pitch_name': names[pitch], 'delta_run_exp': np.round(rng.normal(0, 0.2, n), 3),
+        })
+
+    def chadwick_register(self) -> pd.DataFrame:
+        players = pd.concat([self._roster(pitchers=False), self._roster(pitchers=True)], ignore_index=True)
+        return pd.DataFrame({
+            'name_last': players['name_last'], 'name_first': players['name_first'],
+            'key_mlbam': 400000 + players['IDfg'], 'key_retro': 'syn' + players['IDfg'].astype(str),
+            'key_bbref': 'synth' + players['IDfg'].astype(str), 'key_fangraphs': players['IDfg'],
+            'mlb_played_first': min(self.seasons), 'mlb_played_last': max(self.seasons),
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record pybaseball responses for offline replay.")
+    parser.add_argument('directory', help="Where to write the recorded responses.")
+    parser.add_argument('--seasons', type=int, nargs='+', default=[2024], help="Seasons to record.")
+    parser.add_argument('--teams', nargs='*', default=list(TEAMS), help="Teams whose schedules to record.")
+    parser.add_argument('--source', default='live', help="Backend to record from (see fetch.backend_from_spec).")
+    args = parser.parse_args()
+    from .fetch import backend_from_spec
+    recorder = Recorder(backend_from_spec(args.source), args.directory)
+    recorder.chadwick_register()
+    for season in args.seasons:
+        for name in ('team_batting', 'team_pitching', 'batting_stats', 'pitching_stats'):
+            getattr(recorder, name)(season)
+        for team in args.teams:
+            recorder.schedule_and_record(season, bref_code(team, season))
+    print(f"Recorded {len(args.seasons)} seasons into {args.directory}.")
+
+
+if __name__ == "__main__":
+    main()
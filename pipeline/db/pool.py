@@ -0,0 +1,70 @@
+# pipeline/db/pool.py: Thread-safe DuckDB cursor pool
+
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+import duckdb
+from .schema import bootstrap
+
+DEFAULT_DATABASE = os.environ.get('BASEBALL_DUCKDB', './data/baseball.duckdb')
+
+
+class ConnectionPool:
+    """Hands each request its own cursor on one shared DuckDB database instance.
+
+    DuckDB connections are not safe to share between threads, but cursors (duplicate connections on the
+    same database) are independent and run queries in parallel. At most `size` cursors are checked out at
+    once; idle cursors are reused.
+    """
+
+    def __init__(self, database: str = DEFAULT_DATABASE, read_only: bool = False, size: int = 8):
+        self.database = database
+        self.read_only = read_only
+        self.size = size
+        if database != ':memory:':
+            os.makedirs(os.path.dirname(database) or '.', exist_ok=True)
+        self.connection = duckdb.connect(database=database, read_only=read_only)
+        if not read_only:
+            # Ensure schemas and tables exist; a single catalog probe when nothing changed
+            bootstrap(self.connection)
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Check out a cursor for the duration of one request."""
+        self._slots.acquire()
+        try:
+            try:
+                cur = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed.")
+                    cur = self.connection.cursor()
+            try:
+                yield cur
+            except BaseException:
+                # Never hand the next request a cursor stuck in a failed transaction or half-read result
+                cur.close()
+                raise
+            else:
+                self._idle.put(cur)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close every idle cursor and the shared database handle."""
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self.connection.close()
@@ -0,0 +1,123 @@
+# pipeline/db/refresh.py: Incremental maintenance of the processed and features layers
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import duckdb
+from .sql.pybaseball.db import CREATE_DIRTY_PARTITIONS
+from .sql.pybaseball.processed import (
+    SELECT_PROCESSED_TEAM_BATTING, SELECT_PROCESSED_TEAM_PITCHING,
+    SELECT_PROCESSED_PLAYER_BATTING, SELECT_PROCESSED_PLAYER_PITCHING,
+    CREATE_PROCESSED_TEAM_BATTING, CREATE_PROCESSED_TEAM_PITCHING,
+    CREATE_PROCESSED_PLAYER_BATTING, CREATE_PROCESSED_PLAYER_PITCHING
+)
+from .sql.pybaseball.features import (
+    SELECT_FEATURES_TEAM_FEATURES, SELECT_FEATURES_PLAYER_FEATURES, SELECT_FEATURES_TEAM_ROLLING,
+    CREATE_FEATURES_TEAM_FEATURES, CREATE_FEATURES_PLAYER_FEATURES, CREATE_FEATURES_TEAM_ROLLING
+)
+from .rolling import refresh_team_rolling
+
+
+@dataclass(frozen=True)
+class DerivedTable:
+    """A table maintained from upstream tables, partitioned by (season, key)."""
+    name: str
+    select: str  # SELECT producing the full table contents
+    rebuild: str  # CREATE OR REPLACE form used for full rebuilds
+    key: str  # non-season partition column
+    sources: Tuple[str, ...]
+    # Replaces the generic delete-and-reinsert of dirty partitions when a table can do finer-grained work
+    incremental: Optional[Callable[[duckdb.DuckDBPyConnection], int]] = None
+
+
+# Topologically ordered: every table appears after all of its sources
+DERIVED_TABLES = (
+    DerivedTable('processed.pybaseball_team_batting', SELECT_PROCESSED_TEAM_BATTING, CREATE_PROCESSED_TEAM_BATTING,
+                 'team', ('raw.pybaseball_team_batting',)),
+    DerivedTable('processed.pybaseball_team_pitching', SELECT_PROCESSED_TEAM_PITCHING, CREATE_PROCESSED_TEAM_PITCHING,
+                 'team', ('raw.pybaseball_team_pitching',)),
+    DerivedTable('processed.pybaseball_player_batting', SELECT_PROCESSED_PLAYER_BATTING, CREATE_PROCESSED_PLAYER_BATTING,
+                 'player_id', ('raw.pybaseball_player_batting',)),
+    DerivedTable('processed.pybaseball_player_pitching', SELECT_PROCESSED_PLAYER_PITCHING, CREATE_PROCESSED_PLAYER_PITCHING,
+                 'player_id', ('raw.pybaseball_player_pitching',)),
+    DerivedTable('features.team_features', SELECT_FEATURES_TEAM_FEATURES, CREATE_FEATURES_TEAM_FEATURES,
+                 'team', ('processed.pybaseball_team_batting', 'processed.pybaseball_team_pitching')),
+    DerivedTable('features.player_features', SELECT_FEATURES_PLAYER_FEATURES, CREATE_FEATURES_PLAYER_FEATURES,
+                 'player_id', ('processed.pybaseball_player_batting', 'processed.pybaseball_player_pitching')),
+    DerivedTable('features.team_rolling', SELECT_FEATURES_TEAM_ROLLING, CREATE_FEATURES_TEAM_ROLLING,
+                 'team', ('raw.games',), refresh_team_rolling),
+)
+
+# Partition key of each raw table that feeds the derived layers (a game belongs to both teams' partitions)
+RAW_KEYS = {
+    'raw.pybaseball_team_batting': 'team',
+    'raw.pybaseball_team_pitching': 'team',
+    'raw.pybaseball_player_batting': 'player_id',
+    'raw.pybaseball_player_pitching': 'player_id',
+    'raw.games': 'UNNEST([home_team, away_team])',
+}
+
+
+def mark_dirty(con: duckdb.DuckDBPyConnection, table: str, relation: str) -> None:
+    """Record the (season, key) partitions of `relation` (rows just written to raw `table`) as dirty.
+
+    `relation` is any table, view or registered frame with the raw table's season and key columns.
+    """
+    key = RAW_KEYS[table]
+    con.execute(f"""
+        INSERT INTO meta.dirty_partitions
+        SELECT DISTINCT ? AS table_name, season, CAST({key} AS VARCHAR) AS key FROM {relation};
+    """, [table])
+
+
+def refresh(con: duckdb.DuckDBPyConnection, full: bool = False) -> int:
+    """Bring the processed and features layers up to date with raw.
+
+    Incremental mode deletes and re-derives only the dirty (season, key) partitions, propagating them
+    downstream table by table, so the work scales with the size of the change. `full=True` rebuilds every
+    derived table from scratch (for backfills or SQL changes). Returns the number of partitions refreshed
+    (or derived tables rebuilt in full mode).
+    """
+    con.execute(CREATE_DIRTY_PARTITIONS)
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if full:
+            for table in DERIVED_TABLES:
+                con.execute(table.rebuild)
+            con.execute("DELETE FROM meta.dirty_partitions")
+            con.execute("COMMIT")
+            return len(DERIVED_TABLES)
+
+        refreshed = 0
+        for table in DERIVED_TABLES:
+            sources = ', '.join(f"'{source}'" for source in table.sources)
+            con.execute(f"""
+                CREATE OR REPLACE TEMP TABLE dirty_keys AS
+                SELECT DISTINCT season, key FROM meta.dirty_partitions WHERE table_name IN ({sources});
+            """)
+            dirty = con.execute("SELECT COUNT(*) FROM dirty_keys").fetchone()[0]
+            if dirty == 0:
+                continue
+            if table.incremental is not None:
+                table.incremental(con)
+            else:
+                con.execute(f"CREATE TABLE IF NOT EXISTS {table.name} AS {table.select};")
+                con.execute(f"""
+                    DELETE FROM {table.name}
+                    WHERE (season, CAST({table.key} AS VARCHAR)) IN (SELECT season, key FROM dirty_keys);
+                """)
+                con.execute(f"""
+                    INSERT INTO {table.name}
+                    SELECT * FROM ({table.select}) derived
+                    WHERE (season, CAST({table.key} AS VARCHAR)) IN (SELECT season, key FROM dirty_keys);
+                """)
+            # Downstream tables see this table's refreshed partitions as dirty
+            con.execute("INSERT INTO meta.dirty_partitions SELECT ?, season, key FROM dirty_keys", [table.name])
+            refreshed += dirty
+        con.execute("DROP TABLE IF EXISTS dirty_keys")
+        con.execute("DELETE FROM meta.dirty_partitions")
+        con.execute("COMMIT")
+        return refreshed
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
@@ -0,0 +1,205 @@
+# pipeline/db/register.py: Local, indexed player-ID register backed by DuckDB
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import duckdb
+from . import fetch
+from .sql.pybaseball.raw import CREATE_PLAYER_REGISTER, CREATE_PLAYER_REGISTER_TRIGRAMS
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+# Generational suffixes are dropped so "Ronald Acuna Jr." matches the register's "ronald acuna"
+_SUFFIXES = r'\b(?:jr|sr|ii|iii|iv)\b'
+_PUNCTUATION = r"[.'’`,-]"
+
+# Minimum trigram Jaccard similarity for a fuzzy match to be accepted
+FUZZY_THRESHOLD = 0.35
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerIds:
+    """Cross-reference IDs for one player."""
+    mlbam: int
+    fangraphs: int
+    bbref: Optional[str]
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a player name for exact matching (lowercase, no accents, punctuation or suffixes)."""
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    name = re.sub(_PUNCTUATION, ' ', name)
+    name = re.sub(_SUFFIXES, ' ', name)
+    return ' '.join(name.split())
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Vectorized normalize_name over a Series of names."""
+    return (
+        names.fillna('')
+        .str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+        .str.lower()
+        .str.replace(_PUNCTUATION, ' ', regex=True)
+        .str.replace(_SUFFIXES, ' ', regex=True)
+        .str.split().str.join(' ')
+    )
+
+
+class PlayerRegister:
+    """Name -> (MLBAM, FanGraphs, BBRef) resolution against raw.player_register.
+
+    The register is downloaded once into DuckDB; exact lookups are then served from an in-memory
+    dictionary built from that table, and fuzzy lookups from the precomputed trigram table.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection):
+        # Every operation runs on its own cursor, so one register can serve many threads
+        self._con = con
+        self._exact: Optional[Dict[str, PlayerIds]] = None
+        self._lock = threading.RLock()
+
+    def ensure_loaded(self, force: bool = False) -> None:
+        """Populate raw.player_register (and its trigram index) from the Chadwick register if empty."""
+        with self._con.cursor() as con:
+            self._load(con, force)
+        with self._lock:
+            self._exact = None
+
+    def _load(self, con: duckdb.DuckDBPyConnection, force: bool) -> None:
+        if not force:
+            try:
+                if con.execute("SELECT COUNT(*) FROM raw.player_register").fetchone()[0] > 0:
+                    return
+            except duckdb.CatalogException:
+                pass
+        con.execute(CREATE_PLAYER_REGISTER)
+        con.execute(CREATE_PLAYER_REGISTER_TRIGRAMS)
+
+        register = fetch.chadwick_register()
+        register = register.assign(
+            name_norm=normalize_names(register['name_first'].fillna('') + ' ' + register['name_last'].fillna(''))
+        )
+        register = register[register['name_norm'] != '']
+        con.register('temp_register', register)
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute("DELETE FROM raw.player_register_trigrams")
+            con.execute("DELETE FROM raw.player_register")
+            con.execute("""
+                INSERT INTO raw.player_register
+                SELECT name_norm, name_first, name_last,
+                    NULLIF(key_mlbam, -1), NULLIF(key_fangraphs, -1), key_bbref,
+                    mlb_played_first, mlb_played_last
+                FROM temp_register;
+            """)
+            con.execute("""
+                INSERT INTO raw.player_register_trigrams
+                SELECT DISTINCT substr(padded, i::INTEGER, 3) AS trigram, name_norm
+                FROM (
+                    SELECT name_norm, padded, UNNEST(range(1, length(padded) - 1)) AS i
+                    FROM (SELECT DISTINCT name_norm, '  ' || name_norm || ' ' AS padded FROM raw.player_register)
+                );
+            """)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        finally:
+            con.unregister('temp_register')
+
+    def _exact_index(self) -> Dict[str, PlayerIds]:
+        """Build (once) the in-memory normalized-name index, preferring the most recent MLB player per name."""
+        if self._exact is None:
+            with self._lock:
+                if self._exact is None:
+                    self.ensure_loaded()
+                    with self._con.cursor() as con:
+                        rows = con.execute("""
+                            SELECT name_norm, key_mlbam, key_fangraphs, key_bbref
+                            FROM raw.player_register
+                            WHERE key_mlbam IS NOT NULL
+                            ORDER BY name_norm, mlb_played_last DESC NULLS LAST
+                        """).fetchall()
+                    index: Dict[str, PlayerIds] = {}
+                    for name_norm, mlbam, fangraphs, bbref in rows:
+                        index.setdefault(name_norm, PlayerIds(mlbam, fangraphs if fangraphs is not None else -1, bbref))
+                    self._exact = index
+        return self._exact
+
+    def lookup(self, player_name: str) -> Optional[PlayerIds]:
+        """Return all IDs for one player name in a single probe (exact first, then fuzzy)."""
+        ids = self._exact_index().get(normalize_name(player_name))
+        if ids is not None:
+            return ids
+        resolved = self.resolve_ids([player_name])
+        if resolved.empty or pd.isna(resolved['key_mlbam'].iloc[0]):
+            return None
+        row = resolved.iloc[0]
+        return PlayerIds(int(row['key_mlbam']), int(row['key_fangraphs']) if pd.notna(row['key_fangraphs']) else -1,
+                         row['key_bbref'] if pd.notna(row['key_bbref']) else None)
+
+    def resolve_ids(self, player_names: List[str]) -> pd.DataFrame:
+        """Resolve many names at once in a single set-based query.
+
+        Returns one row per input name (in input order) with key_mlbam, key_fangraphs, key_bbref and
+        match ('exact', 'fuzzy' or None when unresolved).
+        """
+        self._exact_index()
+        names = pd.DataFrame({'player_name': list(player_names)})
+        names['ordinal'] = range(len(names))
+        names['name_norm'] = normalize_names(names['player_name'])
+        with self._con.cursor() as con:
+            con.register('temp_names', names)
+            return con.execute(f"""
+                WITH register AS (
+                    SELECT name_norm, key_mlbam, key_fangraphs, key_bbref
+                    FROM raw.player_register
+                    WHERE key_mlbam IS NOT NULL
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY name_norm ORDER BY mlb_played_last DESC NULLS LAST) = 1
+                ),
+                unmatched AS (
+                    SELECT DISTINCT n.name_norm, '  ' || n.name_norm || ' ' AS padded
+                    FROM temp_names n ANTI JOIN register r ON n.name_norm = r.name_norm
+                    WHERE n.name_norm != ''
+                ),
+                query_trigrams AS (
+                    SELECT DISTINCT name_norm, substr(padded, i::INTEGER, 3) AS trigram
+                    FROM (SELECT name_norm, padded, UNNEST(range(1, length(padded) - 1)) AS i FROM unmatched)
+                ),
+                query_sizes AS (SELECT name_norm, COUNT(*) AS n FROM query_trigrams GROUP BY name_norm),
+                candidate_sizes AS (
+                    SELECT name_norm, COUNT(*) AS n FROM raw.player_register_trigrams
+                    WHERE name_norm IN (
+                        SELECT t.name_norm FROM raw.player_register_trigrams t JOIN query_trigrams q USING (trigram)
+                    )
+                    GROUP BY name_norm
+                ),
+                fuzzy AS (
+                    SELECT q.name_norm AS query_norm, t.name_norm AS match_norm,
+                        COUNT(*) / (ANY_VALUE(qs.n) + ANY_VALUE(cs.n) - COUNT(*)) AS similarity
+                    FROM query_trigrams q
+                    JOIN raw.player_register_trigrams t USING (trigram)
+                    JOIN query_sizes qs ON qs.name_norm = q.name_norm
+                    JOIN candidate_sizes cs ON cs.name_norm = t.name_norm
+                    JOIN register r ON r.name_norm = t.name_norm
+                    GROUP BY q.name_norm, t.name_norm
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY q.name_norm ORDER BY similarity DESC, match_norm) = 1
+                )
+                SELECT n.player_name,
+                    COALESCE(e.key_mlbam, fr.key_mlbam) AS key_mlbam,
+                    COALESCE(e.key_fangraphs, fr.key_fangraphs) AS key_fangraphs,
+                    COALESCE(e.key_bbref, fr.key_bbref) AS key_bbref,
+                    CASE WHEN e.key_mlbam IS NOT NULL THEN 'exact'
+                         WHEN fr.key_mlbam IS NOT NULL THEN 'fuzzy' END AS match
+                FROM temp_names n
+                LEFT JOIN register e ON e.name_norm = n.name_norm
+                LEFT JOIN fuzzy f ON f.query_norm = n.name_norm AND f.similarity >= {FUZZY_THRESHOLD}
+                LEFT JOIN register fr ON fr.name_norm = f.match_norm
+                ORDER BY n.ordinal;
+            """).fetchdf()
@@ -0,0 +1,137 @@
+# pipeline/db/rolling.py: Incremental maintenance of point-in-time team form and the per-game training frame
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Optional, Union
+
+import duckdb
+from .sql.pybaseball.db import CREATE_DIRTY_PARTITIONS
+from .sql.pybaseball.features import (
+    CREATE_FEATURES_TEAM_ROLLING, CREATE_TEAM_ROLLING, SELECT_TEAM_GAMES, SELECT_TEAM_ROLLING
+)
+from .lazy import lazy_import
+
+pa = lazy_import('pyarrow')
+pd = lazy_import('pandas')
+
+# Pre-game columns of features.team_rolling, carried into the training frame once per side
+FORM_COLUMNS = [
+    'rest_days', 'games_played', 'win_pct', 'runs_for_pg', 'runs_against_pg',
+    'win_pct_l10', 'runs_for_l10', 'runs_against_l10', 'win_pct_l30', 'runs_for_l30', 'runs_against_l30',
+    'win_pct_ewm', 'runs_for_ewm', 'runs_against_ewm'
+]
+
+# Columns compared against features.team_rolling to find the games added, played or corrected in a dirty team-season
+_TRACKED = 'game_id, team, season, game_date, game_num, opponent, is_home, runs_for, runs_against'
+
+
+def refresh_team_rolling(con: duckdb.DuckDBPyConnection) -> int:
+    """Re-derive features.team_rolling for the team-seasons of raw.games in meta.dirty_partitions; returns rows written.
+
+    Within each dirty team-season only rows from its earliest changed game onward are deleted and re-derived,
+    so adding tonight's results rewrites tonight's and later rows and never touches earlier windows. Runs in
+    the caller's transaction and leaves the dirty marks for it to clear (refresh.refresh does both).
+    """
+    con.execute(CREATE_TEAM_ROLLING)
+    # Windows only ever need the dirty team-seasons' own games
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE rolling_games AS
+        SELECT t.* FROM ({SELECT_TEAM_GAMES}) t
+        WHERE (t.season, t.team) IN (SELECT season, key FROM meta.dirty_partitions WHERE table_name = 'raw.games');
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE rolling_changes AS
+        WITH stored AS (
+            SELECT {_TRACKED} FROM features.team_rolling
+            WHERE (season, team) IN (SELECT season, key FROM meta.dirty_partitions WHERE table_name = 'raw.games')
+        )
+        SELECT team, season, MIN(game_date) AS since
+        FROM (
+            (SELECT {_TRACKED} FROM rolling_games EXCEPT SELECT {_TRACKED} FROM stored)
+            UNION ALL
+            (SELECT {_TRACKED} FROM stored EXCEPT SELECT {_TRACKED} FROM rolling_games)
+        )
+        GROUP BY team, season;
+    """)
+    con.execute("""
+        DELETE FROM features.team_rolling r USING rolling_changes c
+        WHERE r.team = c.team AND r.season = c.season AND r.game_date >= c.since;
+    """)
+    rows = con.execute(f"""
+        INSERT INTO features.team_rolling
+        SELECT f.* FROM ({SELECT_TEAM_ROLLING.format(team_games='rolling_games')}) f
+        JOIN rolling_changes c USING (team, season)
+        WHERE f.game_date >= c.since;
+    """).fetchone()[0]
+    con.execute("DROP TABLE rolling_games")
+    con.execute("DROP TABLE rolling_changes")
+    return rows
+
+
+def update_team_rolling(con: duckdb.DuckDBPyConnection, full: bool = False) -> int:
+    """Bring features.team_rolling up to date with the raw.games partitions marked dirty; returns rows (re)written.
+
+    refresh.refresh does this along with the rest of the derived layer; this maintains only team_rolling and
+    clears only raw.games' dirty marks. `full=True` rebuilds every row.
+    """
+    con.execute(CREATE_DIRTY_PARTITIONS)
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if full:
+            con.execute(CREATE_FEATURES_TEAM_ROLLING)
+            rows = con.execute("SELECT COUNT(*) FROM features.team_rolling").fetchone()[0]
+        else:
+            rows = refresh_team_rolling(con)
+        con.execute("DELETE FROM meta.dirty_partitions WHERE table_name = 'raw.games'")
+        con.execute("COMMIT")
+        return rows
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+
+def game_features(con: duckdb.DuckDBPyConnection, seasons: Optional[Iterable[int]] = None,
+                  game_date: Optional[date] = None, format: str = 'pandas') -> Union[pd.DataFrame, pa.Table]:
+    """Return one row per game with both teams' pre-game form, the closing consensus moneylines (when
+    raw.odds has them) and the home_win label (NULL until played).
+
+    A single set-based join of raw.games against features.team_rolling, so any number of seasons (or one
+    day's slate, with game_date) loads in one query. `format='arrow'` returns a pyarrow Table instead.
+    """
+    form = ', '.join(f"h.{col} AS home_{col}, a.{col} AS away_{col}" for col in FORM_COLUMNS)
+    filters, params = [], {}
+    if seasons is not None:
+        filters.append("g.season IN (SELECT UNNEST($seasons))")
+        params['seasons'] = list(seasons)
+    if game_date is not None:
+        filters.append("g.game_date = $game_date")
+        params['game_date'] = game_date
+    result = con.execute(f"""
+        SELECT g.game_id, g.season, g.game_date, g.game_num, g.home_team, g.away_team,
+            CASE WHEN g.home_runs IS NOT NULL AND g.away_runs IS NOT NULL THEN g.home_runs > g.away_runs END AS home_win,
+            {form}, o.moneyline_home, o.moneyline_away
+        FROM raw.games g
+        JOIN features.team_rolling h ON h.game_id = g.game_id AND h.team = g.home_team
+        JOIN features.team_rolling a ON a.game_id = g.game_id AND a.team = g.away_team
+        LEFT JOIN raw.odds o ON o.game_id = g.game_id
+        {'WHERE ' + ' AND '.join(filters) if filters else ''}
+        ORDER BY g.game_date, g.game_id;
+    """, params)
+    return result.to_arrow_table() if format == 'arrow' else result.fetchdf()
+
+
+def team_form(con: duckdb.DuckDBPyConnection, as_of: date) -> pd.DataFrame:
+    """Return each team's pre-game form going into its first game on or after `as_of`.
+
+    Teams with no game left fall back to their last scheduled game, so a full matrix can always be built.
+    """
+    return con.execute(f"""
+        SELECT team, {', '.join(FORM_COLUMNS)}
+        FROM features.team_rolling
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY team
+            ORDER BY game_date < $as_of, CASE WHEN game_date >= $as_of THEN game_date END, game_date DESC, game_num
+        ) = 1
+        ORDER BY team;
+    """, {'as_of': as_of}).fetchdf()
@@ -0,0 +1,167 @@
+# pipeline/db/schema.py: Versioned schema bootstrap
+
+import hashlib
+from typing import Dict, List, Set, Tuple
+
+import duckdb
+from .refresh import DERIVED_TABLES, refresh
+from .sql.pybaseball.db import (
+    CREATE_SCHEMAS, CREATE_DIRTY_PARTITIONS, CREATE_SCHEMA_VERSIONS, CREATE_BACKTEST_RESULTS,
+    CREATE_QUERY_LOG, CREATE_STATCAST_CHUNKS,
+)
+from .sql.pybaseball.raw import (
+    CREATE_TEAM_BATTING, CREATE_TEAM_PITCHING, CREATE_GAME_LOGS,
+    CREATE_PLAYER_BATTING, CREATE_PLAYER_PITCHING, CREATE_GAMES,
+    CREATE_PLAYER_REGISTER, CREATE_PLAYER_REGISTER_TRIGRAMS, CREATE_STATCAST
+)
+from .sql.pybaseball.features import CREATE_SEASON_SIMULATIONS
+from .sql.oddsportal.raw import CREATE_ODDS, CREATE_ODDS_SNAPSHOTS
+from .sql.oddsportal.features import CREATE_MARKET_EDGES
+from .sql.openmeteo.raw import CREATE_PARKS, CREATE_HOME_PARKS, CREATE_PARK_EXCEPTIONS, CREATE_WEATHER
+
+# Source-of-truth tables, created with CREATE TABLE IF NOT EXISTS and migrated only by adding columns (never dropped)
+BASE_TABLES = {
+    'meta.dirty_partitions': CREATE_DIRTY_PARTITIONS,
+    'meta.backtest_results': CREATE_BACKTEST_RESULTS,
+    'meta.query_log': CREATE_QUERY_LOG,
+    'meta.statcast_chunks': CREATE_STATCAST_CHUNKS,
+    'raw.pybaseball_team_batting': CREATE_TEAM_BATTING,
+    'raw.pybaseball_team_pitching': CREATE_TEAM_PITCHING,
+    # Superseded by raw.games and no longer written; kept so databases loaded before then still open
+    'raw.pybaseball_game_logs': CREATE_GAME_LOGS,
+    'raw.pybaseball_player_batting': CREATE_PLAYER_BATTING,
+    'raw.pybaseball_player_pitching': CREATE_PLAYER_PITCHING,
+    'raw.games': CREATE_GAMES,
+    'raw.statcast': CREATE_STATCAST,
+    'raw.player_register': CREATE_PLAYER_REGISTER,
+    'raw.player_register_trigrams': CREATE_PLAYER_REGISTER_TRIGRAMS,
+    'features.season_simulations': CREATE_SEASON_SIMULATIONS,
+    'raw.odds': CREATE_ODDS,
+    'raw.odds_snapshots': CREATE_ODDS_SNAPSHOTS,
+    'features.market_edges': CREATE_MARKET_EDGES,
+    'raw.parks': CREATE_PARKS,
+    'raw.home_parks': CREATE_HOME_PARKS,
+    'raw.park_exceptions': CREATE_PARK_EXCEPTIONS,
+    'raw.weather': CREATE_WEATHER,
+}
+
+# Pseudo-object carrying the count of unpropagated raw changes in the bootstrap probe
+_DIRTY = '__dirty_partitions__'
+
+
+def _hash(sql: str) -> str:
+    return hashlib.sha256(sql.encode()).hexdigest()[:16]
+
+
+def expected_versions() -> Dict[str, str]:
+    """Return the DDL hash every schema object should be at."""
+    versions = {name: _hash(ddl) for name, ddl in BASE_TABLES.items()}
+    versions.update({table.name: _hash(table.rebuild) for table in DERIVED_TABLES})
+    return versions
+
+
+def _applied_versions(con: duckdb.DuckDBPyConnection) -> Dict[str, str]:
+    """Read recorded hashes plus the pending dirty-partition count in one catalog probe."""
+    try:
+        return dict(con.execute(f"""
+            SELECT object_name, sql_hash FROM meta.schema_versions
+            UNION ALL
+            SELECT '{_DIRTY}', CAST(COUNT(*) AS VARCHAR) FROM meta.dirty_partitions;
+        """).fetchall())
+    except duckdb.CatalogException:
+        return {}
+
+
+def _columns(con: duckdb.DuckDBPyConnection, table: str) -> List[Tuple[str, str, str, str]]:
+    """Name, type, default and nullability of each of a table's columns, in order (empty if it does not exist)."""
+    schema, name = table.split('.')
+    return con.execute("""
+        SELECT column_name, data_type, column_default, is_nullable
+        FROM information_schema.columns
+        WHERE table_schema = $schema AND table_name = $name AND table_catalog = current_database()
+        ORDER BY ordinal_position;
+    """, {'schema': schema, 'name': name}).fetchall()
+
+
+def _keys(con: duckdb.DuckDBPyConnection, table: str) -> List[Tuple[str, List[str]]]:
+    schema, name = table.split('.')
+    return con.execute("""
+        SELECT constraint_type, constraint_column_names
+        FROM duckdb_constraints()
+        WHERE schema_name = $schema AND table_name = $name AND database_name = current_database()
+            AND constraint_type IN ('PRIMARY KEY', 'UNIQUE')
+        ORDER BY ALL;
+    """, {'schema': schema, 'name': name}).fetchall()
+
+
+def _apply_base_table(con: duckdb.DuckDBPyConnection, table: str, ddl: str) -> None:
+    """Create a base table, or bring an existing one up to `ddl` by adding the columns it lacks.
+
+    The DDL is run in a scratch in-memory database to read the intended columns and keys. Only new trailing
+    nullable columns can be added in place; any other difference raises, since base tables hold data
+    that cannot be rebuilt, and the new version is then not recorded.
+    """
+    current = _columns(con, table)
+    if current:
+        scratch = duckdb.connect()
+        try:
+            scratch.execute(CREATE_SCHEMAS)
+            scratch.execute(ddl)
+            target, target_keys = _columns(scratch, table), _keys(scratch, table)
+        finally:
+            scratch.close()
+        added = target[len(current):]
+        if (target[:len(current)] != current or _keys(con, table) != target_keys
+                or any(nullable == 'NO' for *_, nullable in added)):
+            raise RuntimeError(
+                f"{table} does not match its DDL and cannot be migrated in place (only new trailing nullable "
+                f"columns can be added); has {[c[:2] for c in current]}, expected {[c[:2] for c in target]}. "
+                f"Migrate it by hand, e.g. db-export, drop the table, then restore the snapshot."
+            )
+        for column, data_type, default, _ in added:
+            con.execute(f'ALTER TABLE {table} ADD COLUMN "{column}" {data_type}'
+                        + (f" DEFAULT {default}" if default is not None else ''))
+    # Creates the table if missing, and any index added to its DDL since
+    con.execute(ddl)
+
+
+def bootstrap(con: duckdb.DuckDBPyConnection) -> bool:
+    """Ensure every schema object exists and is current, doing no writes when nothing has changed.
+
+    Base tables are created if missing and given any columns added to their DDL (other changes raise
+    rather than being recorded as applied). A derived table is rebuilt only when its SQL hash changed or
+    one of its upstream tables was rebuilt; pending raw changes are propagated incrementally.
+    Returns True if anything was (re)applied.
+    """
+    expected = expected_versions()
+    applied = _applied_versions(con)
+    dirty = int(applied.pop(_DIRTY, 0))
+    if applied == expected and dirty == 0:
+        return False
+
+    con.execute(CREATE_SCHEMAS)
+    con.execute(CREATE_SCHEMA_VERSIONS)
+    changed: Set[str] = set()
+    for name, ddl in BASE_TABLES.items():
+        if applied.get(name) != expected[name]:
+            _apply_base_table(con, name, ddl)
+            changed.add(name)
+
+    stale: Set[str] = set()
+    for table in DERIVED_TABLES:
+        if applied.get(table.name) != expected[table.name] or stale.intersection(table.sources):
+            con.execute(table.rebuild)
+            stale.add(table.name)
+    changed |= stale
+
+    if changed:
+        con.executemany(
+            "INSERT OR REPLACE INTO meta.schema_versions VALUES (?, ?, current_timestamp)",
+            [[name, expected[name]] for name in sorted(changed)]
+        )
+        con.execute(
+            "DELETE FROM meta.schema_versions WHERE object_name NOT IN (SELECT UNNEST(?))", [list(expected)]
+        )
+    if dirty:
+        refresh(con)
+    return True
@@ -0,0 +1,77 @@
+# pipeline/db/scoring.py: Batched win-probability scoring of whole slates with a booster kept in memory
+
+from __future__ import annotations
+
+import threading
+from datetime import date
+from typing import Optional, Sequence, Union
+
+import duckdb
+from . import rolling
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+xgb = lazy_import('xgboost')
+
+# Model inputs in training order: every pre-game form column of the home team, then of the away team
+FEATURES = [f"{side}_{col}" for side in ('home', 'away') for col in rolling.FORM_COLUMNS]
+
+
+class SlateScorer:
+    """Loads a trained XGBoost booster once and scores many games per call.
+
+    Features for a whole slate (or every home/away pairing) come from one query, and all rows are predicted
+    in a single `inplace_predict` call on a float32 matrix, so no DMatrix is built per request. A scorer
+    is safe to share between threads; reloading swaps the booster atomically.
+    """
+
+    def __init__(self, model: Union[str, xgb.Booster], features: Optional[Sequence[str]] = None):
+        self._lock = threading.Lock()
+        self.load(model, features)
+
+    def load(self, model: Union[str, xgb.Booster], features: Optional[Sequence[str]] = None) -> None:
+        """(Re)load the booster from a saved model file or take a trained one as is."""
+        booster = model if isinstance(model, xgb.Booster) else xgb.Booster(model_file=model)
+        features = list(features or booster.feature_names or FEATURES)
+        with self._lock:
+            self._booster, self.features = booster, features
+
+    def predict(self, frame: pd.DataFrame) -> np.ndarray:
+        """Home-win probability of every row of a frame holding the model's feature columns."""
+        with self._lock:
+            booster, features = self._booster, self.features
+        if frame.empty:
+            return np.empty(0)
+        missing = sorted(set(features) - set(frame.columns))
+        if missing:
+            raise ValueError(f"Frame is missing model features: {missing[:5]}")
+        matrix = frame[features].to_numpy(dtype=np.float32, na_value=np.nan)
+        return booster.inplace_predict(matrix, missing=np.nan)
+
+    def score_slate(self, con: duckdb.DuckDBPyConnection, game_date: date) -> pd.DataFrame:
+        """Score every game scheduled on `game_date`.
+
+        Returns game_id, game_date, home_team, away_team and home_prob, ready to pass to pricing.reprice.
+        """
+        games = rolling.game_features(con, game_date=game_date)
+        keys = games[['game_id', 'game_date', 'home_team', 'away_team']].copy()
+        keys['home_prob'] = self.predict(games)
+        return keys
+
+    def score_matrix(self, con: duckdb.DuckDBPyConnection, as_of: date,
+                     teams: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Score every home/away pairing of teams (30 x 29 by default) on their form as of `as_of`.
+
+        Returns home_team, away_team and home_prob; rest days are each team's own going into its next game.
+        """
+        form = rolling.team_form(con, as_of)
+        if teams is not None:
+            form = form[form['team'].isin(teams)]
+        home = form.add_prefix('home_')
+        away = form.add_prefix('away_')
+        pairs = home.merge(away, how='cross')
+        pairs = pairs[pairs['home_team'] != pairs['away_team']].reset_index(drop=True)
+        matrix = pairs[['home_team', 'away_team']].copy()
+        matrix['home_prob'] = self.predict(pairs)
+        return matrix
@@ -1,190 +1,269 @@
 # pipeline/db/sdk.py: SDK for Interacting with Baseball DuckDB Database
 
-import duckdb
-import pybaseball as pyb
-import pandas as pd
-from typing import Optional, List
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+from . import fetch, lines, trace, transform
+from .pool import DEFAULT_DATABASE, ConnectionPool
+from .refresh import mark_dirty, refresh
+from .register import PlayerRegister
 from .models.batting import PlayerBattingStats, TeamBattingStats
 from .models.pitching import PlayerPitchingStats
-from .sql.pybaseball.db import CREATE_SCHEMAS
-from .sql.pybaseball.raw import (
-    CREATE_TEAM_BATTING, CREATE_TEAM_PITCHING, CREATE_GAME_LOGS,
-    CREATE_PLAYER_BATTING, CREATE_PLAYER_PITCHING
-)
-from .sql.pybaseball.processed import (
-    CREATE_PROCESSED_TEAM_BATTING, CREATE_PROCESSED_TEAM_PITCHING,
-    CREATE_PROCESSED_PLAYER_BATTING, CREATE_PROCESSED_PLAYER_PITCHING
-)
-from .sql.pybaseball.features import (
-    CREATE_FEATURES_TEAM_FEATURES, CREATE_FEATURES_PLAYER_FEATURES
-)
-import os
-
-# Global persistent connection (singleton-like for no cold starts)
-_connection = None
-
-def _get_connection() -> duckdb.DuckDBPyConnection:
-    """Lazily initialize and return persistent connection, ensuring tables exist."""
-    global _connection
-    if _connection is None:
-        os.makedirs('./data', exist_ok=True)
-        _connection = duckdb.connect(database='./data/baseball.duckdb', read_only=False)
-        # Ensure schemas and all tables exist
-        _connection.execute(CREATE_SCHEMAS)
-        _connection.execute(CREATE_TEAM_BATTING)
-        _connection.execute(CREATE_TEAM_PITCHING)
-        _connection.execute(CREATE_GAME_LOGS)
-        _connection.execute(CREATE_PLAYER_BATTING)
-        _connection.execute(CREATE_PLAYER_PITCHING)
-        _connection.execute(CREATE_PROCESSED_TEAM_BATTING)
-        _connection.execute(CREATE_PROCESSED_TEAM_PITCHING)
-        _connection.execute(CREATE_PROCESSED_PLAYER_BATTING)
-        _connection.execute(CREATE_PROCESSED_PLAYER_PITCHING)
-        _connection.execute(CREATE_FEATURES_TEAM_FEATURES)
-        _connection.execute(CREATE_FEATURES_PLAYER_FEATURES)
-    return _connection
-
-def close_connection():
-    """Close the persistent connection."""
-    global _connection
-    if _connection:
-        _connection.close()
-        _connection = None
-
-# Helper: Get player ID from name (using pybaseball)
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Process-wide cursor pool over one shared database instance (no cold starts, no shared handle)
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+# DuckDB aborts conflicting concurrent writers, so in-process writes take turns while reads run in parallel
+_write_lock = threading.Lock()
+
+def init(database: str = DEFAULT_DATABASE, read_only: bool = False, pool_size: int = 8) -> ConnectionPool:
+    """Open the SDK's connection pool; call once at process start (the first request otherwise opens the default).
+
+    In read-only mode several processes may share the database file, and missing players are not inserted.
+    """
+    global _pool, _register
+    with _pool_lock:
+        if _pool is not None:
+            raise RuntimeError("SDK already initialized; call shutdown() first.")
+        _pool = ConnectionPool(database, read_only=read_only, size=pool_size)
+        _register = None
+    return _pool
+
+def shutdown() -> None:
+    """Close the connection pool and forget the player register."""
+    global _pool, _register
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+        _register = None
+
+# Kept for callers of the original single-connection API
+close_connection = shutdown
+
+def _get_pool() -> ConnectionPool:
+    """Return the connection pool, opening the default one on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+@contextmanager
+def _cursor() -> Iterator:
+    """Check out a pooled cursor whose statements are traced when tracing is enabled."""
+    with _get_pool().cursor() as con:
+        yield trace.connection(con)
+
+# Per-stat-type wiring for bulk hydration: where rows are fetched from and where they live
+_PLAYER_TABLES = {
+    'batting': {
+        'fetch': fetch.batting_stats,
+        'rows': transform.player_batting_rows,
+        'raw': 'raw.pybaseball_player_batting',
+        'processed': 'processed.pybaseball_player_batting',
+        'raw_columns': transform.PLAYER_BATTING_RAW,
+    },
+    'pitching': {
+        'fetch': fetch.pitching_stats,
+        'rows': transform.player_pitching_rows,
+        'raw': 'raw.pybaseball_player_pitching',
+        'processed': 'processed.pybaseball_player_pitching',
+        'raw_columns': transform.PLAYER_PITCHING_RAW,
+    },
+}
+
+_register: Optional[PlayerRegister] = None
+
+def _get_register() -> PlayerRegister:
+    """Lazily initialize the player-ID register on the pool's shared database."""
+    global _register
+    pool = _get_pool()
+    if _register is None:
+        with _pool_lock:
+            if _register is None:
+                _register = PlayerRegister(pool.connection)
+    return _register
+
+# Helper: Get player ID from name (using the local register)
+@trace.traced('sdk')
 def get_id_from_name(player_name: str) -> Optional[int]:
-    """Lookup MLBAM player ID from name (fuzzy match)."""
+    """Lookup MLBAM player ID from name (exact, then fuzzy match)."""
     try:
-        parts = player_name.split()
-        if len(parts) < 2:
-            return None
-        last_name = parts[-1].lower()
-        first_name = ' '.join(parts[:-1]).lower()  # Handle middle names if present
-        lookup_df = pyb.playerid_lookup(last_name, first_name, fuzzy=True)
-        if not lookup_df.empty:
-            return int(lookup_df['key_mlbam'].iloc[0])
+        ids = _get_register().lookup(player_name)
+        if ids:
+            return ids.mlbam
     except Exception as e:
         print(f"Error looking up player ID for '{player_name}': {e}")
     return None
 
+def _hydrate_players(kind: str, player_names: List[str], season: int) -> Dict[str, pd.DataFrame]:
+    """Resolve players against the processed layer, bulk-inserting any missing rows from one season leaderboard.
+
+    Returns a mapping of requested name to its (possibly empty) processed row.
+    """
+    spec = _PLAYER_TABLES[kind]
+    names = list(dict.fromkeys(player_names))
+    resolved = _get_register().resolve_ids(names)
+    ids = {
+        name: (int(mlbam), int(idfg)) if pd.notna(mlbam) and pd.notna(idfg) else None
+        for name, mlbam, idfg in zip(names, resolved['key_mlbam'], resolved['key_fangraphs'])
+    }
+    player_ids = sorted({pair[0] for pair in ids.values() if pair})
+    if not player_ids:
+        return {name: pd.DataFrame() for name in ids}
+
+    pool = _get_pool()
+    select_processed = f"SELECT * FROM {spec['processed']} WHERE season = ? AND player_id IN (SELECT UNNEST(?))"
+    with _cursor() as con:
+        result = con.execute(select_processed, [season, player_ids]).fetchdf()
+
+    cached_ids = set(result['player_id'])
+    missing = {pair for pair in ids.values() if pair and pair[0] not in cached_ids}
+    if missing and pool.read_only:
+        print(f"Warning: {len(missing)} {kind} rows for {season} are not loaded and the SDK is read-only")
+    elif missing:
+        try:
+            # One leaderboard frame serves every missing player
+            stats_df = spec['fetch'](season)
+            if stats_df.empty:
+                raise ValueError(f"No {kind} stats available for season {season}")
+            mlbam_by_idfg = {idfg: mlbam for mlbam, idfg in missing}
+            rows = stats_df[stats_df['IDfg'].isin(list(mlbam_by_idfg))].drop_duplicates('IDfg')
+            if not rows.empty:
+                player_ids_fg = rows['IDfg'].map(mlbam_by_idfg)
+                rows = spec['rows'](rows, season)
+                rows['player_id'] = player_ids_fg
+
+                with _write_lock, _cursor() as con:
+                    columns = ', '.join(spec['raw_columns'])
+                    con.register('temp_players', rows)
+                    con.execute("BEGIN TRANSACTION")
+                    try:
+                        con.execute(f"""
+                            INSERT INTO {spec['raw']} ({columns})
+                            SELECT {columns}
+                            FROM temp_players
+                            WHERE NOT EXISTS (
+                                SELECT 1 FROM {spec['raw']} r
+                                WHERE r.season = temp_players.season AND r.player_id = temp_players.player_id
+                            );
+                        """)
+                        mark_dirty(con, spec['raw'], 'temp_players')
+                        con.execute("COMMIT")
+                    except Exception:
+                        con.execute("ROLLBACK")
+                        raise
+                    finally:
+                        con.unregister('temp_players')
+                    # Upsert only the new players' partitions downstream
+                    refresh(con)
+                    result = con.execute(select_processed, [season, player_ids]).fetchdf()
+        except Exception as e:
+            print(f"Error fetching/inserting {kind} stats for {len(missing)} players in {season}: {e}")
+
+    return {
+        name: result[result['player_id'] == pair[0]].reset_index(drop=True) if pair else pd.DataFrame()
+        for name, pair in ids.items()
+    }
+
+# Materializing fetches per execute_query format ('batches' streams instead, see _stream_batches)
+_RESULT_FORMATS = {
+    'pandas': lambda result: result.fetchdf(),
+    'arrow': lambda result: result.to_arrow_table(),
+    'polars': lambda result: result.pl(),
+    'batches': None,
+}
+
+def _stream_batches(query: str, params: Optional[List], batch_size: int) -> Iterator["pa.RecordBatch"]:
+    """Yield a query's result as Arrow record batches, keeping one pooled cursor for the stream's lifetime."""
+    with _cursor() as con:
+        yield from con.execute(query, params or []).to_arrow_reader(batch_size)
+
+def _fetch_result(query: str, params: Optional[List], format: str):
+    with _cursor() as con:
+        return _RESULT_FORMATS[format](con.execute(query, params or []))
+
 # SDK Module: data.baseball
 class BaseballSDK:
     """High-level interface for baseball data operations."""
 
     @staticmethod
+    @trace.traced('sdk')
     def get_player(player_name: str, season: int = 2024) -> Optional[PlayerBattingStats]:
         """Fetch player batting stats by name; inserts to DB if missing."""
-        player_id = get_id_from_name(player_name)
-        if not player_id:
-            return None
-
-        con = _get_connection()
-        # Check if exists in DB
-        result = con.execute(
-            "SELECT * FROM processed.pybaseball_player_batting WHERE player_id = ? AND season = ?",
-            [player_id, season]
-        ).fetchdf()
-        if not result.empty:
-            return PlayerBattingStats.from_df(result)
+        return BaseballSDK.get_players([player_name], season)[player_name]
 
-        # Fetch from pybaseball and insert
-        try:
-            # Lookup for FanGraphs ID
-            parts = player_name.split()
-            last_name = parts[-1].lower()
-            first_name = ' '.join(parts[:-1]).lower()
-            lookup_df = pyb.playerid_lookup(last_name, first_name, fuzzy=True)
-            if lookup_df.empty:
-                raise ValueError(f"No lookup found for {player_name}")
-            idfg = lookup_df['key_fangraphs'].iloc[0]
-
-            # Fetch full season stats and filter
-            stats_df = pyb.batting_stats(season, ind=1, qual=0)
-            if stats_df.empty:
-                raise ValueError("No batting stats available for season")
-            player_stats = stats_df[stats_df['IDfg'] == idfg]
-            if player_stats.empty:
-                raise ValueError(f"No stats found for player ID {idfg}")
-
-            # Prepare for insert (take first matching row, rename columns)
-            player_row = player_stats.iloc[0:1].copy()
-            player_row = player_row.rename(columns={
-                '2B': 'double', '3B': 'triple', 'HR': 'hr', 'RBI': 'rbi', 'SB': 'sb',
-                'BB': 'bb', 'SO': 'so', 'HBP': 'hbp', 'AVG': 'avg', 'OBP': 'obp',
-                'SLG': 'slg', 'OPS': 'ops', 'Team': 'team', 'Name': 'player_name',
-                'G': 'g', 'PA': 'pa', 'AB': 'ab', 'R': 'r', 'H': 'h', 'Age': 'age', 'CS': 'cs'
-            })
-            print("BEFORE GIANT BLOCK FOR .gets and after rename")
-            print(player_row)
-            player_row['player_id'] = player_id
-            player_row['season'] = season  # Will be added in INSERT
-            player_row['idfg'] = idfg
-            player_row['age'] = player_row.get('age', 0)  # Use renamed column
-            player_row['g'] = player_row.get('g', 0)
-            player_row['pa'] = player_row.get('pa', 0)
-            player_row['ab'] = player_row.get('ab', 0)
-            player_row['r'] = player_row.get('r', 0)
-            player_row['h'] = player_row.get('h', 0)
-            player_row['double'] = player_row.get('double', 0)  # Use renamed column
-            player_row['triple'] = player_row.get('triple', 0)
-            player_row['hr'] = player_row.get('hr', 0)
-            player_row['rbi'] = player_row.get('rbi', 0)
-            player_row['sb'] = player_row.get('sb', 0)
-            player_row['cs'] = player_row.get('cs', 0)
-            player_row['bb'] = player_row.get('bb', 0)
-            player_row['so'] = player_row.get('so', 0)
-            player_row['hbp'] = player_row.get('hbp', 0)
-            player_row['avg'] = player_row.get('avg', 0.0)
-            player_row['obp'] = player_row.get('obp', 0.0)
-            player_row['slg'] = player_row.get('slg', 0.0)
-            player_row['ops'] = player_row.get('ops', 0.0)
-
-            print(f"Post-rename for {player_name}:")
-            print(player_row[['player_name', 'team', 'age', 'g', 'pa', 'ab', 'h', 'hr', 'rbi', 'bb', 'so', 'avg', 'obp', 'slg', 'ops']].to_dict('records'))
-
-            # Explicitly convert rates to float (handles any string/NaN issues)
-            for col in ['avg', 'obp', 'slg', 'ops']:
-                player_row[col] = pd.to_numeric(player_row[col], errors='coerce').fillna(0.0)
-            # Insert raw
-            con.register('temp_stats', player_row)
-            con.execute("""
-                INSERT INTO raw.pybaseball_player_batting 
-                SELECT season, player_id, player_name, team, idfg, age, g, pa, ab, r, h, double, triple, hr, rbi, sb, cs, bb, so, hbp, avg, obp, slg, ops 
-                FROM temp_stats;
-            """)
-            con.unregister('temp_stats')
-            # Re-run processed and features tables
-            con.execute(CREATE_PROCESSED_PLAYER_BATTING)
-            con.execute(CREATE_FEATURES_PLAYER_FEATURES)
-            # Fetch processed
-            result = con.execute(
-                "SELECT * FROM processed.pybaseball_player_batting WHERE player_id = ? AND season = ?",
-                [player_id, season]
-            ).fetchdf()
-            if not result.empty:
-                return PlayerBattingStats.from_df(result)
-        except Exception as e:
-            print(f"Error fetching/inserting player stats for '{player_name}' (ID {player_id}): {e}")
-        return None
+    @staticmethod
+    @trace.traced('sdk')
+    def get_players(player_names: List[str], season: int = 2024) -> Dict[str, Optional[PlayerBattingStats]]:
+        """Fetch batting stats for many players at once; missing players are inserted in one bulk write."""
+        rows = _hydrate_players('batting', player_names, season)
+        return {name: PlayerBattingStats.from_df(df) for name, df in rows.items()}
 
     @staticmethod
+    @trace.traced('sdk')
+    def get_pitcher(player_name: str, season: int = 2024) -> Optional[PlayerPitchingStats]:
+        """Fetch player pitching stats by name; inserts to DB if missing."""
+        return BaseballSDK.get_pitchers([player_name], season)[player_name]
+
+    @staticmethod
+    @trace.traced('sdk')
+    def get_pitchers(player_names: List[str], season: int = 2024) -> Dict[str, Optional[PlayerPitchingStats]]:
+        """Fetch pitching stats for many players at once; missing players are inserted in one bulk write."""
+        rows = _hydrate_players('pitching', player_names, season)
+        return {name: PlayerPitchingStats.from_df(df) for name, df in rows.items()}
+
+    @staticmethod
+    @trace.traced('sdk')
+    def resolve_ids(player_names: List[str]) -> pd.DataFrame:
+        """Resolve many player names to MLBAM, FanGraphs and BBRef IDs in one query."""
+        return _get_register().resolve_ids(player_names)
+
+    @staticmethod
+    @trace.traced('sdk')
     def get_team_batting(team_abbr: str, season: int = 2024) -> Optional[TeamBattingStats]:
         """Fetch team batting stats by abbreviation."""
-        con = _get_connection()
-        result = con.execute(
-            "SELECT * FROM processed.pybaseball_team_batting WHERE team = ? AND season = ?",
-            [team_abbr, season]
-        ).fetchdf()
+        with _cursor() as con:
+            result = con.execute(
+                "SELECT * FROM processed.pybaseball_team_batting WHERE team = ? AND season = ?",
+                [team_abbr, season]
+            ).fetchdf()
         if not result.empty:
-            return TeamBattingStats.from_row(result.iloc[0].to_dict())
+            return TeamBattingStats.from_frame(result)[0]
         return None
 
     @staticmethod
-    def execute_query(query: str, params: List = None) -> pd.DataFrame:
-        """Execute custom SQL query."""
-        con = _get_connection()
-        if params:
-            return con.execute(query, params).fetchdf()
-        return con.execute(query).fetchdf()
+    @trace.traced('sdk')
+    def get_lines(game_ids: List[str], as_of: datetime, market: str = 'moneyline',
+                  books: Optional[List[str]] = None) -> pd.DataFrame:
+        """Latest line per game and book at or before `as_of` (point-in-time, from raw.odds_snapshots)."""
+        with _cursor() as con:
+            return lines.lines_as_of(con, game_ids, as_of, market, books)
+
+    @staticmethod
+    def execute_query(query: str, params: List = None, format: str = 'pandas', batch_size: int = 100_000):
+        """Execute custom SQL query on a cursor of its own.
+
+        format selects the result type: 'pandas' (DataFrame), 'arrow' (pyarrow.Table, zero-copy from DuckDB),
+        'polars' (polars.DataFrame) or 'batches', an iterator of pyarrow.RecordBatch of at most batch_size rows
+        that streams the result in bounded memory and holds its cursor until exhausted or closed. A traced
+        'batches' call is recorded when its stream ends, timing the batches' production rather than the call.
+        """
+        if format not in _RESULT_FORMATS:
+            raise ValueError(f"Unknown format '{format}'; expected one of {sorted(_RESULT_FORMATS)}.")
+        if format == 'batches':
+            return trace.stream('sdk', 'BaseballSDK.execute_query', _stream_batches(query, params, batch_size))
+        return trace.call('sdk', 'BaseballSDK.execute_query', _fetch_result, query, params, format)
 
 # Usage: from pipeline.db.sdk import BaseballSDK; player = BaseballSDK.get_player('Mike Trout')
\ No newline at end of file
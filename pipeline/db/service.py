@@ -0,0 +1,210 @@
+# pipeline/db/service.py: Single-writer ingestion service publishing read-only snapshots
+
+import argparse
+import json
+import os
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import duckdb
+from . import loader
+from .pool import DEFAULT_DATABASE
+from .refresh import refresh
+from .schema import bootstrap
+from .teams import TEAMS
+
+DATA_DIR = os.path.dirname(DEFAULT_DATABASE) or '.'
+QUEUE_DIR = os.path.join(DATA_DIR, 'queue')
+SNAPSHOT_DIR = os.path.join(DATA_DIR, 'snapshots')
+# Name of the pointer file holding the newest snapshot's file name
+CURRENT = 'CURRENT'
+# Older snapshots are pruned, leaving readers that still hold one open a grace period
+KEEP_SNAPSHOTS = 3
+
+
+def _load_job(con: duckdb.DuckDBPyConnection, seasons: List[int], teams: Optional[List[str]] = None,
+              full_refresh: bool = False, min_interval: float = loader.games.MIN_REQUEST_INTERVAL) -> None:
+    loader.load(seasons, con=con, teams=tuple(teams) if teams else TEAMS, full_refresh=full_refresh,
+                min_interval=min_interval)
+
+
+def _odds_job(con: duckdb.DuckDBPyConnection, paths: List[str]) -> None:
+    from .odds import ingest_odds
+    ingest_odds(paths, con)
+
+
+def _futures_job(con: duckdb.DuckDBPyConnection, season: int, simulations: int = 100_000) -> None:
+    from .futures import simulate_season
+    simulate_season(con, season, simulations=simulations)
+
+
+def _weather_job(con: duckdb.DuckDBPyConnection, seasons: Optional[List[int]] = None,
+                 game_date: Optional[str] = None) -> None:
+    from .weather import update_weather
+    update_weather(con, seasons, date.fromisoformat(game_date) if game_date else None)
+
+
+def _refresh_job(con: duckdb.DuckDBPyConnection, full: bool = False) -> None:
+    refresh(con, full=full)
+
+
+# Job kinds the writer knows how to run; each receives the write connection and the job's arguments
+JOBS: Dict[str, Callable[..., None]] = {
+    'load': _load_job,
+    'odds': _odds_job,
+    'futures': _futures_job,
+    'weather': _weather_job,
+    'refresh': _refresh_job,
+}
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """Write a file so readers only ever see the old or the complete new content."""
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def submit(kind: str, queue_dir: str = QUEUE_DIR, **args) -> str:
+    """Enqueue a job for the writer; returns the job ID. Safe to call from any process."""
+    if kind not in JOBS:
+        raise ValueError(f"Unknown job kind '{kind}'; expected one of {sorted(JOBS)}.")
+    os.makedirs(queue_dir, exist_ok=True)
+    # Nanosecond prefix keeps the spool in submission order
+    job_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    _write_atomic(os.path.join(queue_dir, f"{job_id}.json"), json.dumps({'id': job_id, 'kind': kind, 'args': args}))
+    return job_id
+
+
+def latest_snapshot(snapshot_dir: str = SNAPSHOT_DIR) -> Optional[str]:
+    """Return the path of the newest published snapshot, or None if nothing has been published."""
+    try:
+        with open(os.path.join(snapshot_dir, CURRENT)) as f:
+            return os.path.join(snapshot_dir, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def connect_snapshot(snapshot_dir: str = SNAPSHOT_DIR) -> duckdb.DuckDBPyConnection:
+    """Open the newest snapshot read-only; any number of processes can do this while the writer runs.
+
+    The SDK serves from a snapshot with sdk.init(latest_snapshot(), read_only=True).
+    """
+    path = latest_snapshot(snapshot_dir)
+    if path is None:
+        raise FileNotFoundError(f"No snapshot published in {snapshot_dir}. Start the writer first.")
+    return duckdb.connect(database=path, read_only=True)
+
+
+class Writer:
+    """Owns the only read-write connection and drains the job spool in submission order.
+
+    After every batch that committed something, the database is copied to an immutable snapshot file and the
+    CURRENT pointer is swapped to it, so readers never contend for the writer's file lock.
+    """
+
+    def __init__(self, database: str = DEFAULT_DATABASE, queue_dir: str = QUEUE_DIR,
+                 snapshot_dir: str = SNAPSHOT_DIR, keep: int = KEEP_SNAPSHOTS):
+        self.queue_dir = queue_dir
+        self.snapshot_dir = snapshot_dir
+        self.keep = keep
+        for path in (os.path.dirname(database) or '.', queue_dir, os.path.join(queue_dir, 'failed'), snapshot_dir):
+            os.makedirs(path, exist_ok=True)
+        self.con = duckdb.connect(database=database, read_only=False)
+        bootstrap(self.con)
+        self._catalog = self.con.execute("SELECT current_database()").fetchone()[0]
+
+    def pending(self) -> List[str]:
+        """Queued job files, oldest first."""
+        return sorted(
+            os.path.join(self.queue_dir, name) for name in os.listdir(self.queue_dir) if name.endswith('.json')
+        )
+
+    def run_job(self, path: str) -> bool:
+        """Run one queued job; failed jobs are moved to the queue's failed/ directory."""
+        try:
+            with open(path) as f:
+                job = json.load(f)
+            JOBS[job['kind']](self.con, **job.get('args', {}))
+        except Exception as e:
+            print(f"Warning: Job {os.path.basename(path)} failed: {e}")
+            os.replace(path, os.path.join(self.queue_dir, 'failed', os.path.basename(path)))
+            return False
+        os.remove(path)
+        return True
+
+    def run_once(self) -> int:
+        """Drain every queued job, then publish a snapshot if any succeeded; returns jobs completed."""
+        completed = sum(self.run_job(path) for path in self.pending())
+        if completed or latest_snapshot(self.snapshot_dir) is None:
+            self.publish()
+        return completed
+
+    def publish(self) -> str:
+        """Copy the committed database to a new snapshot file and point CURRENT at it."""
+        name = f"baseball-{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}.duckdb"
+        tmp = os.path.join(self.snapshot_dir, f"{name}.tmp")
+        self.con.execute(f"ATTACH '{tmp}' AS snapshot")
+        try:
+            self.con.execute(f'COPY FROM DATABASE "{self._catalog}" TO snapshot')
+        finally:
+            self.con.execute("DETACH snapshot")
+        os.replace(tmp, os.path.join(self.snapshot_dir, name))
+        _write_atomic(os.path.join(self.snapshot_dir, CURRENT), name)
+        self._prune()
+        return os.path.join(self.snapshot_dir, name)
+
+    def _prune(self) -> None:
+        snapshots = sorted(name for name in os.listdir(self.snapshot_dir) if name.endswith('.duckdb'))
+        for name in snapshots[:-self.keep]:
+            os.remove(os.path.join(self.snapshot_dir, name))
+
+    def serve(self, poll_interval: float = 5.0) -> None:
+        """Run until interrupted, polling the spool for new jobs."""
+        print(f"Writer started; watching {self.queue_dir}")
+        try:
+            while True:
+                if self.run_once():
+                    print(f"Published snapshot {latest_snapshot(self.snapshot_dir)}")
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-writer ingestion service for the baseball database.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="Own the write connection and drain the job queue.")
+    run.add_argument('--poll', type=float, default=5.0, help="Seconds between queue scans.")
+    run.add_argument('--once', action='store_true', help="Drain the queue once and exit.")
+    load = commands.add_parser('load', help="Queue a bulk load.")
+    load.add_argument('--start', type=int, default=2024, help="First season to load.")
+    load.add_argument('--end', type=int, default=None, help="Last season to load (defaults to --start).")
+    load.add_argument('--full-refresh', action='store_true', help="Rebuild every derived table afterwards.")
+    commands.add_parser('refresh', help="Queue a full rebuild of the derived layers.")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        writer = Writer()
+        if args.once:
+            writer.run_once()
+            writer.close()
+        else:
+            writer.serve(args.poll)
+    elif args.command == 'load':
+        seasons = list(range(args.start, (args.end or args.start) + 1))
+        print(f"Queued job {submit('load', seasons=seasons, full_refresh=args.full_refresh)}")
+    else:
+        print(f"Queued job {submit('refresh', full=True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Empty file to make sql.oddsportal a package
\ No newline at end of file
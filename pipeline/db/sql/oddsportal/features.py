@@ -0,0 +1,23 @@
+# pipeline/db/sql/oddsportal/features.py
+
+# FEATURES LAYER: Market prices against model probabilities
+# Written by pipeline/db/pricing.py on every re-price; one row per game, book and side, latest pricing wins
+CREATE_MARKET_EDGES = """
+CREATE TABLE IF NOT EXISTS features.market_edges (
+    game_id VARCHAR,
+    book VARCHAR,
+    side VARCHAR,  -- 'home' or 'away'
+    captured_at TIMESTAMP,  -- snapshot the price came from
+    price SMALLINT,  -- American odds
+    decimal_odds DOUBLE,
+    implied_prob DOUBLE,  -- with vig
+    fair_prob DOUBLE,  -- vig removed
+    devig_method VARCHAR,  -- 'multiplicative', 'power' or 'shin'
+    model_prob DOUBLE,  -- NULL when no model probability was supplied
+    edge DOUBLE,  -- model_prob - fair_prob
+    ev DOUBLE,  -- expected profit per unit staked at model_prob
+    kelly_stake DOUBLE,  -- fractional Kelly bankroll share, 0 when ev <= 0
+    priced_at TIMESTAMP,  -- cutoff the lines were taken at
+    PRIMARY KEY (game_id, book, side)
+);
+"""
@@ -0,0 +1,35 @@
+# pipeline/db/sql/oddsportal/raw.py
+
+# RAW LAYER: Parsed odds pages
+CREATE_ODDS = """
+CREATE TABLE IF NOT EXISTS raw.odds (
+    game_id VARCHAR PRIMARY KEY,  -- joins raw.games: home team + YYYYMMDD + game number
+    season INTEGER,
+    game_date DATE,
+    game_num INTEGER,  -- 0 for single games, 1/2 for doubleheaders
+    home_team VARCHAR,
+    away_team VARCHAR,
+    home_score INTEGER,  -- NULL for games not yet played
+    away_score INTEGER,
+    moneyline_home INTEGER,  -- American odds, e.g. -135 / +115
+    moneyline_away INTEGER,
+    total DECIMAL(4,1),  -- over/under runs line
+    bookmakers INTEGER,  -- number of books in the consensus
+    source VARCHAR  -- page file the row was parsed from
+);
+"""
+
+# Append-only line history; rows are written in captured_at order so per-row-group min/max zone maps
+# prune time-range scans, and the key makes re-polled snapshots idempotent
+CREATE_ODDS_SNAPSHOTS = """
+CREATE TABLE IF NOT EXISTS raw.odds_snapshots (
+    game_id VARCHAR,  -- joins raw.games
+    book VARCHAR,  -- bookmaker, or 'consensus'
+    market VARCHAR,  -- 'moneyline' or 'total'
+    captured_at TIMESTAMP,  -- UTC
+    line DECIMAL(4,1),  -- runs for totals, NULL for moneylines
+    home_price SMALLINT,  -- American odds; the over for totals
+    away_price SMALLINT,  -- American odds; the under for totals
+    PRIMARY KEY (game_id, book, market, captured_at)
+);
+"""
@@ -0,0 +1 @@
+# Empty file to make sql.openmeteo a package
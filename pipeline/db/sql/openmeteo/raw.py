@@ -0,0 +1,54 @@
+# pipeline/db/sql/openmeteo/raw.py
+
+# RAW LAYER: Ballparks and game-time weather
+# Ballparks, seeded with the two tables below from teams.py by the weather stage
+CREATE_PARKS = """
+CREATE TABLE IF NOT EXISTS raw.parks (
+    park_id VARCHAR PRIMARY KEY,  -- Retrosheet park code, e.g. LOS03
+    name VARCHAR,
+    latitude DOUBLE,
+    longitude DOUBLE,
+    roof VARCHAR  -- 'open', 'retractable' or 'dome'
+);
+"""
+
+# Each franchise's home park by season range
+CREATE_HOME_PARKS = """
+CREATE TABLE IF NOT EXISTS raw.home_parks (
+    team VARCHAR,  -- Baseball-Reference abbreviation
+    park_id VARCHAR,  -- joins raw.parks
+    first_season INTEGER,
+    last_season INTEGER,  -- NULL while current
+    PRIMARY KEY (team, first_season)
+);
+"""
+
+# Home games played elsewhere for part of a season: neutral-site series and temporary homes
+CREATE_PARK_EXCEPTIONS = """
+CREATE TABLE IF NOT EXISTS raw.park_exceptions (
+    team VARCHAR,  -- home team of the games moved
+    park_id VARCHAR,  -- joins raw.parks
+    first_date DATE,
+    last_date DATE,
+    PRIMARY KEY (team, first_date)
+);
+"""
+
+# Weather at first pitch, one row per game; domes get a row without readings and no API call
+CREATE_WEATHER = """
+CREATE TABLE IF NOT EXISTS raw.weather (
+    game_id VARCHAR PRIMARY KEY,  -- joins raw.games
+    season INTEGER,
+    game_date DATE,
+    park_id VARCHAR,  -- joins raw.parks
+    game_hour TIMESTAMP,  -- local time; first pitch assumed at 13:00 for day games and 19:00 for night games
+    roof VARCHAR,
+    temperature_c DOUBLE,
+    relative_humidity DOUBLE,  -- percent
+    wind_speed_ms DOUBLE,  -- at 10 m
+    wind_direction_deg DOUBLE,  -- direction the wind blows from
+    precipitation_mm DOUBLE,  -- in the hour
+    source VARCHAR,  -- 'observed' from the archive, 'forecast' until the archive has the date, 'dome' without readings
+    fetched_at TIMESTAMP DEFAULT current_timestamp
+);
+"""
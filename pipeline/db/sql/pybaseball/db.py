@@ -4,4 +4,75 @@ CREATE_SCHEMAS = """
     CREATE SCHEMA IF NOT EXISTS raw;
     CREATE SCHEMA IF NOT EXISTS processed;
     CREATE SCHEMA IF NOT EXISTS features;
+    CREATE SCHEMA IF NOT EXISTS meta;
+"""
+
+# META LAYER: Pipeline bookkeeping
+# (season, key) partitions whose source rows changed since the last refresh; key is the table's
+# non-season key (team or player_id) cast to VARCHAR.
+CREATE_DIRTY_PARTITIONS = """
+CREATE TABLE IF NOT EXISTS meta.dirty_partitions (
+    table_name VARCHAR,
+    season INTEGER,
+    key VARCHAR
+);
+"""
+
+# Hash of the DDL each schema object was last created from; lets bootstrap skip unchanged objects
+CREATE_SCHEMA_VERSIONS = """
+CREATE TABLE IF NOT EXISTS meta.schema_versions (
+    object_name VARCHAR PRIMARY KEY,
+    sql_hash VARCHAR,
+    applied_at TIMESTAMP DEFAULT current_timestamp
+);
+"""
+
+# One row per walk-forward fold of every hyperparameter trial run by pipeline/db/training.py
+CREATE_BACKTEST_RESULTS = """
+CREATE TABLE IF NOT EXISTS meta.backtest_results (
+    run_id VARCHAR,
+    trial INTEGER,
+    params VARCHAR,  -- JSON of the XGBoost parameters and boosting rounds
+    fold INTEGER,
+    train_games INTEGER,
+    test_start DATE,
+    test_end DATE,
+    test_games INTEGER,
+    log_loss DOUBLE,
+    brier DOUBLE,
+    bets INTEGER,  -- test games whose edge over the de-vigged closing line cleared the threshold
+    roi DOUBLE,  -- profit per unit staked on those bets, NULL without bets
+    seconds DOUBLE,
+    recorded_at TIMESTAMP DEFAULT current_timestamp,
+    PRIMARY KEY (run_id, trial, fold)
+);
+"""
+
+# Spans flushed from pipeline/db/trace.py: one row per traced fetch, SQL statement or SDK call
+CREATE_QUERY_LOG = """
+CREATE TABLE IF NOT EXISTS meta.query_log (
+    pid INTEGER,
+    span_id BIGINT,
+    parent_id BIGINT,  -- enclosing span in the same process, NULL at top level
+    kind VARCHAR,  -- 'fetch', 'sql' or 'sdk'
+    name VARCHAR,
+    started_at TIMESTAMP,
+    seconds DOUBLE,
+    rows BIGINT,
+    bytes BIGINT,
+    error VARCHAR
+);
+"""
+
+# Date windows of raw.statcast that are completely ingested; an interrupted backfill resumes after them
+CREATE_STATCAST_CHUNKS = """
+CREATE TABLE IF NOT EXISTS meta.statcast_chunks (
+    start_date DATE,
+    end_date DATE,
+    rows INTEGER,
+    fetch_seconds DOUBLE,
+    write_seconds DOUBLE,
+    completed_at TIMESTAMP DEFAULT current_timestamp,
+    PRIMARY KEY (start_date, end_date)
+);
 """
@@ -1,17 +1,20 @@
 # FEATURES LAYER: Derived metrics
-CREATE_FEATURES_TEAM_FEATURES = """
-CREATE OR REPLACE TABLE features.team_features AS
+SELECT_FEATURES_TEAM_FEATURES = """
 SELECT 
     b.season, b.team,
     b.runs_per_game AS offensive_rating,
     p.win_pct * 100 AS pitching_strength,
     (b.obp_clean + (p.era_clean / 10)) AS combined_metric
 FROM processed.pybaseball_team_batting b
-JOIN processed.pybaseball_team_pitching p ON b.team = p.team AND b.season = p.season;
+JOIN processed.pybaseball_team_pitching p ON b.team = p.team AND b.season = p.season
 """
 
-CREATE_FEATURES_PLAYER_FEATURES = """
-CREATE OR REPLACE TABLE features.player_features AS
+CREATE_FEATURES_TEAM_FEATURES = f"""
+CREATE OR REPLACE TABLE features.team_features AS
+{SELECT_FEATURES_TEAM_FEATURES};
+"""
+
+SELECT_FEATURES_PLAYER_FEATURES = """
 SELECT 
     pb.season, pb.player_id, pb.player_name,
     pb.pa_per_game AS plate_appearances_efficiency,
@@ -19,5 +22,133 @@ SELECT
     pp.win_pct * 100 AS pitching_win_strength,
     (pb.ops_clean + (pp.era_clean / 10)) AS batter_pitcher_adjusted_metric
 FROM processed.pybaseball_player_batting pb
-LEFT JOIN processed.pybaseball_player_pitching pp ON pb.player_id = pp.player_id AND pb.season = pp.season;
-"""
\ No newline at end of file
+LEFT JOIN processed.pybaseball_player_pitching pp ON pb.player_id = pp.player_id AND pb.season = pp.season
+"""
+
+CREATE_FEATURES_PLAYER_FEATURES = f"""
+CREATE OR REPLACE TABLE features.player_features AS
+{SELECT_FEATURES_PLAYER_FEATURES};
+"""
+
+# Point-in-time team form: one row per team per game in raw.games, every feature computed only from that
+# team's earlier games of the season. A derived table (refresh.DERIVED_TABLES) maintained incrementally by
+# pipeline/db/rolling.py.
+CREATE_TEAM_ROLLING = """
+CREATE TABLE IF NOT EXISTS features.team_rolling (
+    game_id VARCHAR,
+    team VARCHAR,
+    season INTEGER,
+    game_date DATE,
+    game_num INTEGER,
+    opponent VARCHAR,
+    is_home BOOLEAN,
+    runs_for INTEGER,  -- this game's result (NULL until played); a label, not a pre-game feature
+    runs_against INTEGER,
+    rest_days INTEGER,  -- days since the team's previous game, NULL on opening day
+    games_played INTEGER,  -- played games before this one
+    win_pct DOUBLE,  -- season to date
+    runs_for_pg DOUBLE,
+    runs_against_pg DOUBLE,
+    win_pct_l10 DOUBLE,  -- last 10 played games
+    runs_for_l10 DOUBLE,
+    runs_against_l10 DOUBLE,
+    win_pct_l30 DOUBLE,  -- last 30 played games
+    runs_for_l30 DOUBLE,
+    runs_against_l30 DOUBLE,
+    win_pct_ewm DOUBLE,  -- exponentially weighted, half-life of 10 played games
+    runs_for_ewm DOUBLE,
+    runs_against_ewm DOUBLE,
+    PRIMARY KEY (game_id, team)
+);
+"""
+
+# raw.games unfolded to one row per team per game
+SELECT_TEAM_GAMES = """
+SELECT game_id, season, game_date, game_num, home_team AS team, away_team AS opponent, TRUE AS is_home,
+    home_runs AS runs_for, away_runs AS runs_against
+FROM raw.games
+UNION ALL
+SELECT game_id, season, game_date, game_num, away_team, home_team, FALSE, away_runs, home_runs
+FROM raw.games
+"""
+
+# Rolling features over a relation shaped like SELECT_TEAM_GAMES, formatted in as {team_games}.
+# Post-game rates are windowed over played games only, then every game (played or scheduled) takes the
+# rates after the team's last played game before it, so no row sees its own result or a later one.
+# The EWMA is the ratio of two running sums weighted 2 ** (n / 10), which equals pandas' ewm(halflife=10).
+SELECT_TEAM_ROLLING = """
+WITH played AS (
+    SELECT game_id, team,
+        ROW_NUMBER() OVER season_to_date AS n,
+        CAST(runs_for > runs_against AS DOUBLE) AS win,
+        pow(2, ROW_NUMBER() OVER season_to_date / 10) AS weight
+    FROM {team_games}
+    WHERE runs_for IS NOT NULL AND runs_against IS NOT NULL
+    WINDOW season_to_date AS (PARTITION BY team, season ORDER BY game_date, game_num)
+),
+post AS (
+    SELECT t.game_id, t.team, p.n,
+        AVG(p.win) OVER w AS win_pct,
+        AVG(t.runs_for) OVER w AS runs_for_pg,
+        AVG(t.runs_against) OVER w AS runs_against_pg,
+        AVG(p.win) OVER l10 AS win_pct_l10,
+        AVG(t.runs_for) OVER l10 AS runs_for_l10,
+        AVG(t.runs_against) OVER l10 AS runs_against_l10,
+        AVG(p.win) OVER l30 AS win_pct_l30,
+        AVG(t.runs_for) OVER l30 AS runs_for_l30,
+        AVG(t.runs_against) OVER l30 AS runs_against_l30,
+        SUM(p.win * p.weight) OVER w / SUM(p.weight) OVER w AS win_pct_ewm,
+        SUM(t.runs_for * p.weight) OVER w / SUM(p.weight) OVER w AS runs_for_ewm,
+        SUM(t.runs_against * p.weight) OVER w / SUM(p.weight) OVER w AS runs_against_ewm
+    FROM {team_games} t JOIN played p USING (game_id, team)
+    WINDOW w AS (PARTITION BY t.team, t.season ORDER BY p.n),
+        l10 AS (PARTITION BY t.team, t.season ORDER BY p.n ROWS 9 PRECEDING),
+        l30 AS (PARTITION BY t.team, t.season ORDER BY p.n ROWS 29 PRECEDING)
+)
+SELECT t.game_id, t.team, t.season, t.game_date, t.game_num, t.opponent, t.is_home, t.runs_for, t.runs_against,
+    CAST(t.game_date - LAG(t.game_date) OVER g AS INTEGER) AS rest_days,
+    COALESCE(LAST_VALUE(p.n IGNORE NULLS) OVER before, 0) AS games_played,
+    LAST_VALUE(p.win_pct IGNORE NULLS) OVER before AS win_pct,
+    LAST_VALUE(p.runs_for_pg IGNORE NULLS) OVER before AS runs_for_pg,
+    LAST_VALUE(p.runs_against_pg IGNORE NULLS) OVER before AS runs_against_pg,
+    LAST_VALUE(p.win_pct_l10 IGNORE NULLS) OVER before AS win_pct_l10,
+    LAST_VALUE(p.runs_for_l10 IGNORE NULLS) OVER before AS runs_for_l10,
+    LAST_VALUE(p.runs_against_l10 IGNORE NULLS) OVER before AS runs_against_l10,
+    LAST_VALUE(p.win_pct_l30 IGNORE NULLS) OVER before AS win_pct_l30,
+    LAST_VALUE(p.runs_for_l30 IGNORE NULLS) OVER before AS runs_for_l30,
+    LAST_VALUE(p.runs_against_l30 IGNORE NULLS) OVER before AS runs_against_l30,
+    LAST_VALUE(p.win_pct_ewm IGNORE NULLS) OVER before AS win_pct_ewm,
+    LAST_VALUE(p.runs_for_ewm IGNORE NULLS) OVER before AS runs_for_ewm,
+    LAST_VALUE(p.runs_against_ewm IGNORE NULLS) OVER before AS runs_against_ewm
+FROM {team_games} t LEFT JOIN post p USING (game_id, team)
+WINDOW g AS (PARTITION BY t.team, t.season ORDER BY t.game_date, t.game_num),
+    before AS (g ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)
+"""
+
+SELECT_FEATURES_TEAM_ROLLING = SELECT_TEAM_ROLLING.format(team_games=f"({SELECT_TEAM_GAMES})")
+
+# Full rebuild; as a derived table's rebuild its hash versions the table, so editing any of the SQL above
+# rebuilds every row on the next bootstrap
+CREATE_FEATURES_TEAM_ROLLING = f"""
+{CREATE_TEAM_ROLLING.strip().replace('CREATE TABLE IF NOT EXISTS', 'CREATE OR REPLACE TABLE')}
+INSERT INTO features.team_rolling {SELECT_FEATURES_TEAM_ROLLING};
+"""
+
+# Monte Carlo season outcomes per team, written by pipeline/db/futures.py; one row per season, team and cutoff
+CREATE_SEASON_SIMULATIONS = """
+CREATE TABLE IF NOT EXISTS features.season_simulations (
+    season INTEGER,
+    team VARCHAR,
+    as_of DATE,  -- games on or after this date were simulated
+    simulations INTEGER,
+    mean_wins DOUBLE,
+    division DOUBLE,  -- probability of winning the division
+    wild_card DOUBLE,
+    playoffs DOUBLE,
+    bye DOUBLE,  -- top-two seed in the league, skipping the Wild Card Series
+    pennant DOUBLE,
+    title DOUBLE,
+    simulated_at TIMESTAMP DEFAULT current_timestamp,
+    PRIMARY KEY (season, team, as_of)
+);
+"""
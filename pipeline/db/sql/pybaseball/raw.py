@@ -103,4 +103,108 @@ CREATE TABLE IF NOT EXISTS raw.pybaseball_player_pitching (
     era_plus INTEGER,
     PRIMARY KEY (season, player_id)
 );
-"""
\ No newline at end of file
+"""
+
+# Chadwick register: one row per MLB player with every ID we join on
+CREATE_PLAYER_REGISTER = """
+CREATE TABLE IF NOT EXISTS raw.player_register (
+    name_norm VARCHAR,  -- lowercase, accent/punctuation/suffix-stripped "first last"
+    name_first VARCHAR,
+    name_last VARCHAR,
+    key_mlbam INTEGER,
+    key_fangraphs INTEGER,
+    key_bbref VARCHAR,
+    mlb_played_first INTEGER,
+    mlb_played_last INTEGER
+);
+CREATE INDEX IF NOT EXISTS player_register_name_norm_idx ON raw.player_register (name_norm);
+"""
+
+# Trigram postings for fuzzy name matching against raw.player_register
+CREATE_PLAYER_REGISTER_TRIGRAMS = """
+CREATE TABLE IF NOT EXISTS raw.player_register_trigrams (
+    trigram VARCHAR,
+    name_norm VARCHAR,
+    PRIMARY KEY (trigram, name_norm)
+);
+"""
+
+# One row per game (both teams' schedules collapse onto the home team's row)
+CREATE_GAMES = """
+CREATE TABLE IF NOT EXISTS raw.games (
+    game_id VARCHAR PRIMARY KEY,  -- home team + YYYYMMDD + game number, e.g. LAD202403280
+    season INTEGER,
+    game_date DATE,
+    game_num INTEGER,  -- 0 for single games, 1/2 for doubleheaders
+    home_team VARCHAR,
+    away_team VARCHAR,
+    home_runs INTEGER,  -- NULL until the game is played
+    away_runs INTEGER,
+    innings INTEGER,
+    day_night VARCHAR  -- 'D' or 'N'
+);
+"""
+
+# One row per pitch from pyb.statcast, appended a date window at a time in game_date order (so zone maps
+# prune date ranges). Types are narrowed and closed vocabularies are ENUMs; open ones (pitch types,
+# events, descriptions, teams) are low-cardinality VARCHARs that DuckDB dictionary-compresses on disk.
+# No primary key: a window is replaced by deleting its dates, which keeps a multi-season table index-free.
+CREATE_STATCAST = """
+CREATE TABLE IF NOT EXISTS raw.statcast (
+    game_pk INTEGER,
+    game_date DATE,
+    game_type ENUM('R', 'F', 'D', 'L', 'W', 'S', 'E', 'A'),
+    home_team VARCHAR,
+    away_team VARCHAR,
+    inning TINYINT,
+    inning_topbot ENUM('Top', 'Bot'),
+    at_bat_number SMALLINT,
+    pitch_number TINYINT,
+    batter INTEGER,  -- MLBAM IDs
+    pitcher INTEGER,
+    stand ENUM('L', 'R'),
+    p_throws ENUM('L', 'R'),
+    balls TINYINT,
+    strikes TINYINT,
+    outs_when_up TINYINT,
+    on_1b INTEGER,  -- MLBAM ID of the runner, NULL when empty
+    on_2b INTEGER,
+    on_3b INTEGER,
+    pitch_type VARCHAR,
+    pitch_name VARCHAR,
+    release_speed FLOAT,  -- mph
+    release_spin_rate SMALLINT,  -- rpm
+    release_extension FLOAT,
+    release_pos_x FLOAT,
+    release_pos_z FLOAT,
+    spin_axis SMALLINT,
+    pfx_x FLOAT,
+    pfx_z FLOAT,
+    plate_x FLOAT,
+    plate_z FLOAT,
+    sz_top FLOAT,
+    sz_bot FLOAT,
+    zone TINYINT,
+    type ENUM('B', 'S', 'X'),
+    description VARCHAR,
+    events VARCHAR,  -- set on the last pitch of a plate appearance
+    bb_type ENUM('ground_ball', 'line_drive', 'fly_ball', 'popup'),
+    launch_speed FLOAT,
+    launch_angle SMALLINT,
+    hit_distance_sc SMALLINT,
+    hc_x FLOAT,
+    hc_y FLOAT,
+    estimated_ba_using_speedangle FLOAT,
+    estimated_woba_using_speedangle FLOAT,
+    woba_value FLOAT,
+    woba_denom TINYINT,
+    babip_value TINYINT,
+    iso_value TINYINT,
+    home_score TINYINT,
+    away_score TINYINT,
+    post_home_score TINYINT,
+    post_away_score TINYINT,
+    delta_home_win_exp FLOAT,
+    delta_run_exp FLOAT
+);
+"""
@@ -0,0 +1,200 @@
+# pipeline/db/statcast.py: Chunked, resumable pitch-level Statcast ingestion into raw.statcast
+
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+import duckdb
+from . import fetch
+from .pool import DEFAULT_DATABASE
+from .schema import bootstrap
+from .lazy import lazy_import
+
+pa = lazy_import('pyarrow')
+pd = lazy_import('pandas')
+
+# Days per fetch; a week of a full season is ~30k pitches, about 30 MB as pybaseball's frame
+WINDOW_DAYS = 7
+# Statcast's regular season and postseason fall inside these dates
+SEASON_START = (3, 1)
+SEASON_END = (11, 30)
+# Statcast fills in a day's pitches overnight; windows reaching this close to today are rewritten next run
+SETTLE_DAYS = 2
+
+
+def _arrow_types() -> List[Tuple[str, object]]:
+    """raw.statcast columns in table order with the Arrow type each chunk is built with.
+
+    Integers and floats are narrowed as in the table; string columns are dictionary-encoded, so a chunk
+    holds each distinct pitch type, event or team once.
+    """
+    labels = pa.dictionary(pa.int16(), pa.string())
+    int8, int16, int32, float32 = pa.int8(), pa.int16(), pa.int32(), pa.float32()
+    return [
+        ('game_pk', int32), ('game_date', pa.date32()), ('game_type', labels), ('home_team', labels),
+        ('away_team', labels), ('inning', int8), ('inning_topbot', labels), ('at_bat_number', int16),
+        ('pitch_number', int8), ('batter', int32), ('pitcher', int32), ('stand', labels), ('p_throws', labels),
+        ('balls', int8), ('strikes', int8), ('outs_when_up', int8), ('on_1b', int32), ('on_2b', int32),
+        ('on_3b', int32), ('pitch_type', labels), ('pitch_name', labels), ('release_speed', float32),
+        ('release_spin_rate', int16), ('release_extension', float32), ('release_pos_x', float32),
+        ('release_pos_z', float32), ('spin_axis', int16), ('pfx_x', float32), ('pfx_z', float32),
+        ('plate_x', float32), ('plate_z', float32), ('sz_top', float32), ('sz_bot', float32), ('zone', int8),
+        ('type', labels), ('description', labels), ('events', labels), ('bb_type', labels),
+        ('launch_speed', float32), ('launch_angle', int16), ('hit_distance_sc', int16), ('hc_x', float32),
+        ('hc_y', float32), ('estimated_ba_using_speedangle', float32),
+        ('estimated_woba_using_speedangle', float32), ('woba_value', float32), ('woba_denom', int8),
+        ('babip_value', int8), ('iso_value', int8), ('home_score', int8), ('away_score', int8),
+        ('post_home_score', int8), ('post_away_score', int8), ('delta_home_win_exp', float32),
+        ('delta_run_exp', float32),
+    ]
+
+
+def to_arrow(frame: pd.DataFrame) -> pa.Table:
+    """Convert a pyb.statcast frame straight to an Arrow table in raw.statcast's column order and types.
+
+    Columns the table does not keep are dropped and columns the frame lacks are null. Casts are checked,
+    so a value that does not fit its narrowed type fails the chunk instead of wrapping around.
+    """
+    columns = []
+    for name, arrow_type in _arrow_types():
+        if name not in frame:
+            columns.append(pa.nulls(len(frame), arrow_type))
+        elif pa.types.is_dictionary(arrow_type):
+            values = pa.array(frame[name].astype(object).where(frame[name].notna(), None), type=pa.string())
+            columns.append(values.dictionary_encode().cast(arrow_type))
+        elif pa.types.is_date32(arrow_type):
+            columns.append(pa.array(pd.to_datetime(frame[name]), from_pandas=True).cast(arrow_type))
+        else:
+            values = pd.to_numeric(frame[name], errors='coerce')
+            columns.append(pa.array(values, from_pandas=True).cast(arrow_type))
+    return pa.Table.from_arrays(columns, names=[name for name, _ in _arrow_types()])
+
+
+def season_windows(season: int, window_days: int = WINDOW_DAYS, today: Optional[date] = None) -> List[Tuple[date, date]]:
+    """Consecutive date windows covering a season up to yesterday."""
+    today = today or date.today()
+    first, last = date(season, *SEASON_START), min(date(season, *SEASON_END), today - timedelta(days=1))
+    windows = []
+    while first <= last:
+        windows.append((first, min(first + timedelta(days=window_days - 1), last)))
+        first += timedelta(days=window_days)
+    return windows
+
+
+def pending_windows(con: duckdb.DuckDBPyConnection, windows: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """The windows not already covered by checkpointed chunks (of any size) in meta.statcast_chunks."""
+    done = con.execute("SELECT start_date, end_date FROM meta.statcast_chunks").fetchall()
+    covered = set()
+    for start, end in done:
+        covered.update(start + timedelta(days=i) for i in range((end - start).days + 1))
+    return [(start, end) for start, end in windows
+            if any(start + timedelta(days=i) not in covered for i in range((end - start).days + 1))]
+
+
+@dataclass
+class IngestReport:
+    """Chunks and rows written by one ingest_statcast run."""
+    chunks: int = 0
+    rows: int = 0
+    failures: int = 0
+    fetch_seconds: float = 0.0  # summed across workers
+    write_seconds: float = 0.0
+
+
+def _fetch_chunk(start: date, end: date) -> Tuple[pa.Table, float]:
+    begin = time.perf_counter()
+    frame = fetch.statcast(start.isoformat(), end.isoformat())
+    table = frame if isinstance(frame, pa.Table) else to_arrow(frame)
+    return table, time.perf_counter() - begin
+
+
+def write_chunk(con: duckdb.DuckDBPyConnection, start: date, end: date, table: pa.Table,
+                fetch_seconds: float = 0.0, checkpoint: bool = True) -> int:
+    """Replace raw.statcast's rows from `start` to `end` with `table` and checkpoint the window, atomically."""
+    con.register('temp_statcast', table)
+    con.execute("BEGIN TRANSACTION")
+    try:
+        begin = time.perf_counter()
+        con.execute("DELETE FROM raw.statcast WHERE game_date BETWEEN $start AND $end", {'start': start, 'end': end})
+        rows = con.execute("INSERT INTO raw.statcast SELECT * FROM temp_statcast ORDER BY game_date").fetchone()[0]
+        if checkpoint:
+            con.execute("""
+                INSERT OR REPLACE INTO meta.statcast_chunks (start_date, end_date, rows, fetch_seconds, write_seconds)
+                VALUES ($start, $end, $rows, $fetch, $write)
+            """, {'start': start, 'end': end, 'rows': rows, 'fetch': fetch_seconds,
+                  'write': time.perf_counter() - begin})
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.unregister('temp_statcast')
+    return rows
+
+
+def ingest_statcast(con: duckdb.DuckDBPyConnection, seasons: Iterable[int], max_workers: int = 4,
+                    window_days: int = WINDOW_DAYS, full: bool = False, today: Optional[date] = None) -> IngestReport:
+    """Backfill raw.statcast for `seasons`, one date window per pyb.statcast call, resuming where it stopped.
+
+    Windows are fetched in a pool of `max_workers` with at most twice that many chunks in memory; each is
+    converted once to Arrow and appended by this thread in one transaction with its checkpoint, so an
+    interrupted run keeps every finished window and the next run fetches only the rest. Windows reaching
+    into the last SETTLE_DAYS are written but not checkpointed. `full` forgets the seasons' checkpoints.
+    """
+    today = today or date.today()
+    report = IngestReport()
+    seasons = sorted(set(seasons))
+    windows = [w for season in seasons for w in season_windows(season, window_days, today)]
+    if full and seasons:
+        con.execute("DELETE FROM meta.statcast_chunks WHERE year(start_date) IN (SELECT UNNEST($seasons))",
+                    {'seasons': seasons})
+    queue = pending_windows(con, windows)
+    settled = today - timedelta(days=SETTLE_DAYS)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while queue or running:
+            while queue and len(running) < 2 * max_workers:
+                start, end = queue.pop(0)
+                running[pool.submit(_fetch_chunk, start, end)] = (start, end)
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                start, end = running.pop(future)
+                try:
+                    table, seconds = future.result()
+                except Exception as e:
+                    print(f"Warning: Could not fetch Statcast {start} to {end}: {e}")
+                    report.failures += 1
+                    continue
+                begin = time.perf_counter()
+                report.rows += write_chunk(con, start, end, table, seconds, checkpoint=end < settled)
+                report.write_seconds += time.perf_counter() - begin
+                report.fetch_seconds += seconds
+                report.chunks += 1
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill pitch-level Statcast data into raw.statcast.")
+    parser.add_argument('--seasons', type=int, nargs='+', required=True, help="Seasons to ingest.")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent date-window fetches.")
+    parser.add_argument('--window-days', type=int, default=WINDOW_DAYS, help="Days per pyb.statcast call.")
+    parser.add_argument('--full', action='store_true', help="Ignore checkpoints and refetch every window.")
+    args = parser.parse_args()
+    con = duckdb.connect(database=DEFAULT_DATABASE, read_only=False)
+    try:
+        bootstrap(con)
+        report = ingest_statcast(con, args.seasons, args.workers, args.window_days, args.full)
+        print(f"Wrote {report.rows} pitches in {report.chunks} windows ({report.failures} failed); "
+              f"fetch {report.fetch_seconds:.0f}s, write {report.write_seconds:.0f}s.")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
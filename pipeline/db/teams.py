@@ -0,0 +1,181 @@
+# pipeline/db/teams.py: MLB franchise reference data
+
+# Baseball-Reference abbreviations (as used by pyb.schedule_and_record) for the current 30 franchises
+TEAMS = (
+    'ARI', 'ATL', 'BAL', 'BOS', 'CHC', 'CHW', 'CIN', 'CLE', 'COL', 'DET',
+    'HOU', 'KCR', 'LAA', 'LAD', 'MIA', 'MIL', 'MIN', 'NYM', 'NYY', 'OAK',
+    'PHI', 'PIT', 'SDP', 'SEA', 'SFG', 'STL', 'TBR', 'TEX', 'TOR', 'WSN',
+)
+
+# Full franchise names (as printed by odds sites) to Baseball-Reference abbreviations, including former names
+TEAM_NAMES = {
+    'Arizona Diamondbacks': 'ARI', 'Atlanta Braves': 'ATL', 'Baltimore Orioles': 'BAL', 'Boston Red Sox': 'BOS',
+    'Chicago Cubs': 'CHC', 'Chicago White Sox': 'CHW', 'Cincinnati Reds': 'CIN', 'Cleveland Guardians': 'CLE',
+    'Cleveland Indians': 'CLE', 'Colorado Rockies': 'COL', 'Detroit Tigers': 'DET', 'Houston Astros': 'HOU',
+    'Kansas City Royals': 'KCR', 'Los Angeles Angels': 'LAA', 'Los Angeles Angels of Anaheim': 'LAA',
+    'Los Angeles Dodgers': 'LAD', 'Miami Marlins': 'MIA', 'Milwaukee Brewers': 'MIL', 'Minnesota Twins': 'MIN',
+    'New York Mets': 'NYM', 'New York Yankees': 'NYY', 'Oakland Athletics': 'OAK', 'Athletics': 'OAK',
+    'Philadelphia Phillies': 'PHI', 'Pittsburgh Pirates': 'PIT', 'San Diego Padres': 'SDP',
+    'Seattle Mariners': 'SEA', 'San Francisco Giants': 'SFG', 'St. Louis Cardinals': 'STL',
+    'St.Louis Cardinals': 'STL', 'Tampa Bay Rays': 'TBR', 'Texas Rangers': 'TEX', 'Toronto Blue Jays': 'TOR',
+    'Washington Nationals': 'WSN',
+}
+
+# Baseball-Reference codes a franchise is listed under other than its TEAMS entry:
+# (code, team, first season, last season or None while current). Rows are stored under the TEAMS entry.
+TEAM_CODES = [
+    ('ATH', 'OAK', 2025, None),  # the Athletics, listed without a city once they left Oakland
+]
+
+
+def bref_code(team: str, season: int) -> str:
+    """The code Baseball-Reference lists `team` under in `season`."""
+    for code, franchise, first, last in TEAM_CODES:
+        if franchise == team and first <= season and (last is None or season <= last):
+            return code
+    return team
+
+
+def franchise(code: str) -> str:
+    """The TEAMS entry of a Baseball-Reference code from any season."""
+    return next((team for other, team, _, _ in TEAM_CODES if other == code), code)
+
+
+# Divisions since 2013 (the league is the first two letters); the playoff format is the 12-team one from 2022
+DIVISIONS = {
+    'AL East': ('BAL', 'BOS', 'NYY', 'TBR', 'TOR'),
+    'AL Central': ('CHW', 'CLE', 'DET', 'KCR', 'MIN'),
+    'AL West': ('HOU', 'LAA', 'OAK', 'SEA', 'TEX'),
+    'NL East': ('ATL', 'MIA', 'NYM', 'PHI', 'WSN'),
+    'NL Central': ('CHC', 'CIN', 'MIL', 'PIT', 'STL'),
+    'NL West': ('ARI', 'COL', 'LAD', 'SDP', 'SFG'),
+}
+
+# Ballparks by Retrosheet park ID: name, latitude, longitude and roof type
+BALLPARKS = {
+    'PHO01': ('Chase Field', 33.4453, -112.0667, 'retractable'),
+    'ATL02': ('Turner Field', 33.7350, -84.3900, 'open'),
+    'ATL03': ('Truist Park', 33.8907, -84.4677, 'open'),
+    'BAL12': ('Oriole Park at Camden Yards', 39.2838, -76.6217, 'open'),
+    'BOS07': ('Fenway Park', 42.3467, -71.0972, 'open'),
+    'CHI11': ('Wrigley Field', 41.9484, -87.6553, 'open'),
+    'CHI12': ('Guaranteed Rate Field', 41.8299, -87.6338, 'open'),
+    'CIN08': ('Cinergy Field', 39.0974, -84.5072, 'open'),
+    'CIN09': ('Great American Ball Park', 39.0975, -84.5066, 'open'),
+    'CLE08': ('Progressive Field', 41.4962, -81.6852, 'open'),
+    'DEN02': ('Coors Field', 39.7559, -104.9942, 'open'),
+    'DET04': ('Tiger Stadium', 42.3319, -83.0689, 'open'),
+    'DET05': ('Comerica Park', 42.3390, -83.0485, 'open'),
+    'HOU02': ('Astrodome', 29.6847, -95.4107, 'dome'),
+    'HOU03': ('Minute Maid Park', 29.7573, -95.3555, 'retractable'),
+    'KAN06': ('Kauffman Stadium', 39.0517, -94.4803, 'open'),
+    'ANA01': ('Angel Stadium', 33.8003, -117.8827, 'open'),
+    'LOS03': ('Dodger Stadium', 34.0739, -118.2400, 'open'),
+    'MIA01': ('Sun Life Stadium', 25.9580, -80.2389, 'open'),
+    'MIA02': ('loanDepot park', 25.7781, -80.2197, 'retractable'),
+    'MIL05': ('County Stadium', 43.0305, -87.9750, 'open'),
+    'MIL06': ('American Family Field', 43.0280, -87.9712, 'retractable'),
+    'MIN03': ('Hubert H. Humphrey Metrodome', 44.9738, -93.2581, 'dome'),
+    'MIN04': ('Target Field', 44.9817, -93.2776, 'open'),
+    'NYC16': ('Yankee Stadium (1923)', 40.8270, -73.9282, 'open'),
+    'NYC17': ('Shea Stadium', 40.7560, -73.8456, 'open'),
+    'NYC20': ('Citi Field', 40.7571, -73.8458, 'open'),
+    'NYC21': ('Yankee Stadium', 40.8296, -73.9262, 'open'),
+    'OAK01': ('Oakland Coliseum', 37.7516, -122.2005, 'open'),
+    'SAC01': ('Sutter Health Park', 38.5804, -121.5136, 'open'),
+    'PHI12': ('Veterans Stadium', 39.9069, -75.1714, 'open'),
+    'PHI13': ('Citizens Bank Park', 39.9061, -75.1665, 'open'),
+    'PIT07': ('Three Rivers Stadium', 40.4467, -80.0136, 'open'),
+    'PIT08': ('PNC Park', 40.4469, -80.0057, 'open'),
+    'SAN01': ('Qualcomm Stadium', 32.7831, -117.1196, 'open'),
+    'SAN02': ('Petco Park', 32.7073, -117.1566, 'open'),
+    'SEA03': ('T-Mobile Park', 47.5914, -122.3325, 'retractable'),
+    'SFO02': ('Candlestick Park', 37.7136, -122.3863, 'open'),
+    'SFO03': ('Oracle Park', 37.7786, -122.3893, 'open'),
+    'STL09': ('Busch Stadium II', 38.6225, -90.1928, 'open'),
+    'STL10': ('Busch Stadium', 38.6226, -90.1928, 'open'),
+    'STP01': ('Tropicana Field', 27.7682, -82.6534, 'dome'),
+    'TMP01': ('George M. Steinbrenner Field', 27.9803, -82.5066, 'open'),
+    'ARL02': ('Globe Life Park in Arlington', 32.7513, -97.0829, 'open'),
+    'ARL03': ('Globe Life Field', 32.7473, -97.0847, 'retractable'),
+    'TOR02': ('Rogers Centre', 43.6414, -79.3894, 'retractable'),
+    'BUF05': ('Sahlen Field', 42.8806, -78.8737, 'open'),
+    'DUN01': ('TD Ballpark', 28.0036, -82.7867, 'open'),
+    'WAS10': ('RFK Stadium', 38.8898, -76.9719, 'open'),
+    'WAS11': ('Nationals Park', 38.8730, -77.0074, 'open'),
+    # Neutral sites
+    'TOK01': ('Tokyo Dome', 35.7056, 139.7519, 'dome'),
+    'SEO01': ('Gocheok Sky Dome', 37.4982, 126.8671, 'dome'),
+    'LON01': ('London Stadium', 51.5387, -0.0166, 'open'),
+    'MEX02': ('Estadio Alfredo Harp Helu', 19.4044, -99.0860, 'open'),
+    'SJU01': ('Hiram Bithorn Stadium', 18.4071, -66.0617, 'open'),
+    'FOR01': ('Fort Bragg Stadium', 35.1394, -79.0064, 'open'),
+    'DYE01': ('Field of Dreams', 42.4975, -91.0553, 'open'),
+    'BIR01': ('Rickwood Field', 33.4967, -86.8417, 'open'),
+    'WIL02': ('Bowman Field', 41.2425, -77.0472, 'open'),
+}
+
+# Each franchise's home park by season: (team, park ID, first season, last season or None while current).
+# Seasons before a franchise's earliest listed park have no park, so their games get no weather.
+HOME_PARKS = [
+    ('ARI', 'PHO01', 1998, None),
+    ('ATL', 'ATL02', 1997, 2016), ('ATL', 'ATL03', 2017, None),
+    ('BAL', 'BAL12', 1992, None),
+    ('BOS', 'BOS07', 1912, None),
+    ('CHC', 'CHI11', 1916, None),
+    ('CHW', 'CHI12', 1991, None),
+    ('CIN', 'CIN08', 1970, 2002), ('CIN', 'CIN09', 2003, None),
+    ('CLE', 'CLE08', 1994, None),
+    ('COL', 'DEN02', 1995, None),
+    ('DET', 'DET04', 1912, 1999), ('DET', 'DET05', 2000, None),
+    ('HOU', 'HOU02', 1965, 1999), ('HOU', 'HOU03', 2000, None),
+    ('KCR', 'KAN06', 1973, None),
+    ('LAA', 'ANA01', 1966, None),
+    ('LAD', 'LOS03', 1962, None),
+    ('MIA', 'MIA01', 1993, 2011), ('MIA', 'MIA02', 2012, None),
+    ('MIL', 'MIL05', 1970, 2000), ('MIL', 'MIL06', 2001, None),
+    ('MIN', 'MIN03', 1982, 2009), ('MIN', 'MIN04', 2010, None),
+    ('NYM', 'NYC17', 1964, 2008), ('NYM', 'NYC20', 2009, None),
+    ('NYY', 'NYC16', 1976, 2008), ('NYY', 'NYC21', 2009, None),
+    ('OAK', 'OAK01', 1968, 2024), ('OAK', 'SAC01', 2025, None),  # the Athletics, in Sacramento from 2025
+    ('PHI', 'PHI12', 1971, 2003), ('PHI', 'PHI13', 2004, None),
+    ('PIT', 'PIT07', 1970, 2000), ('PIT', 'PIT08', 2001, None),
+    ('SDP', 'SAN01', 1969, 2003), ('SDP', 'SAN02', 2004, None),
+    ('SEA', 'SEA03', 1999, None),
+    ('SFG', 'SFO02', 1960, 1999), ('SFG', 'SFO03', 2000, None),
+    ('STL', 'STL09', 1966, 2005), ('STL', 'STL10', 2006, None),
+    # Tropicana Field's roof was torn off in October 2024; the Rays spent 2025 at the Yankees' spring park
+    ('TBR', 'STP01', 1998, 2024), ('TBR', 'TMP01', 2025, 2025), ('TBR', 'STP01', 2026, None),
+    ('TEX', 'ARL02', 1994, 2019), ('TEX', 'ARL03', 2020, None),
+    # Barred from Canada in 2020, the Blue Jays played in Buffalo (and started 2021 away too; see PARK_EXCEPTIONS)
+    ('TOR', 'TOR02', 1989, 2019), ('TOR', 'BUF05', 2020, 2020), ('TOR', 'TOR02', 2021, None),
+    ('WSN', 'WAS10', 2005, 2007), ('WSN', 'WAS11', 2008, None),
+]
+
+# Games away from the home team's park for part of a season: (park ID, first date, last date, teams). A game
+# in the date range whose home team is one of `teams` was played there: neutral-site series list both teams
+# (either may be the designated home side), temporary homes just the one.
+PARK_EXCEPTIONS = [
+    ('DUN01', '2021-04-01', '2021-05-31', ('TOR',)),
+    ('BUF05', '2021-06-01', '2021-07-29', ('TOR',)),
+    ('FOR01', '2016-07-03', '2016-07-03', ('ATL', 'MIA')),
+    ('WIL02', '2017-08-20', '2017-08-20', ('PIT', 'STL')),
+    ('SJU01', '2018-04-17', '2018-04-19', ('CLE', 'MIN')),
+    ('WIL02', '2018-08-19', '2018-08-19', ('NYM', 'PHI')),
+    ('TOK01', '2019-03-20', '2019-03-21', ('OAK', 'SEA')),
+    ('LON01', '2019-06-29', '2019-06-30', ('BOS', 'NYY')),
+    ('WIL02', '2019-08-18', '2019-08-18', ('CHC', 'PIT')),
+    ('DYE01', '2021-08-12', '2021-08-12', ('CHW', 'NYY')),
+    ('WIL02', '2021-08-22', '2021-08-22', ('CLE', 'LAA')),
+    ('DYE01', '2022-08-11', '2022-08-11', ('CHC', 'CIN')),
+    ('WIL02', '2022-08-21', '2022-08-21', ('BAL', 'BOS')),
+    ('MEX02', '2023-04-29', '2023-04-30', ('SDP', 'SFG')),
+    ('LON01', '2023-06-24', '2023-06-25', ('CHC', 'STL')),
+    ('WIL02', '2023-08-20', '2023-08-20', ('PHI', 'WSN')),
+    ('SEO01', '2024-03-20', '2024-03-21', ('LAD', 'SDP')),
+    ('MEX02', '2024-04-27', '2024-04-28', ('COL', 'HOU')),
+    ('LON01', '2024-06-08', '2024-06-09', ('NYM', 'PHI')),
+    ('BIR01', '2024-06-20', '2024-06-20', ('SFG', 'STL')),
+    ('WIL02', '2024-08-18', '2024-08-18', ('DET', 'NYY')),
+    ('TOK01', '2025-03-18', '2025-03-19', ('CHC', 'LAD')),
+]
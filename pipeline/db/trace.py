@@ -0,0 +1,342 @@
+# pipeline/db/trace.py: Opt-in timing of pybaseball fetches, SQL statements and SDK calls
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Iterator, List, Optional, Sequence
+
+import duckdb
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Latency histogram bucket upper bounds in seconds: 0.1 ms doubling up to ~105 s, then +Inf
+BUCKETS = tuple(0.0001 * 2 ** i for i in range(21)) + (float('inf'),)
+
+# Result methods whose time, rows and bytes are added to the statement's span
+_FETCHES = frozenset({
+    'fetchone', 'fetchall', 'fetchmany', 'fetchdf', 'df', 'fetchnumpy', 'fetch_df_chunk',
+    'to_arrow_table', 'arrow', 'fetch_arrow_table', 'pl', 'to_arrow_reader',
+})
+
+
+@dataclass
+class Span:
+    """One timed call: a pybaseball fetch, a SQL statement (execute plus fetch) or an SDK method."""
+    span_id: int
+    parent_id: Optional[int]
+    kind: str  # 'fetch', 'sql' or 'sdk'
+    name: str
+    started_at: datetime
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    error: Optional[str] = None
+    _start: float = field(default=0.0, repr=False)
+
+
+# Module state; every hook checks _enabled first so a disabled tracer costs one global lookup per call
+_enabled = False
+_spans: Deque[Span] = deque(maxlen=10_000)
+_ids = itertools.count(1)
+_flushed_id = 0
+_lock = threading.Lock()
+_local = threading.local()
+_profile_dir: Optional[str] = None
+_profile_lock = threading.Lock()
+
+
+def enable(buffer_size: int = 10_000, profile_dir: Optional[str] = None) -> None:
+    """Start recording spans into a ring buffer of the last `buffer_size`.
+
+    With `profile_dir`, every outermost SDK call also runs under cProfile and dumps <method>-<span_id>.prof
+    there (one call at a time; concurrent calls are timed but not profiled).
+    """
+    global _enabled, _spans, _profile_dir
+    with _lock:
+        if buffer_size != _spans.maxlen:
+            _spans = deque(_spans, maxlen=buffer_size)
+        _profile_dir = profile_dir
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+        _enabled = True
+
+
+def disable() -> None:
+    """Stop recording; spans already recorded stay available."""
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def clear() -> None:
+    """Drop every recorded span."""
+    with _lock:
+        _spans.clear()
+
+
+def _stack() -> List[int]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _start(kind: str, name: str) -> Span:
+    stack = _stack()
+    return Span(next(_ids), stack[-1] if stack else None, kind, name, datetime.now(), _start=time.perf_counter())
+
+
+def _record(span: Span, value: Any = None, error: Optional[BaseException] = None) -> None:
+    span.seconds += time.perf_counter() - span._start
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"[:500]
+    elif value is not None:
+        _measure(span, value)
+    with _lock:
+        _spans.append(span)
+
+
+def _measure(span: Span, value: Any) -> None:
+    """Rows and in-memory bytes of a result, for the result types the pipeline produces."""
+    if hasattr(value, 'num_rows') and hasattr(value, 'nbytes'):  # pyarrow Table / RecordBatch
+        span.rows, span.bytes = value.num_rows, value.nbytes
+    elif hasattr(value, 'memory_usage') and hasattr(value, 'shape'):  # pandas DataFrame
+        span.rows, span.bytes = len(value), int(value.memory_usage(index=True).sum())
+    elif hasattr(value, 'estimated_size'):  # polars DataFrame
+        span.rows, span.bytes = value.height, value.estimated_size()
+    elif isinstance(value, dict) and value and all(hasattr(a, 'nbytes') for a in value.values()):  # fetchnumpy
+        span.rows = len(next(iter(value.values())))
+        span.bytes = sum(a.nbytes for a in value.values())
+    elif isinstance(value, (list, dict)):  # fetchall rows, or one result per requested name
+        span.rows = len(value)
+    elif isinstance(value, tuple):
+        span.rows = 1
+
+
+def call(kind: str, name: str, fn: Callable, *args, **kwargs) -> Any:
+    """Run fn(*args, **kwargs), recording a span around it when tracing is enabled."""
+    if not _enabled:
+        return fn(*args, **kwargs)
+    span = _start(kind, name)
+    stack = _stack()
+    stack.append(span.span_id)
+    profiler = None
+    if kind == 'sdk' and _profile_dir and len(stack) == 1 and _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler (e.g. a debugger's) is active in this thread
+            profiler = None
+            _profile_lock.release()
+    try:
+        value = fn(*args, **kwargs)
+    except BaseException as e:
+        _record(span, error=e)
+        raise
+    else:
+        _record(span, value)
+        return value
+    finally:
+        stack.pop()
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(_profile_dir, f"{name}-{span.span_id}.prof"))
+            _profile_lock.release()
+
+
+def traced(kind: str, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator recording a span around every call of the function (its qualified name by default)."""
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            return call(kind, label, fn, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def stream(kind: str, name: str, batches: Iterator) -> Iterator:
+    """Pass Arrow record batches through, recording one span for the whole stream when tracing is enabled.
+
+    The span is recorded once the stream is exhausted, closed or fails. Its seconds count only the time spent
+    producing batches, not the consumer's time between them, and its rows and bytes sum over every batch.
+    """
+    if not _enabled:
+        return batches
+    return _stream(_start(kind, name), batches)
+
+
+def _stream(span: Span, batches: Iterator) -> Iterator:
+    span.rows = span.bytes = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                batch = next(batches, None)
+            finally:
+                span.seconds += time.perf_counter() - start
+            if batch is None:
+                return
+            span.rows += batch.num_rows
+            span.bytes += batch.nbytes
+            yield batch
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"[:500]
+        raise
+    finally:
+        if hasattr(batches, 'close'):
+            batches.close()
+        with _lock:
+            _spans.append(span)
+
+
+def _statement(query: str) -> str:
+    return ' '.join(query.split())[:200]
+
+
+class TracedResult:
+    """A DuckDB result whose fetches add their time, rows and bytes to the statement's span."""
+
+    def __init__(self, result: Any, span: Span):
+        self._result = result
+        self._span = span
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._result, name)
+        if name not in _FETCHES:
+            return attr
+
+        def fetch(*args, **kwargs):
+            start = time.perf_counter()
+            value = attr(*args, **kwargs)
+            self._span.seconds += time.perf_counter() - start
+            if name != 'to_arrow_reader':
+                _measure(self._span, value)
+            return value
+        return fetch
+
+
+class TracedConnection:
+    """A DuckDB connection whose execute() calls are recorded as 'sql' spans; everything else passes through."""
+
+    def __init__(self, con: duckdb.DuckDBPyConnection):
+        self.wrapped = con
+
+    def execute(self, query: str, parameters: Any = None) -> TracedResult:
+        span = _start('sql', _statement(query))
+        try:
+            result = self.wrapped.execute(query) if parameters is None else self.wrapped.execute(query, parameters)
+        except BaseException as e:
+            _record(span, error=e)
+            raise
+        _record(span)
+        return TracedResult(result, span)
+
+    def cursor(self) -> TracedConnection:
+        return TracedConnection(self.wrapped.cursor())
+
+    def __getattr__(self, name: str):
+        return getattr(self.wrapped, name)
+
+    def __enter__(self) -> TracedConnection:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wrapped.close()
+
+
+def connection(con: duckdb.DuckDBPyConnection) -> Any:
+    """Return `con` itself when tracing is disabled, otherwise a wrapper recording its statements."""
+    if not _enabled or isinstance(con, TracedConnection):
+        return con
+    return TracedConnection(con)
+
+
+def spans(kind: Optional[str] = None) -> pd.DataFrame:
+    """Recorded spans, oldest first, optionally of one kind."""
+    with _lock:
+        recorded = [s for s in _spans if kind is None or s.kind == kind]
+    columns = [f for f in Span.__dataclass_fields__ if not f.startswith('_')]
+    return pd.DataFrame([{c: getattr(s, c) for c in columns} for s in recorded], columns=columns)
+
+
+def summary(by: Sequence[str] = ('kind', 'name')) -> pd.DataFrame:
+    """Calls, total and percentile seconds, rows and bytes per kind and name, slowest total first."""
+    frame = spans()
+    if frame.empty:
+        return frame
+    grouped = frame.groupby(list(by))
+    result = grouped.agg(calls=('seconds', 'size'), total_seconds=('seconds', 'sum'), max_seconds=('seconds', 'max'),
+                         rows=('rows', 'sum'), bytes=('bytes', 'sum'), errors=('error', 'count'))
+    for q in (0.5, 0.9, 0.99):
+        result[f"p{int(q * 100)}_seconds"] = grouped['seconds'].quantile(q)
+    return result.reset_index().sort_values('total_seconds', ascending=False, ignore_index=True)
+
+
+def histograms(by: Sequence[str] = ('kind', 'name')) -> pd.DataFrame:
+    """Cumulative latency histogram per kind and name: one row per bucket upper bound `le` (seconds)."""
+    frame = spans()
+    rows = []
+    for key, group in frame.groupby(list(by)):
+        counts = np.searchsorted(np.sort(group['seconds'].to_numpy()), BUCKETS, side='right')
+        key = key if isinstance(key, tuple) else (key,)
+        rows += [(*key, le, int(count)) for le, count in zip(BUCKETS, counts)]
+    return pd.DataFrame(rows, columns=[*by, 'le', 'count'])
+
+
+def prometheus(metric: str = 'baseball_call_seconds') -> str:
+    """The latency histograms in Prometheus text exposition format, labelled by kind and name."""
+    lines = [f"# TYPE {metric} histogram"]
+    frame = spans()
+    for (kind, name), group in frame.groupby(['kind', 'name']):
+        labels = f'kind="{kind}",name="{name.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        counts = np.searchsorted(np.sort(group['seconds'].to_numpy()), BUCKETS, side='right')
+        lines += [f'{metric}_bucket{{{labels},le="{"+Inf" if le == float("inf") else f"{le:g}"}"}} {count}'
+                  for le, count in zip(BUCKETS, counts)]
+        lines += [f"{metric}_sum{{{labels}}} {group['seconds'].sum():.6f}", f"{metric}_count{{{labels}}} {len(group)}"]
+    return '\n'.join(lines) + '\n'
+
+
+def flush(con: duckdb.DuckDBPyConnection) -> int:
+    """Append the spans recorded since the last flush to meta.query_log; returns the rows written.
+
+    Spans that fell out of the ring buffer before a flush are lost, so flush at least every buffer_size calls.
+    """
+    global _flushed_id
+    with _lock:
+        pending = [s for s in _spans if s.span_id > _flushed_id]
+        if not pending:
+            return 0
+        _flushed_id = max(s.span_id for s in pending)
+    frame = pd.DataFrame([{k: v for k, v in asdict(s).items() if not k.startswith('_')} for s in pending])
+    frame['pid'] = os.getpid()
+    columns = ', '.join(frame.columns)
+    con = getattr(con, 'wrapped', con)  # never trace the log write itself
+    con.register('temp_query_log', frame)
+    try:
+        con.execute(f"INSERT INTO meta.query_log ({columns}) SELECT {columns} FROM temp_query_log")
+    finally:
+        con.unregister('temp_query_log')
+    return len(frame)
+
+
+if os.environ.get('BASEBALL_TRACE'):
+    enable(profile_dir=os.environ.get('BASEBALL_TRACE_PROFILE') or None)
@@ -0,0 +1,263 @@
+# pipeline/db/training.py: Walk-forward backtests and parallel hyperparameter search for the win model
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import duckdb
+from . import pricing, rolling
+from .pool import DEFAULT_DATABASE
+from .schema import bootstrap
+from .scoring import FEATURES
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pa = lazy_import('pyarrow')
+pd = lazy_import('pandas')
+xgb = lazy_import('xgboost')
+
+RESULTS_COLUMNS = [
+    'run_id', 'trial', 'params', 'fold', 'train_games', 'test_start', 'test_end', 'test_games',
+    'log_loss', 'brier', 'bets', 'roi', 'seconds'
+]
+
+# Searched when no trials are given: 3 x 3 x 2 x 2 = 36 configurations
+DEFAULT_SPACE = {
+    'max_depth': [2, 3, 4],
+    'eta': [0.03, 0.1, 0.3],
+    'subsample': [0.8, 1.0],
+    'num_boost_round': [100, 300],
+}
+
+# Matrix columns besides the model features, all stored as float64 with NaN for missing values
+_EXTRA = ['game_day', 'home_win', 'moneyline_home', 'moneyline_away']
+
+# Matrix and folds of a worker process, mapped once from the shared Arrow file by _init_worker
+_matrix: Optional[Dict[str, np.ndarray]] = None
+_splits: Sequence[Tuple[slice, slice]] = ()
+
+
+def feature_matrix(con: duckdb.DuckDBPyConnection, seasons: Optional[Iterable[int]] = None) -> pa.Table:
+    """Every played game's features, label, closing moneylines and day number as float64 Arrow columns."""
+    table = rolling.game_features(con, seasons, format='arrow')
+    table = table.filter(table['home_win'].is_valid())
+    days = table['game_date'].cast(pa.int32())  # days since epoch, in date order
+    columns = {'game_day': days.cast(pa.float64())}
+    for name in FEATURES + _EXTRA[1:]:
+        # Nulls become NaN so workers can view the columns as NumPy arrays without copying
+        columns[name] = table[name].cast(pa.float64()).fill_null(float('nan'))
+    return pa.table(columns)
+
+
+def write_matrix(table: pa.Table, path: str) -> None:
+    """Write the matrix as an uncompressed Arrow IPC file, so readers can memory-map it."""
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=max(1, table.num_rows))
+
+
+def read_matrix(path: str) -> Dict[str, np.ndarray]:
+    """Memory-map an IPC matrix; columns are read-only NumPy views of the page cache, shared by every process."""
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return {name: table[name].chunk(0).to_numpy(zero_copy_only=True) if table[name].num_chunks == 1
+            else table[name].to_numpy() for name in table.column_names}
+
+
+def walk_forward_splits(days: np.ndarray, test_days: int = 30, min_train_games: int = 500,
+                        gap_days: int = 0) -> List[Tuple[slice, slice]]:
+    """Expanding-window splits over date-sorted day numbers.
+
+    Each fold tests the games of the next `test_days` calendar days that have games and trains on every
+    game at least `gap_days` before them; the first fold starts once `min_train_games` are available.
+    Returns (train, test) row slices, which index the matrix columns as views and pickle as three integers.
+    """
+    unique = np.unique(days)
+    splits = []
+    start = days[min(min_train_games, len(days) - 1)] if len(days) else 0
+    while len(days) and start <= unique[-1]:
+        end = start + test_days
+        train = slice(0, int(np.searchsorted(days, start - gap_days, side='left')))
+        test = slice(int(np.searchsorted(days, start, side='left')), int(np.searchsorted(days, end, side='left')))
+        if test.stop > test.start and train.stop > 0:
+            splits.append((train, test))
+        later = unique[unique >= end]
+        if not len(later):
+            break
+        start = later[0]
+    return splits
+
+
+def param_grid(space: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the given parameter values."""
+    return [dict(zip(space, values)) for values in itertools.product(*space.values())]
+
+
+def flat_bet_roi(prob: np.ndarray, home_win: np.ndarray, moneyline_home: np.ndarray, moneyline_away: np.ndarray,
+                 min_edge: float = 0.02) -> Tuple[int, float]:
+    """Stake one unit on the side whose model probability beats the de-vigged closing line by `min_edge`.
+
+    Returns (bets, profit per unit staked); games without a closing line are not bet.
+    """
+    priced = ~(np.isnan(moneyline_home) | np.isnan(moneyline_away))
+    if not priced.any():
+        return 0, float('nan')
+    decimal = pricing.american_to_decimal(np.column_stack([moneyline_home[priced], moneyline_away[priced]]))
+    fair = pricing.devig(pricing.implied_probability(decimal), 'multiplicative')
+    model = np.column_stack([prob[priced], 1 - prob[priced]])
+    edge = model - fair
+    side = edge.argmax(axis=1)
+    rows = np.arange(len(side))
+    bet = edge[rows, side] > min_edge
+    if not bet.any():
+        return 0, float('nan')
+    won = np.where(side == 0, home_win[priced] == 1, home_win[priced] == 0)
+    profit = np.where(won, decimal[rows, side] - 1, -1.0)[bet]
+    return int(bet.sum()), float(profit.mean())
+
+
+def _fit(matrix: Mapping[str, np.ndarray], rows: slice, params: Mapping[str, Any]) -> xgb.Booster:
+    params = dict(params)
+    rounds = params.pop('num_boost_round', 100)
+    # One thread per booster: the parallelism is across trials, one per process
+    params = {'objective': 'binary:logistic', 'eval_metric': 'logloss', 'nthread': 1, **params}
+    features = np.column_stack([matrix[name][rows] for name in FEATURES]).astype(np.float32)
+    dtrain = xgb.DMatrix(features, label=matrix['home_win'][rows], feature_names=FEATURES, missing=np.nan)
+    return xgb.train(params, dtrain, num_boost_round=rounds)
+
+
+def evaluate(matrix: Mapping[str, np.ndarray], splits: Sequence[Tuple[slice, slice]],
+             params: Mapping[str, Any], min_edge: float = 0.02) -> List[Dict[str, Any]]:
+    """Train and score one configuration on every fold; returns one metrics dict per fold."""
+    folds = []
+    for fold, (train, test) in enumerate(splits):
+        start = time.perf_counter()
+        booster = _fit(matrix, train, params)
+        features = np.column_stack([matrix[name][test] for name in FEATURES]).astype(np.float32)
+        prob = booster.inplace_predict(features, missing=np.nan)
+        label = matrix['home_win'][test]
+        clipped = np.clip(prob, 1e-15, 1 - 1e-15)
+        bets, roi = flat_bet_roi(prob, label, matrix['moneyline_home'][test], matrix['moneyline_away'][test],
+                                 min_edge)
+        folds.append({
+            'fold': fold,
+            'train_games': train.stop,
+            'test_start': int(matrix['game_day'][test.start]),
+            'test_end': int(matrix['game_day'][test.stop - 1]),
+            'test_games': test.stop - test.start,
+            'log_loss': float(-np.mean(label * np.log(clipped) + (1 - label) * np.log(1 - clipped))),
+            'brier': float(np.mean((prob - label) ** 2)),
+            'bets': bets,
+            'roi': roi,
+            'seconds': time.perf_counter() - start,
+        })
+    return folds
+
+
+def _init_worker(path: str, splits: Sequence[Tuple[slice, slice]]) -> None:
+    global _matrix, _splits
+    _matrix, _splits = read_matrix(path), splits
+
+
+def _run_trial(job: Tuple[int, Dict[str, Any], float]) -> List[Dict[str, Any]]:
+    trial, params, min_edge = job
+    return [{'trial': trial, 'params': json.dumps(params, sort_keys=True), **fold}
+            for fold in evaluate(_matrix, _splits, params, min_edge)]
+
+
+def search(con: duckdb.DuckDBPyConnection, trials: Optional[Sequence[Mapping[str, Any]]] = None,
+           seasons: Optional[Iterable[int]] = None, max_workers: Optional[int] = None, test_days: int = 30,
+           min_train_games: int = 500, min_edge: float = 0.02, run_id: Optional[str] = None) -> pd.DataFrame:
+    """Walk-forward evaluate every trial configuration in parallel and record each fold in meta.backtest_results.
+
+    The feature matrix is queried once, written to an Arrow IPC file and memory-mapped by every worker, so
+    all processes share one read-only copy and no trial pickles data. Each trial is a task; workers train
+    with a single thread. Returns the recorded rows.
+    """
+    trials = [dict(t) for t in (trials or param_grid(DEFAULT_SPACE))]
+    run_id = run_id or uuid.uuid4().hex[:12]
+    table = feature_matrix(con, seasons)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'matrix.arrow')
+        write_matrix(table, path)
+        del table
+        splits = walk_forward_splits(read_matrix(path)['game_day'], test_days, min_train_games)
+        if not splits:
+            raise ValueError(f"Not enough games for a walk-forward split (need more than {min_train_games}).")
+        jobs = [(trial, params, min_edge) for trial, params in enumerate(trials)]
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if workers == 1:
+            _init_worker(path, splits)
+            rows = [row for job in jobs for row in _run_trial(job)]
+        else:
+            # Spawned workers: forking a process that has DuckDB threads running is unsafe
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker, initargs=(path, splits)) as pool:
+                rows = [row for folds in pool.map(_run_trial, jobs) for row in folds]
+
+    results = pd.DataFrame(rows).assign(run_id=run_id)
+    for col in ('test_start', 'test_end'):
+        results[col] = pd.to_datetime(results[col], unit='D').dt.date
+    results = results[RESULTS_COLUMNS]
+    con.register('temp_results', results)
+    try:
+        con.execute(f"""
+            INSERT OR REPLACE INTO meta.backtest_results ({', '.join(RESULTS_COLUMNS)})
+            SELECT {', '.join(RESULTS_COLUMNS)} FROM temp_results;
+        """)
+    finally:
+        con.unregister('temp_results')
+    return results
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    """Average each trial's folds, weighting by test games, best log-loss first."""
+    weighted = results.assign(**{m: results[m] * results['test_games'] for m in ('log_loss', 'brier')})
+    summary = weighted.groupby(['trial', 'params']).agg(
+        test_games=('test_games', 'sum'), log_loss=('log_loss', 'sum'), brier=('brier', 'sum'),
+        bets=('bets', 'sum'), roi=('roi', 'mean'))
+    summary[['log_loss', 'brier']] = summary[['log_loss', 'brier']].div(summary['test_games'], axis=0)
+    return summary.sort_values('log_loss').reset_index()
+
+
+def train_model(con: duckdb.DuckDBPyConnection, params: Mapping[str, Any], path: str,
+                seasons: Optional[Iterable[int]] = None) -> xgb.Booster:
+    """Fit a configuration on every played game and save it for scoring.SlateScorer."""
+    table = feature_matrix(con, seasons)
+    matrix = {name: table[name].to_numpy() for name in table.column_names}
+    booster = _fit(matrix, slice(None), {**params, 'nthread': os.cpu_count() or 1})
+    booster.save_model(path)
+    return booster
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward hyperparameter search for the win model.")
+    parser.add_argument('--seasons', type=int, nargs='*', default=None, help="Seasons to use (defaults to all).")
+    parser.add_argument('--workers', type=int, default=None, help="Trial processes (defaults to CPU count).")
+    parser.add_argument('--test-days', type=int, default=30, help="Calendar days per test fold.")
+    parser.add_argument('--min-edge', type=float, default=0.02, help="Edge over the closing line needed to bet.")
+    parser.add_argument('--save', default=None, help="Fit the best configuration on all games and save it here.")
+    args = parser.parse_args()
+    con = duckdb.connect(database=DEFAULT_DATABASE, read_only=False)
+    try:
+        bootstrap(con)
+        results = search(con, seasons=args.seasons, max_workers=args.workers, test_days=args.test_days,
+                         min_edge=args.min_edge)
+        summary = summarize(results)
+        print(summary.head(10).to_string(index=False))
+        if args.save:
+            train_model(con, json.loads(summary['params'].iloc[0]), args.save, args.seasons)
+            print(f"Saved the best configuration to {args.save}.")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
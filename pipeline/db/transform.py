@@ -0,0 +1,89 @@
+# pipeline/db/transform.py: Whole-frame conversion of pybaseball frames to raw table rows
+
+from __future__ import annotations
+
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+# Column remaps from pybaseball frames to raw table columns
+TEAM_BATTING_COLUMNS = {
+    'Team': 'team', 'G': 'g', 'AB': 'ab', 'R': 'r', 'H': 'h', 'HR': 'hr',
+    'RBI': 'rbi', 'SB': 'sb', 'OBP': 'obp', 'SLG': 'slg'
+}
+
+TEAM_PITCHING_COLUMNS = {
+    'Team': 'team', 'W': 'w', 'L': 'l', 'ERA': 'era', 'IP': 'ip',
+    'SO': 'so', 'WHIP': 'whip', 'FIP': 'fip'
+}
+
+PLAYER_BATTING_COLUMNS = {
+    '2B': 'double', '3B': 'triple', 'HR': 'hr', 'RBI': 'rbi', 'SB': 'sb',
+    'BB': 'bb', 'SO': 'so', 'HBP': 'hbp', 'AVG': 'avg', 'OBP': 'obp',
+    'SLG': 'slg', 'OPS': 'ops', 'Team': 'team', 'Name': 'player_name',
+    'G': 'g', 'PA': 'pa', 'AB': 'ab', 'R': 'r', 'H': 'h', 'Age': 'age', 'CS': 'cs'
+}
+
+PLAYER_PITCHING_COLUMNS = {
+    'Team': 'team', 'Name': 'player_name', 'W': 'w', 'L': 'l', 'ERA': 'era',
+    'G': 'g', 'GS': 'gs', 'IP': 'ip', 'H': 'h', 'R': 'r', 'ER': 'er',
+    'BB': 'bb', 'SO': 'so', 'WHIP': 'whip', 'ERA+': 'era_plus', 'Age': 'age'
+}
+
+# Raw table column order (matches pipeline/db/sql/pybaseball/raw.py)
+TEAM_BATTING_RAW = ['season', 'team', 'g', 'ab', 'r', 'h', 'hr', 'rbi', 'sb', 'obp', 'slg']
+TEAM_PITCHING_RAW = ['season', 'team', 'w', 'l', 'era', 'ip', 'so', 'whip', 'fip']
+PLAYER_BATTING_RAW = [
+    'season', 'player_id', 'player_name', 'team', 'idfg', 'age', 'g', 'pa', 'ab', 'r', 'h', 'double',
+    'triple', 'hr', 'rbi', 'sb', 'cs', 'bb', 'so', 'hbp', 'avg', 'obp', 'slg', 'ops'
+]
+PLAYER_PITCHING_RAW = [
+    'season', 'player_id', 'player_name', 'team', 'idfg', 'age', 'w', 'l', 'era', 'g', 'gs', 'ip',
+    'h', 'r', 'er', 'bb', 'so', 'whip', 'era_plus'
+]
+
+# Columns pybaseball may deliver as strings such as '.220'
+PLAYER_BATTING_RATES = ['avg', 'obp', 'slg', 'ops']
+PLAYER_PITCHING_RATES = ['era', 'ip', 'whip']
+
+
+def _to_raw(df: pd.DataFrame, columns: dict, raw_columns: list, season: int, rates: list = ()) -> pd.DataFrame:
+    """Rename, stamp the season and project onto the raw column order; missing columns become NULL."""
+    out = df.rename(columns=columns)
+    out['season'] = season
+    if 'IDfg' in out.columns:
+        out['idfg'] = out['IDfg'].astype(str)
+    out = out.reindex(columns=raw_columns)
+    for col in rates:
+        out[col] = pd.to_numeric(out[col], errors='coerce').fillna(0.0)
+    return out
+
+
+def team_batting_rows(df: pd.DataFrame, season: int) -> pd.DataFrame:
+    """Convert a pyb.team_batting frame to raw.pybaseball_team_batting rows."""
+    return _to_raw(df, TEAM_BATTING_COLUMNS, TEAM_BATTING_RAW, season)
+
+
+def team_pitching_rows(df: pd.DataFrame, season: int) -> pd.DataFrame:
+    """Convert a pyb.team_pitching frame to raw.pybaseball_team_pitching rows."""
+    return _to_raw(df, TEAM_PITCHING_COLUMNS, TEAM_PITCHING_RAW, season)
+
+
+def schedule_dates(dates: pd.Series, season) -> pd.Series:
+    """Parse Baseball-Reference schedule dates ('Thursday, Mar 28', 'Sunday, Jun 9 (2)') to datetimes.
+
+    `season` is a single year or a Series of years aligned with `dates`.
+    """
+    day = dates.str.replace(r'^\w+,\s*', '', regex=True).str.replace(r'\s*\(\d\)$', '', regex=True)
+    years = season.astype(str) if isinstance(season, pd.Series) else str(season)
+    return pd.to_datetime(years + ' ' + day, format='%Y %b %d', errors='coerce')
+
+
+def player_batting_rows(df: pd.DataFrame, season: int) -> pd.DataFrame:
+    """Convert a pyb.batting_stats frame to raw.pybaseball_player_batting rows (player_id left NULL)."""
+    return _to_raw(df, PLAYER_BATTING_COLUMNS, PLAYER_BATTING_RAW, season, PLAYER_BATTING_RATES)
+
+
+def player_pitching_rows(df: pd.DataFrame, season: int) -> pd.DataFrame:
+    """Convert a pyb.pitching_stats frame to raw.pybaseball_player_pitching rows (player_id left NULL)."""
+    return _to_raw(df, PLAYER_PITCHING_COLUMNS, PLAYER_PITCHING_RAW, season, PLAYER_PITCHING_RATES)
@@ -0,0 +1,240 @@
+# pipeline/db/weather.py: Game-time weather at each ballpark into raw.weather, batched and cached
+
+from __future__ import annotations
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import duckdb
+from .cache import ParquetCache
+from .pool import DEFAULT_DATABASE
+from .schema import bootstrap
+from .teams import BALLPARKS, HOME_PARKS, PARK_EXCEPTIONS
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+requests = lazy_import('requests')
+
+# Open-Meteo needs no key; reanalysis lags a few days, so recent dates come from the forecast endpoint
+WEATHER_URLS = {
+    'archive': 'https://archive-api.open-meteo.com/v1/archive',
+    'forecast': 'https://api.open-meteo.com/v1/forecast',
+}
+ARCHIVE_LAG_DAYS = 5
+# The forecast endpoint serves today and the next 15 days; later games wait for a run closer to them
+FORECAST_HORIZON_DAYS = 16
+# Open-Meteo hourly variable -> raw.weather column
+HOURLY = {
+    'temperature_2m': 'temperature_c',
+    'relative_humidity_2m': 'relative_humidity',
+    'wind_speed_10m': 'wind_speed_ms',
+    'wind_direction_10m': 'wind_direction_deg',
+    'precipitation': 'precipitation_mm',
+}
+# Assumed local first-pitch hour by raw.games.day_night (schedules carry no start times)
+FIRST_PITCH = {'D': 13, 'N': 19}
+# Days of hourly data per request; longer ranges are split
+MAX_SPAN_DAYS = 92
+# Forecasts are refetched after this long; readings for past dates are kept forever
+FORECAST_TTL_SECONDS = 60 * 60
+
+WEATHER_CACHE_DIR = os.environ.get('BASEBALL_WEATHER_CACHE', './data/cache/weather')
+
+WEATHER_RAW = [
+    'game_id', 'season', 'game_date', 'park_id', 'game_hour', 'roof', *HOURLY.values(), 'source',
+]
+
+
+def ensure_parks(con: duckdb.DuckDBPyConnection) -> None:
+    """Rewrite raw.parks, raw.home_parks and raw.park_exceptions from teams.py in one transaction."""
+    tables = {
+        'raw.parks': pd.DataFrame([(park, *info) for park, info in BALLPARKS.items()],
+                                  columns=['park_id', 'name', 'latitude', 'longitude', 'roof']),
+        'raw.home_parks': pd.DataFrame(HOME_PARKS, columns=['team', 'park_id', 'first_season', 'last_season'],
+                                       ).astype({'last_season': 'Int64'}),
+        'raw.park_exceptions': pd.DataFrame(
+            [(team, park, date.fromisoformat(first), date.fromisoformat(last))
+             for park, first, last, teams in PARK_EXCEPTIONS for team in teams],
+            columns=['team', 'park_id', 'first_date', 'last_date']),
+    }
+    con.execute("BEGIN TRANSACTION")
+    try:
+        for table, frame in tables.items():
+            con.register('temp_parks', frame)
+            try:
+                con.execute(f"DELETE FROM {table}")
+                con.execute(f"INSERT INTO {table} ({', '.join(frame.columns)}) SELECT * FROM temp_parks")
+            finally:
+                con.unregister('temp_parks')
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+
+def pending_games(con: duckdb.DuckDBPyConnection, seasons: Optional[Iterable[int]] = None,
+                  game_date: Optional[date] = None) -> pd.DataFrame:
+    """Games at a known park without settled weather, with their park and local first-pitch hour.
+
+    A game's park is a park exception covering its date for its home team, else the home team's park that
+    season. Games with no weather, only a forecast, or weather recorded at a different park are pending.
+    """
+    filters = []
+    params: Dict[str, object] = {'day': FIRST_PITCH['D'], 'night': FIRST_PITCH['N']}
+    if seasons is not None:
+        filters.append("g.season IN (SELECT UNNEST($seasons))")
+        params['seasons'] = list(seasons)
+    if game_date is not None:
+        filters.append("g.game_date = $game_date")
+        params['game_date'] = game_date
+    return con.execute(f"""
+        SELECT g.game_id, g.season, g.game_date, p.park_id, p.latitude, p.longitude, p.roof,
+            g.game_date + to_hours(CASE WHEN g.day_night = 'D' THEN $day ELSE $night END) AS game_hour
+        FROM raw.games g
+        LEFT JOIN raw.park_exceptions x
+            ON x.team = g.home_team AND g.game_date BETWEEN x.first_date AND x.last_date
+        LEFT JOIN raw.home_parks h
+            ON h.team = g.home_team AND g.season BETWEEN h.first_season AND COALESCE(h.last_season, g.season)
+        JOIN raw.parks p ON p.park_id = COALESCE(x.park_id, h.park_id)
+        LEFT JOIN raw.weather w USING (game_id)
+        WHERE (w.game_id IS NULL OR w.source = 'forecast' OR w.park_id <> p.park_id)
+            {''.join(' AND ' + f for f in filters)}
+        ORDER BY g.game_date, g.game_id;
+    """, params).fetchdf()
+
+
+def _spans(days: List[date]) -> List[Tuple[date, date]]:
+    """Cover sorted dates with as few requests as possible, splitting on gaps of a week or spans over MAX_SPAN_DAYS."""
+    spans = []
+    for day in days:
+        if spans and (day - spans[-1][1]).days <= 7 and (day - spans[-1][0]).days < MAX_SPAN_DAYS:
+            spans[-1] = (spans[-1][0], day)
+        else:
+            spans.append((day, day))
+    return spans
+
+
+def fetch_hourly(latitude: float, longitude: float, start: date, end: date, endpoint: str,
+                 urls: Mapping[str, str] = WEATHER_URLS, session=None) -> pd.DataFrame:
+    """One request for every hour from `start` to `end` at a location, in local time."""
+    response = (session or requests).get(urls[endpoint], params={
+        'latitude': latitude, 'longitude': longitude, 'start_date': start.isoformat(), 'end_date': end.isoformat(),
+        'hourly': ','.join(HOURLY), 'timezone': 'auto', 'wind_speed_unit': 'ms',
+    }, timeout=30)
+    response.raise_for_status()
+    hourly = response.json()['hourly']
+    frame = pd.DataFrame({column: hourly[name] for name, column in HOURLY.items()}, dtype=float)
+    frame.insert(0, 'game_hour', pd.to_datetime(hourly['time']))
+    return frame
+
+
+def _endpoint(day: date, today: date) -> str:
+    """Where a day's readings come from: the archive once it has them, the forecast endpoint until then."""
+    return 'archive' if day < today - timedelta(days=ARCHIVE_LAG_DAYS) else 'forecast'
+
+
+def _cache_key(park_id: str, day: date, today: date) -> Tuple[str, Optional[float]]:
+    """Entry name and TTL of one park-day: final once the archive has it, a short-lived forecast before."""
+    if _endpoint(day, today) == 'archive':
+        return f"{park_id}_{day.isoformat()}_final", None
+    return f"{park_id}_{day.isoformat()}_forecast", FORECAST_TTL_SECONDS
+
+
+def update_weather(con: duckdb.DuckDBPyConnection, seasons: Optional[Iterable[int]] = None,
+                   game_date: Optional[date] = None, max_workers: int = 8, cache: Optional[ParquetCache] = None,
+                   urls: Mapping[str, str] = WEATHER_URLS, today: Optional[date] = None) -> int:
+    """Fill raw.weather for games without weather (or with only a forecast); returns the rows written.
+
+    Outdoor games FORECAST_HORIZON_DAYS or more after `today` are left pending for a later run. The rest are
+    reduced to distinct (park, hour) readings, the park-days not in `cache` are fetched with one
+    request per park, endpoint and run of dates, all concurrently, and each park-day is cached: permanently
+    once it comes from the archive (ARCHIVE_LAG_DAYS after the date), for FORECAST_TTL_SECONDS before. Only
+    archive readings are 'observed'; forecast-endpoint readings, past dates included, stay 'forecast' and
+    are refetched until the archive has them. Games under a dome get a row without a request.
+    Failed requests are skipped with a warning and retried on the next run.
+    """
+    today = today or date.today()
+    cache = cache if cache is not None else ParquetCache(WEATHER_CACHE_DIR)
+    ensure_parks(con)
+    games = pending_games(con, seasons, game_date)
+    if games.empty:
+        return 0
+    games['game_date'] = pd.to_datetime(games['game_date']).dt.date
+    horizon = today + timedelta(days=FORECAST_HORIZON_DAYS)
+    games = games[(games['roof'] == 'dome') | (games['game_date'] < horizon)]
+    outdoor = games[games['roof'] != 'dome']
+
+    hourly: Dict[Tuple[str, date], pd.DataFrame] = {}
+    missing: Dict[str, List[date]] = {}
+    for park_id, day in outdoor[['park_id', 'game_date']].drop_duplicates().itertuples(index=False):
+        frame = cache.get('hourly', *_cache_key(park_id, day, today))
+        if frame is None:
+            missing.setdefault(park_id, []).append(day)
+        else:
+            hourly[park_id, day] = frame
+
+    parks = outdoor.drop_duplicates('park_id').set_index('park_id')
+    requests_needed = [(park_id, start, end, endpoint) for park_id, days in missing.items()
+                       for endpoint in ('archive', 'forecast')
+                       for start, end in _spans(sorted(d for d in days if _endpoint(d, today) == endpoint))]
+    session = requests.Session()
+
+    def fetch_one(park_id: str, start: date, end: date, endpoint: str) -> Optional[pd.DataFrame]:
+        try:
+            return fetch_hourly(parks.at[park_id, 'latitude'], parks.at[park_id, 'longitude'], start, end,
+                                endpoint, urls, session)
+        except Exception as e:
+            print(f"Warning: Could not fetch weather for {park_id} {start} to {end}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(lambda job: fetch_one(*job), requests_needed))
+    for (park_id, _, _, _), frame in zip(requests_needed, results):
+        if frame is None:
+            continue
+        for day, day_frame in frame.groupby(frame['game_hour'].dt.date):
+            day_frame = day_frame.reset_index(drop=True)
+            cache.put('hourly', _cache_key(park_id, day, today)[0], day_frame)
+            hourly[park_id, day] = day_frame
+    session.close()
+
+    readings = pd.concat([frame.assign(park_id=park_id) for (park_id, _), frame in hourly.items()],
+                         ignore_index=True) if hourly else pd.DataFrame(columns=['park_id', 'game_hour', *HOURLY.values()])
+    rows = games.merge(readings, on=['park_id', 'game_hour'], how='left')
+    rows['game_hour'] = pd.to_datetime(rows['game_hour'])
+    indoor = rows['roof'] == 'dome'
+    fetched = rows['temperature_c'].notna()
+    archived = rows['game_date'].map(lambda day: _endpoint(day, today) == 'archive')
+    rows['source'] = pd.Series('forecast', index=rows.index).where(~archived, 'observed').where(~indoor, 'dome')
+    rows = rows[indoor | fetched][WEATHER_RAW]
+    if rows.empty:
+        return 0
+    con.register('temp_weather', rows)
+    try:
+        return con.execute(f"""
+            INSERT OR REPLACE INTO raw.weather ({', '.join(WEATHER_RAW)})
+            SELECT {', '.join(WEATHER_RAW)} FROM temp_weather;
+        """).fetchone()[0]
+    finally:
+        con.unregister('temp_weather')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch first-pitch weather for games into raw.weather.")
+    parser.add_argument('--seasons', type=int, nargs='+', default=None, help="Seasons to enrich (default: all).")
+    parser.add_argument('--date', type=date.fromisoformat, default=None, help="Only this slate's games.")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent requests.")
+    args = parser.parse_args()
+    con = duckdb.connect(database=DEFAULT_DATABASE, read_only=False)
+    try:
+        bootstrap(con)
+        print(f"Wrote weather for {update_weather(con, args.seasons, args.date, args.workers)} games.")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# tests/bench/bench_execute_query.py: Time and peak memory of each BaseballSDK.execute_query format
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+FORMATS = ('pandas', 'arrow', 'polars', 'batches')
+
+
+def build(database: str, rows: int) -> None:
+    """Write a feature-scan-shaped table of `rows` rows to a fresh database."""
+    import duckdb
+    con = duckdb.connect(database)
+    con.execute(f"""
+        CREATE TABLE scan AS
+        SELECT range AS player_id, 2000 + range % 25 AS season, 'Player ' || range AS player_name,
+            random() AS avg, random() AS obp, random() AS slg, random() AS ops, (random() * 50)::INTEGER AS hr
+        FROM range({rows});
+    """)
+    con.close()
+
+
+def measure(database: str, format: str, batch_size: int) -> None:
+    """Run one format in this process and print rows, seconds and peak RSS growth in MB."""
+    from pipeline.db import sdk
+    sdk.init(database, read_only=True, pool_size=1)
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = sdk.BaseballSDK.execute_query("SELECT * FROM scan", format=format, batch_size=batch_size)
+    if format == 'batches':
+        # Consume the stream the way a training loop would: one batch resident at a time
+        rows = sum(batch.num_rows for batch in result)
+    else:
+        rows = len(result)
+    seconds = time.perf_counter() - start
+    peak_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) / 1024
+    print(f"{format:<10}{rows:>12}{seconds:>10.2f}{peak_mb:>12.1f}")
+    sdk.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare execute_query result formats.")
+    parser.add_argument('--rows', type=int, default=5_000_000, help="Rows in the scanned table.")
+    parser.add_argument('--batch-size', type=int, default=100_000, help="Rows per streamed record batch.")
+    parser.add_argument('--measure', choices=FORMATS, help=argparse.SUPPRESS)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.database, args.measure, args.batch_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'bench.duckdb')
+        build(database, args.rows)
+        print(f"{'format':<10}{'rows':>12}{'seconds':>10}{'peak MB':>12}")
+        # A fresh interpreter per format keeps peak-RSS readings independent
+        for format in FORMATS:
+            subprocess.run([sys.executable, '-m', 'tests.bench.bench_execute_query', '--measure', format,
+                            '--database', database, '--batch-size', str(args.batch_size)], check=False)
+
+
+if __name__ == "__main__":
+    main()
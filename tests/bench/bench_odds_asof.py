@@ -0,0 +1,42 @@
+# tests/bench/bench_odds_asof.py: Point-in-time line lookups over a large snapshot history
+
+import argparse
+import time
+from datetime import datetime
+
+import duckdb
+from pipeline.db import lines
+from pipeline.db.schema import bootstrap
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ASOF line lookups.")
+    parser.add_argument('--snapshots', type=int, default=5_000_000, help="Snapshot rows to generate.")
+    parser.add_argument('--games', type=int, default=2430, help="Distinct games (one regular season).")
+    args = parser.parse_args()
+
+    con = duckdb.connect()
+    bootstrap(con)
+    start = time.perf_counter()
+    # Polls spread over a season, appended in capture order like the live poller
+    con.execute(f"""
+        INSERT INTO raw.odds_snapshots
+        SELECT 'G' || lpad((i % {args.games})::VARCHAR, 5, '0'), 'book' || (i // {args.games} % 8), 'moneyline',
+            TIMESTAMP '2024-03-28' + INTERVAL (i * 3) SECOND, NULL,
+            -100 - (hash(i) % 100)::SMALLINT, 100 + (hash(i + 1) % 100)::SMALLINT
+        FROM range({args.snapshots}) t(i);
+    """)
+    print(f"generated {args.snapshots} snapshots in {time.perf_counter() - start:.1f}s")
+    as_of = datetime(2024, 6, 1)
+
+    for label, games in [('one slate (15 games)', 15), (f'full season ({args.games} games)', args.games)]:
+        game_ids = [f'G{i:05}' for i in range(games)]
+        lines.lines_as_of(con, game_ids, as_of)
+        start = time.perf_counter()
+        result = lines.lines_as_of(con, game_ids, as_of)
+        print(f"{label:<28}{len(result):>8} lines{(time.perf_counter() - start) * 1000:>10.1f}ms")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
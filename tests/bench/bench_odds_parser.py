@@ -0,0 +1,77 @@
+# tests/bench/bench_odds_parser.py: Streaming odds-page parser against the notebook's BeautifulSoup approach
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from pipeline.db import odds
+from pipeline.db.teams import TEAM_NAMES
+
+NAMES = sorted(set(TEAM_NAMES) - {'Cleveland Indians', 'Los Angeles Angels of Anaheim', 'Athletics',
+                                   'St.Louis Cardinals'})
+
+
+def synthetic_page(days: int, games_per_day: int, seed: int) -> str:
+    """Build a results page in the saved-page layout: a date header row followed by that day's games."""
+    rng = random.Random(seed)
+    rows = []
+    for day in range(days, 0, -1):
+        rows.append(f'<tr class="table-dummyrow"><th colspan="6">{day % 28 + 1} Aug 2024</th></tr>')
+        for _ in range(games_per_day):
+            home, away = rng.sample(NAMES, 2)
+            rows.append(
+                f'<tr><td>{rng.randint(12, 22)}:{rng.choice(["05", "10", "40"])}</td>'
+                f'<td>{home} {rng.randint(0, 9)}&ndash;{rng.randint(0, 9)} {away}</td>'
+                f'<td>{rng.choice(["-", "+"])}{rng.randint(100, 250)}</td><td>+{rng.randint(100, 250)}</td>'
+                f'<td>{rng.choice([7.5, 8, 8.5, 9])}</td><td>{rng.randint(5, 15)}</td></tr>'
+            )
+    return f'<html><body><table class="table-main">{"".join(rows)}</table></body></html>'
+
+
+def soup_parse(path: str) -> int:
+    """The notebook's approach: full tree, then find_previous for every row's date header."""
+    from bs4 import BeautifulSoup
+    with open(path) as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+    rows = 0
+    for row in soup.find_all('tr'):
+        if len(row.find_all('td')) >= 4:
+            row.find_previous('tr', class_='table-dummyrow')
+            rows += 1
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark odds-page parsing.")
+    parser.add_argument('--pages', type=int, default=1000, help="Synthetic pages to parse.")
+    parser.add_argument('--days', type=int, default=30, help="Date headers per page.")
+    parser.add_argument('--games', type=int, default=15, help="Games per date.")
+    parser.add_argument('--workers', type=int, default=None, help="Parser processes.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.pages):
+            paths.append(os.path.join(tmp, f'page-{i:05}.html'))
+            with open(paths[-1], 'w') as f:
+                f.write(synthetic_page(args.days, args.games, seed=i))
+
+        start = time.perf_counter()
+        rows = sum(len(odds.parse_page(path)) for path in paths[:20])
+        print(f"{'streaming, 20 pages':<28}{rows:>10} rows{time.perf_counter() - start:>10.2f}s")
+        try:
+            start = time.perf_counter()
+            rows = sum(soup_parse(path) for path in paths[:20])
+            print(f"{'beautifulsoup, 20 pages':<28}{rows:>10} rows{time.perf_counter() - start:>10.2f}s")
+        except ImportError:
+            print("beautifulsoup4 not installed; skipping the baseline")
+
+        start = time.perf_counter()
+        frame = odds.parse_pages(paths, args.workers)
+        print(f"{f'streaming + typing, {len(paths)} pages':<28}{len(frame):>10} rows{time.perf_counter() - start:>10.2f}s")
+
+
+if __name__ == "__main__":
+    main()
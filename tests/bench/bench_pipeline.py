@@ -0,0 +1,51 @@
+# tests/bench/bench_pipeline.py: Ingestion, refresh and query timings over a synthetic league, no network needed
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time load, refresh and queries on a generated league.")
+    parser.add_argument('--teams', type=int, default=30, help="Teams in the league (even; up to 300).")
+    parser.add_argument('--seasons', type=int, default=3, help="Seasons to load, ending in 2024.")
+    parser.add_argument('--games', type=int, default=162, help="Games per team per season.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic league.")
+    args = parser.parse_args()
+
+    import duckdb
+    from pipeline.db import fetch, loader, refresh, rolling
+    from pipeline.db.offline import SyntheticLeague
+
+    seasons = list(range(2025 - args.seasons, 2025))
+    league = SyntheticLeague(teams=args.teams, seasons=seasons, games=args.games, seed=args.seed)
+    fetch.set_backend(league)
+    start = time.perf_counter()
+    for season in seasons:
+        league._season(season)
+    print(f"{'generate':<24}{time.perf_counter() - start:>10.2f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        con = duckdb.connect(os.path.join(directory, 'baseball.duckdb'))
+
+        def timed(name, step):
+            start = time.perf_counter()
+            result = step()
+            print(f"{name:<24}{time.perf_counter() - start:>10.2f}s")
+            return result
+
+        # load prints its own per-table report
+        timed('load', lambda: loader.load(seasons, con, teams=league.teams, min_interval=0))
+        timed('refresh (nothing dirty)', lambda: refresh.refresh(con))
+        timed('refresh (full)', lambda: refresh.refresh(con, full=True))
+        timed('team rolling (full)', lambda: rolling.update_team_rolling(con, full=True))
+        timed('reload last season', lambda: loader.load(seasons[-1:], con, teams=league.teams, min_interval=0))
+        timed('game features', lambda: rolling.game_features(con, format='arrow'))
+        timed('team form', lambda: rolling.team_form(con, f'{seasons[-1]}-07-01'))
+        timed('player features', lambda: con.execute("SELECT * FROM features.player_features").arrow())
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# tests/bench/bench_scoring.py: Latency of scoring a slate game by game versus in one batched call
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-game and batched slate scoring.")
+    parser.add_argument('--games', type=int, default=15, help="Games on the slate.")
+    parser.add_argument('--rounds', type=int, default=100, help="Boosting rounds of the synthetic model.")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed repetitions per method.")
+    args = parser.parse_args()
+
+    import numpy as np
+    import pandas as pd
+    import xgboost as xgb
+    from pipeline.db.scoring import FEATURES, SlateScorer
+
+    rng = np.random.default_rng(0)
+    train = pd.DataFrame(rng.normal(size=(5000, len(FEATURES))), columns=FEATURES)
+    booster = xgb.train({'objective': 'binary:logistic', 'max_depth': 4},
+                        xgb.DMatrix(train, label=rng.integers(0, 2, 5000)), num_boost_round=args.rounds)
+    scorer = SlateScorer(booster)
+    slate = pd.DataFrame(rng.normal(size=(args.games, len(FEATURES))), columns=FEATURES)
+    matrix = pd.DataFrame(rng.normal(size=(30 * 29, len(FEATURES))), columns=FEATURES)
+
+    def per_game():
+        # The notebook's pattern: a one-row frame and a fresh DMatrix for every matchup
+        return [booster.predict(xgb.DMatrix(slate.iloc[[i]]))[0] for i in range(len(slate))]
+
+    methods = {
+        'per game': per_game,
+        'batched slate': lambda: scorer.predict(slate),
+        'batched 30x29': lambda: scorer.predict(matrix),
+    }
+    print(f"{'method':<16}{'ms per call':>12}")
+    for name, method in methods.items():
+        method()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            method()
+        print(f"{name:<16}{(time.perf_counter() - start) / args.repeat * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# tests/bench/bench_trace.py: Per-call cost of the tracing hooks, disabled and enabled
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure tracing overhead on a no-op call and a small query.")
+    parser.add_argument('--calls', type=int, default=200_000, help="No-op calls per measurement.")
+    parser.add_argument('--queries', type=int, default=2_000, help="Queries per measurement.")
+    args = parser.parse_args()
+
+    import duckdb
+    from pipeline.db import trace
+
+    def noop(x):
+        return x
+
+    traced_noop = trace.traced('sdk')(noop)
+    con = duckdb.connect()
+    con.execute("CREATE TABLE t AS SELECT range AS x FROM range(100)")
+
+    def per_call(fn, n):
+        start = time.perf_counter()
+        for i in range(n):
+            fn(i)
+        return (time.perf_counter() - start) / n * 1e6
+
+    def query(_):
+        return trace.connection(con).execute("SELECT SUM(x) FROM t").fetchone()
+
+    print(f"{'case':<28}{'us per call':>12}")
+    for state in ('disabled', 'enabled'):
+        trace.enable() if state == 'enabled' else trace.disable()
+        print(f"{'plain no-op':<28}{per_call(noop, args.calls):>12.3f}")
+        print(f"{'traced no-op, ' + state:<28}{per_call(traced_noop, args.calls):>12.3f}")
+        print(f"{'query, ' + state:<28}{per_call(query, args.queries):>12.3f}")
+        trace.clear()
+    trace.disable()
+
+
+if __name__ == "__main__":
+    main()
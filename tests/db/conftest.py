@@ -0,0 +1,65 @@
+import os
+from datetime import date, timedelta
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+from pipeline.db import fetch
+from pipeline.db.offline import Replay, SyntheticLeague
+from pipeline.db.refresh import mark_dirty
+from pipeline.db.schema import bootstrap
+
+# Hand-made pybaseball responses (built by fixtures/make_pybaseball.py, not recorded): LAD and NYY schedules and
+# team totals plus five players' batting and pitching lines, different in 2023 and 2024
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'pybaseball')
+
+@pytest.fixture
+def offline():
+    """Fixture answering every pybaseball fetch from the hand-made responses in fixtures/pybaseball."""
+    previous = fetch.set_backend(Replay(FIXTURES))
+    yield
+    fetch.set_backend(previous)
+
+@pytest.fixture
+def synthetic():
+    """Fixture answering every pybaseball fetch from a small deterministic synthetic league."""
+    league = SyntheticLeague(teams=6, seasons=(2024,), games=30, players=4)
+    previous = fetch.set_backend(league)
+    yield league
+    fetch.set_backend(previous)
+
+@pytest.fixture
+def con():
+    """Fixture providing a bootstrapped in-memory database."""
+    con = duckdb.connect()
+    bootstrap(con)
+    yield con
+    con.close()
+
+# Teams of fake_games
+FAKE_TEAMS = ['ATL', 'LAD', 'NYM', 'NYY']
+
+def fake_games(seasons=(2023, 2024), days=60, unplayed_from=50):
+    """Two games a day between random pairings, the last days of the final season still unplayed."""
+    rng = np.random.default_rng(3)
+    rows = []
+    for season in seasons:
+        for day in range(days):
+            game_date = date(season, 4, 1) + timedelta(days=day)
+            home, away, home2, away2 = rng.permutation(FAKE_TEAMS)
+            played = season != seasons[-1] or day < unplayed_from
+            for h, a in ((home, away), (home2, away2)):
+                runs = rng.integers(0, 10, 2) if played else (None, None)
+                if played and runs[0] == runs[1]:
+                    runs[0] += 1
+                rows.append((f"{h}{game_date:%Y%m%d}0", season, game_date, 0, h, a, runs[0], runs[1], None, 'N'))
+    return pd.DataFrame(rows, columns=['game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+                                       'home_runs', 'away_runs', 'innings', 'day_night'])
+
+def insert(con, games):
+    """Upsert a frame in raw.games' column order into raw.games and mark its team-seasons dirty."""
+    con.register('temp_games', games)
+    con.execute("INSERT OR REPLACE INTO raw.games SELECT * FROM temp_games")
+    mark_dirty(con, 'raw.games', 'temp_games')
+    con.unregister('temp_games')
@@ -0,0 +1,120 @@
+# tests/db/fixtures/make_pybaseball.py: Build the hand-made pybaseball responses under fixtures/pybaseball
+#
+# Run from the repository root: PYTHONPATH=. python tests/db/fixtures/make_pybaseball.py
+# The frames follow pybaseball's column names and types; the numbers are close to the real seasons but
+# are not a recording. Each season differs from the other, so a query mixing up seasons shows in the tests.
+
+import os
+import shutil
+
+import pandas as pd
+from pipeline.db.cache import write_parquet
+from pipeline.db.offline import _response_path
+
+DIRECTORY = os.path.join(os.path.dirname(__file__), 'pybaseball')
+
+TEAM_BATTING = ['Team', 'G', 'AB', 'R', 'H', 'HR', 'RBI', 'SB', 'OBP', 'SLG']
+TEAM_PITCHING = ['Team', 'W', 'L', 'ERA', 'IP', 'SO', 'WHIP', 'FIP']
+BATTING = ['IDfg', 'Name', 'Team', 'Age', 'G', 'PA', 'AB', 'R', 'H', '2B', '3B', 'HR', 'RBI', 'SB', 'CS',
+           'BB', 'SO', 'HBP', 'AVG', 'OBP', 'SLG', 'OPS']
+PITCHING = ['IDfg', 'Name', 'Team', 'Age', 'W', 'L', 'ERA', 'G', 'GS', 'IP', 'H', 'R', 'ER', 'BB', 'SO', 'WHIP']
+SCHEDULE = ['Date', 'Tm', 'Opp', 'Home_Away', 'W/L', 'R', 'RA', 'Inn', 'GB', 'D/N']
+REGISTER = ['name_last', 'name_first', 'key_mlbam', 'key_retro', 'key_bbref', 'key_fangraphs',
+            'mlb_played_first', 'mlb_played_last']
+
+RESPONSES = {
+    2023: {
+        'team_batting': [
+            ('LAD', 162, 5524, 906, 1399, 249, 877, 105, 0.340, 0.455),
+            ('NYY', 162, 5438, 673, 1225, 219, 644, 100, 0.304, 0.402),
+        ],
+        'team_pitching': [
+            ('LAD', 100, 62, 4.06, 1446.2, 1432, 1.22, 4.25),
+            ('NYY', 82, 80, 3.97, 1445.0, 1459, 1.25, 4.29),
+        ],
+        # AVG comes back as a string from some leaderboards
+        'batting_stats': [
+            (10155, 'Mike Trout', 'LAA', 31, 82, 362, 308, 54, 81, 14, 1, 18, 44, 2, 0, 45, 104, 5, '.263', 0.367, 0.490, 0.858),
+            (19755, 'Shohei Ohtani', 'LAA', 28, 135, 599, 497, 102, 151, 26, 8, 44, 95, 20, 6, 91, 143, 3, '.304', 0.412, 0.654, 1.066),
+            (15640, 'Aaron Judge', 'NYY', 31, 106, 458, 367, 79, 98, 16, 0, 37, 75, 3, 0, 88, 130, 0, '.267', 0.406, 0.613, 1.019),
+        ],
+        'pitching_stats': [
+            (19755, 'Shohei Ohtani', 'LAA', 28, 10, 5, 3.14, 23, 23, 132.0, 85, 50, 46, 55, 167, 1.06),
+            (13125, 'Gerrit Cole', 'NYY', 32, 15, 4, 2.63, 33, 33, 209.0, 157, 68, 61, 48, 222, 0.98),
+            (2036, 'Clayton Kershaw', 'LAD', 35, 13, 5, 2.46, 24, 24, 131.2, 100, 40, 36, 40, 137, 1.06),
+        ],
+        # A three-game series at LAD, all played
+        'schedule_and_record': {
+            'LAD': [
+                ('Friday, Jun 2', 'LAD', 'NYY', 'Home', 'W', 8.0, 4.0, 9.0, '1.0', 'N'),
+                ('Saturday, Jun 3', 'LAD', 'NYY', 'Home', 'L', 3.0, 6.0, 9.0, '1.0', 'N'),
+                ('Sunday, Jun 4', 'LAD', 'NYY', 'Home', 'L', 1.0, 4.0, 10.0, '2.0', 'D'),
+            ],
+            'NYY': [
+                ('Friday, Jun 2', 'NYY', 'LAD', '@', 'L', 4.0, 8.0, 9.0, '5.0', 'N'),
+                ('Saturday, Jun 3', 'NYY', 'LAD', '@', 'W', 6.0, 3.0, 9.0, '4.0', 'N'),
+                ('Sunday, Jun 4', 'NYY', 'LAD', '@', 'W', 4.0, 1.0, 10.0, '3.0', 'D'),
+            ],
+        },
+    },
+    2024: {
+        'team_batting': [
+            ('LAD', 162, 5500, 842, 1400, 233, 800, 136, 0.335, 0.446),
+            ('NYY', 162, 5400, 815, 1350, 237, 780, 88, 0.331, 0.438),
+        ],
+        'team_pitching': [
+            ('LAD', 98, 64, 3.90, 1450.0, 1500, 1.20, 3.95),
+            ('NYY', 94, 68, 3.74, 1440.0, 1450, 1.19, 3.90),
+        ],
+        'batting_stats': [
+            (10155, 'Mike Trout', 'LAA', 32, 29, 126, 100, 17, 22, 3, 1, 10, 14, 6, 0, 18, 29, 2, '.220', 0.325, 0.541, 0.866),
+            (19755, 'Shohei Ohtani', 'LAD', 29, 159, 731, 636, 134, 197, 38, 7, 54, 130, 59, 4, 81, 162, 6, '.310', 0.390, 0.646, 1.036),
+            (15640, 'Aaron Judge', 'NYY', 32, 158, 704, 559, 122, 180, 36, 1, 58, 144, 10, 0, 133, 171, 9, '.322', 0.458, 0.701, 1.159),
+        ],
+        # Ohtani did not pitch in 2024
+        'pitching_stats': [
+            (13125, 'Gerrit Cole', 'NYY', 33, 8, 5, 3.41, 17, 17, 95.0, 77, 38, 36, 27, 99, 1.09),
+            (2036, 'Clayton Kershaw', 'LAD', 36, 2, 2, 4.50, 7, 7, 30.0, 31, 16, 15, 13, 24, 1.47),
+        ],
+        # Four games: one at LAD, a doubleheader at NYY (the nightcap in extras) and an unplayed game at LAD
+        'schedule_and_record': {
+            'LAD': [
+                ('Thursday, Mar 28', 'LAD', 'NYY', 'Home', 'W', 5.0, 3.0, 9.0, 'Tied', 'N'),
+                ('Saturday, Jun 8 (1)', 'LAD', 'NYY', '@', 'L', 2.0, 6.0, 9.0, '1.0', 'D'),
+                ('Saturday, Jun 8 (2)', 'LAD', 'NYY', '@', 'W', 4.0, 1.0, 11.0, 'up 1.0', 'N'),
+                ('Sunday, Sep 29', 'LAD', 'NYY', 'Home', None, None, None, 9.0, None, 'N'),
+            ],
+            'NYY': [
+                ('Thursday, Mar 28', 'NYY', 'LAD', '@', 'L', 3.0, 5.0, 9.0, 'Tied', 'N'),
+                ('Saturday, Jun 8 (1)', 'NYY', 'LAD', 'Home', 'W', 6.0, 2.0, 9.0, '1.0', 'D'),
+                ('Saturday, Jun 8 (2)', 'NYY', 'LAD', 'Home', 'L', 1.0, 4.0, 11.0, 'up 1.0', 'N'),
+                ('Sunday, Sep 29', 'NYY', 'LAD', '@', None, None, None, 9.0, None, 'N'),
+            ],
+        },
+    },
+}
+
+CHADWICK_REGISTER = [
+    ('Trout', 'Mike', 545361, 'troum001', 'troutmi01', 10155, 2011, 2024),
+    ('Ohtani', 'Shohei', 660271, 'ohtas001', 'ohtansh01', 19755, 2018, 2024),
+    ('Judge', 'Aaron', 592450, 'judga001', 'judgeaa01', 15640, 2016, 2024),
+    ('Cole', 'Gerrit', 543037, 'coleg001', 'colege01', 13125, 2013, 2024),
+    ('Kershaw', 'Clayton', 477132, 'kersc001', 'kershcl01', 2036, 2008, 2024),
+]
+
+
+def main():
+    shutil.rmtree(DIRECTORY, ignore_errors=True)
+    columns = {'team_batting': TEAM_BATTING, 'team_pitching': TEAM_PITCHING, 'batting_stats': BATTING,
+               'pitching_stats': PITCHING}
+    for season, responses in RESPONSES.items():
+        for name, names in columns.items():
+            write_parquet(pd.DataFrame(responses[name], columns=names), _response_path(DIRECTORY, name, (season,)))
+        for team, rows in responses['schedule_and_record'].items():
+            write_parquet(pd.DataFrame(rows, columns=SCHEDULE),
+                          _response_path(DIRECTORY, 'schedule_and_record', (season, team)))
+    write_parquet(pd.DataFrame(CHADWICK_REGISTER, columns=REGISTER), _response_path(DIRECTORY, 'chadwick_register', ()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from pipeline.db import backtest
+
+def random_bets(n=400, seed=5):
+    rng = np.random.default_rng(seed)
+    fair = rng.uniform(0.35, 0.65, n)
+    return pd.DataFrame({
+        'game_date': np.sort(rng.choice([date(2024, 4, 1) + timedelta(days=d) for d in range(60)], n)),
+        'decimal_odds': 0.96 / fair,
+        'fair_prob': fair,
+        'model_prob': np.clip(fair + rng.normal(0, 0.04, n), 0.05, 0.95),
+        'won': rng.random(n) < fair,
+        'closing_prob': np.where(rng.random(n) < 0.9, np.clip(fair + rng.normal(0, 0.02, n), 0.05, 0.95), np.nan),
+    })
+
+def loop_simulate(bets, staking, size, min_edge, max_stake):
+    """Reference bet-by-bet loop: stakes sized from the start-of-day bankroll, a day's stakes capped at that
+    bankroll, no betting once ruined."""
+    bankroll, staked, peak, drawdown = 1.0, 0.0, 1.0, 0.0
+    for _, day in bets.groupby('game_date', sort=False):
+        peak = max(peak, bankroll)
+        drawdown = max(drawdown, 1 - bankroll / peak)
+        if bankroll <= 0:
+            continue
+        day_bankroll, shares = bankroll, []
+        for bet in day.itertuples():
+            if bet.model_prob - bet.fair_prob < min_edge:
+                shares.append(0.0)
+            elif staking == 'kelly':
+                full = max(0.0, (bet.model_prob * bet.decimal_odds - 1) / (bet.decimal_odds - 1))
+                shares.append(min(size * full, max_stake))
+            else:
+                shares.append(min(size, max_stake))
+        if staking == 'kelly':
+            scale = 1 / max(sum(shares), 1.0)
+        else:
+            scale = min(1.0, day_bankroll / sum(shares)) if sum(shares) > 0 else 1.0
+        for bet, share in zip(day.itertuples(), shares):
+            stake = share * scale * (day_bankroll if staking == 'kelly' else 1.0)
+            staked += stake
+            bankroll += stake * (bet.decimal_odds - 1 if bet.won else -1)
+        bankroll = bankroll if bankroll > backtest.RUIN_BANKROLL else 0.0
+    peak = max(peak, bankroll)
+    return staked, bankroll, max(drawdown, 1 - bankroll / peak)
+
+def test_simulate_matches_bet_by_bet_loop():
+    """Test the strategies x bets simulation against a per-bet loop for every strategy of a small grid."""
+    bets = random_bets()
+    grid = backtest.strategy_grid(sizes=(0.02, 0.5), min_edges=(0.0, 0.03), max_stakes=(0.03, 1.0))
+    results = backtest.simulate(bets, grid)
+    assert len(results) == len(grid) == 16
+    for row in results.itertuples():
+        staked, final, drawdown = loop_simulate(bets, row.staking, row.size, row.min_edge, row.max_stake)
+        assert np.isclose(row.staked, staked) and np.isclose(row.final_bankroll, final)
+        assert np.isclose(row.max_drawdown, drawdown)
+    flat = results[(results['staking'] == 'flat') & (results['min_edge'] == 0.0)].iloc[0]
+    taken = bets[bets['model_prob'] >= bets['fair_prob']]
+    assert flat['bets'] == len(taken)
+    assert np.isclose(flat['clv'], np.nanmean(taken['closing_prob'] * taken['decimal_odds'] - 1))
+    with pytest.raises(ValueError):
+        backtest.strategy_grid(stakings=('martingale',))
+
+def test_ruined_strategies_stop_at_zero():
+    """Test that same-day stakes are capped at the bankroll and a ruined strategy places no later bets."""
+    # Three confident losing bets on one day, then winners that a ruined bettor can no longer back
+    bets = pd.DataFrame({
+        'game_date': [date(2024, 4, 1)] * 3 + [date(2024, 4, 2)] * 2,
+        'decimal_odds': 1.9, 'fair_prob': 0.5, 'model_prob': 0.9,
+        'won': [False, False, False, True, True], 'closing_prob': 0.5,
+    })
+    grid = backtest.strategy_grid(sizes=(0.5, 1.0), min_edges=(0.0,), max_stakes=(1.0,))
+    results = backtest.simulate(bets, grid)
+    assert (results['final_bankroll'] == 0).all() and (results['max_drawdown'] == 1).all()
+    assert (results['bets'] == 3).all()
+    for row in results.itertuples():
+        staked, final, drawdown = loop_simulate(bets, row.staking, row.size, row.min_edge, row.max_stake)
+        assert np.isclose(row.staked, staked) and np.isclose(row.final_bankroll, final)
+        assert np.isclose(row.max_drawdown, drawdown)
+
+def test_flat_stakes_are_capped_at_the_current_bankroll():
+    """Test that a flat strategy which has lost money stakes no more than it has left on a day."""
+    # 0.6 units lost on day one leaves 0.4, so day two's 0.6 unit stake is cut to 0.4 and wins 0.36
+    bets = pd.DataFrame({
+        'game_date': [date(2024, 4, 1), date(2024, 4, 2), date(2024, 4, 3)],
+        'decimal_odds': 1.9, 'fair_prob': 0.5, 'model_prob': 0.9,
+        'won': [False, True, False], 'closing_prob': 0.5,
+    })
+    grid = backtest.strategy_grid(stakings=('flat',), sizes=(0.6, 0.1), min_edges=(0.0,), max_stakes=(1.0,))
+    results = backtest.simulate(bets, grid)
+    capped = results.iloc[0]
+    assert np.isclose(capped['staked'], 0.6 + 0.4 + 0.6) and np.isclose(capped['final_bankroll'], 0.16)
+    for row in results.itertuples():
+        staked, final, drawdown = loop_simulate(bets, row.staking, row.size, row.min_edge, row.max_stake)
+        assert np.isclose(row.staked, staked) and np.isclose(row.final_bankroll, final)
+        assert np.isclose(row.max_drawdown, drawdown)
+
+def test_load_bets_reads_priced_edges(con):
+    """Test that stored edges are joined to results and closing lines, best-priced book per side."""
+    con.execute("""
+        INSERT INTO raw.games (game_id, season, game_date, game_num, home_team, away_team, home_runs, away_runs)
+        VALUES ('LAD202404010', 2024, '2024-04-01', 0, 'LAD', 'NYY', 5, 3),
+            ('NYY202404020', 2024, '2024-04-02', 0, 'NYY', 'LAD', NULL, NULL);
+        INSERT INTO raw.odds (game_id, season, game_date, moneyline_home, moneyline_away)
+        VALUES ('LAD202404010', 2024, '2024-04-01', -150, 130);
+        INSERT INTO features.market_edges (game_id, book, side, decimal_odds, fair_prob, model_prob) VALUES
+            ('LAD202404010', 'a', 'home', 1.62, 0.60, 0.64), ('LAD202404010', 'b', 'home', 1.70, 0.58, 0.64),
+            ('LAD202404010', 'a', 'away', 2.35, 0.40, 0.36), ('NYY202404020', 'a', 'home', 1.90, 0.50, 0.55);
+    """)
+    bets = backtest.load_bets(con)
+    assert list(zip(bets['book'], bets['side'], bets['won'])) == [('a', 'away', False), ('b', 'home', True)]
+    assert np.isclose(bets['closing_prob'].sum(), 1.0)
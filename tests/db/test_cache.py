@@ -0,0 +1,66 @@
+from datetime import date
+
+import pandas as pd
+from pipeline.db.cache import FrameCache, ParquetCache
+from pipeline.db.fetch import CachedBackend
+
+def test_lru_eviction():
+    """Test that the least recently used entry is dropped once the cache is full."""
+    cache = FrameCache(max_entries=2, ttl_seconds=None)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None, "Least recently used entry should have been evicted."
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+def test_ttl_expiry():
+    """Test that entries older than the TTL are treated as misses."""
+    cache = FrameCache(max_entries=2, ttl_seconds=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None, "Expired entry should not be returned."
+
+def test_get_or_load_calls_loader_once():
+    """Test that repeated lookups reuse the loaded value instead of reloading."""
+    cache = FrameCache()
+    calls = []
+    for _ in range(3):
+        value = cache.get_or_load(('batting', 2024), lambda: calls.append(1) or 'frame')
+    assert value == 'frame'
+    assert len(calls) == 1, f"Loader should run once; ran {len(calls)} times."
+
+def test_parquet_cache_survives_restarts_and_evicts_by_size(tmp_path):
+    """Test that stored frames reload in a new instance, expire by TTL and are evicted least recently read first."""
+    frame = pd.DataFrame({'team': ['LAD', 'NYY'] * 500, 'runs': range(1000)})
+    cache = ParquetCache(str(tmp_path))
+    cache.put('team_batting', '2023', frame)
+    cache.put('team_batting', '2024', frame)
+    size = cache.stats()['bytes'] // 2
+
+    warm = ParquetCache(str(tmp_path), max_bytes=int(size * 2.5))
+    pd.testing.assert_frame_equal(warm.get('team_batting', '2023'), frame)
+    assert warm.get('team_batting', '2024', ttl_seconds=0) is None
+    warm.put('team_batting', '2025', frame)
+    assert warm.get('team_batting', '2024') is None, "Least recently read entry should have been evicted."
+    assert warm.get('team_batting', '2023') is not None
+    assert warm.stats() == {'hits': 2, 'misses': 2, 'expired': 1, 'evictions': 1, 'entries': 2, 'bytes': 2 * size}
+
+def test_cached_backend_never_expires_closed_seasons(tmp_path):
+    """Test that past seasons are served from disk forever while the current season refetches after its TTL."""
+    calls = []
+
+    class Backend:
+        def team_batting(self, season):
+            calls.append(season)
+            return pd.DataFrame({'Team': ['LAD'], 'R': [842]})
+
+    def backend():
+        return CachedBackend(Backend(), ParquetCache(str(tmp_path)), ttls={'team_batting': 0},
+                             today=lambda: date(2024, 7, 1))
+    first = backend()
+    first.team_batting(2023), first.team_batting(2024)
+    restarted = backend()
+    assert restarted.team_batting(2023)['R'].tolist() == [842]
+    restarted.team_batting(2024)
+    assert calls == [2023, 2024, 2024]
+    assert restarted.cache.stats()['hits'] == 1
@@ -0,0 +1,37 @@
+import glob
+import os
+
+import duckdb
+import pyarrow.dataset as ds
+from pipeline.db import export, loader
+
+def test_snapshot_roundtrip_prunes_partitions(offline, tmp_path):
+    """Test that an export attaches lazily with season pruning and restores into an equal database."""
+    con = duckdb.connect()
+    loader.load([2023, 2024], con, teams=('LAD', 'NYY'), min_interval=0)
+    snapshot = str(tmp_path / 'snapshot')
+    manifest = export.export_parquet(con, snapshot)
+    assert manifest['tables']['raw.games']['partitions'] == {'2023': 3, '2024': 4}
+    assert manifest['tables']['raw.player_register']['partition_by'] is None
+
+    research = duckdb.connect()
+    export.attach_parquet(research, snapshot)
+    expected = con.execute("SELECT * FROM raw.games ORDER BY game_id").fetchdf()
+    assert research.execute("SELECT * FROM raw.games ORDER BY game_id").fetchdf().equals(expected)
+    assert manifest['tables']['raw.pybaseball_player_pitching']['partitions'] == {'2023': 3, '2024': 2}
+    # A damaged 2024 partition is never opened by a 2023 query
+    for path in glob.glob(os.path.join(snapshot, 'raw', 'games', 'season=2024', '*.parquet')):
+        with open(path, 'wb') as f:
+            f.write(b'not parquet')
+    assert research.execute("SELECT COUNT(*) FROM raw.games WHERE season = 2023").fetchone()[0] == 3
+    table = export.dataset(snapshot, 'raw.pybaseball_team_batting').to_table(filter=ds.field('season') == 2024)
+    assert table.num_rows == 2
+
+    export.export_parquet(con, snapshot, tables=['raw.games'], seasons=[2024])
+    restored = duckdb.connect()
+    written = export.restore_parquet(restored, snapshot)
+    assert written['raw.games'] == 7 and written['raw.pybaseball_player_pitching'] == 5
+    for table in ('features.team_features', 'features.team_rolling', 'features.player_features',
+                  'processed.pybaseball_player_pitching'):
+        query = f"SELECT * FROM {table} ORDER BY ALL"
+        assert restored.execute(query).fetchdf().equals(con.execute(query).fetchdf()), table
@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from pipeline.db import futures
+from pipeline.db.teams import DIVISIONS, TEAMS
+from tests.db.conftest import insert
+
+@pytest.fixture
+def con(con):
+    """Fixture adding a 60-day round-robin-ish season, played through April, to the bootstrapped database."""
+    rng = np.random.default_rng(11)
+    rows = []
+    for day in range(60):
+        game_date = date(2024, 4, 1) + timedelta(days=day)
+        order = rng.permutation(TEAMS)
+        for home, away in zip(order[::2], order[1::2]):
+            played = game_date < date(2024, 5, 1)
+            runs = (int(rng.integers(0, 9)), int(rng.integers(0, 9))) if played else (None, None)
+            if played and runs[0] == runs[1]:
+                runs = (runs[0] + 1, runs[1])
+            rows.append((f"{home}{game_date:%Y%m%d}0", 2024, game_date, 0, home, away, *runs, None, 'N'))
+    games = pd.DataFrame(rows, columns=['game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+                                        'home_runs', 'away_runs', 'innings', 'day_night'])
+    insert(con, games)
+    return con
+
+def test_series_probability():
+    """Test best-of-n series odds against their closed forms."""
+    p = np.array([0.5, 0.6])
+    assert np.allclose(futures.series_probability(p, 1), p)
+    assert np.allclose(futures.series_probability(p, 3), p ** 2 * (3 - 2 * p))
+
+def test_simulated_probabilities_are_consistent(con):
+    """Test that every simulated season seeds six teams per league and crowns one champion."""
+    results = futures.simulate_season(con, 2024, simulations=4000, max_workers=1, seed=1)
+    assert np.isclose(results['title'].sum(), 1) and np.isclose(results['pennant'].sum(), 2)
+    assert np.isclose(results['playoffs'].sum(), 12) and np.isclose(results['bye'].sum(), 4)
+    for teams in DIVISIONS.values():
+        assert np.isclose(results.loc[results['team'].isin(teams), 'division'].sum(), 1)
+    assert (results['title'] <= results['pennant']).all() and (results['bye'] <= results['division']).all()
+    # Every team plays 60 games; the simulated totals add the 30 played ones to the 30 remaining
+    assert np.isclose(results['mean_wins'].sum(), 15 * 60)
+    assert con.execute("SELECT COUNT(*) FROM features.season_simulations").fetchone()[0] == len(TEAMS)
+
+def test_model_probabilities_drive_the_simulation(con):
+    """Test that certain model wins for one team make it a division winner every time, also across processes."""
+    _, remaining = futures.season_state(con, 2024, date(2024, 4, 15))
+    probs = remaining[['game_id']].assign(home_prob=np.where(remaining['home_team'] == 'LAD', 1.0,
+                                                            np.where(remaining['away_team'] == 'LAD', 0.0, 0.5)))
+    results = futures.simulate_season(con, 2024, as_of=date(2024, 4, 15), probs=probs, simulations=10_000,
+                                      max_workers=2, seed=2)
+    lad = results.set_index('team').loc['LAD']
+    assert lad['mean_wins'] >= 45 and lad['division'] > 0.99
+
+def test_ties_go_to_head_to_head_then_intradivision_record(con):
+    """Test that division ties are settled by the games between the tied teams, then by intradivision record."""
+    # NYY and BOS finish 2-1 up on each other's 2 wins; CLE (1-0 in its division) and KCR (1-0 outside it) level
+    results = [('NYY', 'BOS', 1), ('NYY', 'BOS', 1), ('BOS', 'NYY', 1), ('BOS', 'TOR', 1),
+               ('CLE', 'DET', 1), ('KCR', 'HOU', 1)]
+    insert(con, pd.DataFrame([(f"{home}2023060{i}0", 2023, date(2023, 6, i + 1), 0, home, away, 5, 3, 9, 'N')
+                              for i, (home, away, _) in enumerate(results)],
+                             columns=['game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+                                      'home_runs', 'away_runs', 'innings', 'day_night']))
+    assert futures.head_to_head(con, 2023)[TEAMS.index('NYY'), TEAMS.index('BOS')] == 2
+    results = futures.simulate_season(con, 2023, simulations=2000, max_workers=1, seed=3).set_index('team')
+    assert results.loc['NYY', 'division'] == 1 and results.loc['BOS', 'wild_card'] == 1
+    assert results.loc['CLE', 'division'] == 1 and results.loc['KCR', 'division'] == 0
+
+def test_athletics_listed_as_ath_count_as_the_franchise(con):
+    """Test that games stored under the Athletics' 2025 code are simulated as OAK rather than rejected."""
+    insert(con, pd.DataFrame([('ATH202506010', 2025, date(2025, 6, 1), 0, 'ATH', 'SEA', 5, 3, 9, 'N'),
+                              ('ATH202509010', 2025, date(2025, 9, 1), 0, 'ATH', 'SEA', None, None, None, 'N')],
+                             columns=['game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+                                      'home_runs', 'away_runs', 'innings', 'day_night']))
+    standings, remaining = futures.season_state(con, 2025)
+    assert standings.set_index('team').loc['OAK', 'wins'] == 1 and list(remaining['home_team']) == ['OAK']
+    results = futures.simulate_season(con, 2025, simulations=1000, max_workers=1, seed=4).set_index('team')
+    assert 1 <= results.loc['OAK', 'mean_wins'] <= 2
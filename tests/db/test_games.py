@@ -0,0 +1,41 @@
+from pipeline.db import fetch
+from pipeline.db.games import fetch_schedules, normalize_games
+from pipeline.db.offline import Replay
+from tests.db.conftest import FIXTURES
+import pandas as pd
+
+def test_normalize_games_one_row_per_game():
+    """Test that home and away schedule rows collapse onto a single home-team game row."""
+    responses = Replay(FIXTURES)
+    schedules = pd.concat([responses.schedule_and_record(2024, team) for team in ('LAD', 'NYY')]).assign(season=2024)
+    games = normalize_games(schedules)
+    assert list(games['game_id']) == ['LAD202403280', 'NYY202406081', 'NYY202406082', 'LAD202409290']
+    opener = games.iloc[0]
+    assert (opener['home_team'], opener['away_team'], opener['home_runs'], opener['away_runs']) == ('LAD', 'NYY', 5, 3)
+    nightcap = games.iloc[2]
+    assert (nightcap['home_runs'], nightcap['away_runs'], nightcap['innings']) == (1, 4, 11)
+    assert pd.isna(games.iloc[3]['home_runs']) and pd.isna(games.iloc[3]['innings']), "Unplayed game should have no result."
+
+def test_schedules_use_each_season_code_and_store_the_franchise():
+    """Test that the Athletics are fetched as 'ATH' from 2025 and stored as 'OAK' on both sides of a game."""
+    requested = []
+
+    class Listings:
+        def schedule_and_record(self, season, team):
+            requested.append((season, team))
+            if team == 'OAK' and season >= 2025:
+                raise ValueError("Baseball-Reference has no OAK page for this season")
+            row = (('SEA', 'Home', 'W', 5.0, 3.0) if team != 'SEA' else
+                   ('ATH' if season >= 2025 else 'OAK', '@', 'L', 3.0, 5.0))
+            return pd.DataFrame([('Friday, Jun 6', team, *row, 9.0, '1.0', 'N')],
+                                columns=['Date', 'Tm', 'Opp', 'Home_Away', 'W/L', 'R', 'RA', 'Inn', 'GB', 'D/N'])
+
+    previous = fetch.set_backend(Listings())
+    try:
+        schedules = fetch_schedules([2024, 2025], teams=('OAK', 'SEA'), max_workers=1, min_interval=0)
+    finally:
+        fetch.set_backend(previous)
+    assert sorted(requested) == [(2024, 'OAK'), (2024, 'SEA'), (2025, 'ATH'), (2025, 'SEA')]
+    assert set(schedules['Tm']) | set(schedules['Opp']) == {'OAK', 'SEA'}
+    games = normalize_games(schedules)
+    assert list(games['game_id']) == ['OAK202406060', 'OAK202506060']
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Startup budget for the CLI entry point plus the SDK, in microseconds (measured at ~80ms; pybaseball alone is ~1s)
+IMPORT_BUDGET_US = 500_000
+# Heavy modules that must only load on code paths that fetch data or build frames
+DEFERRED = ('pybaseball', 'pandas', 'matplotlib', 'requests')
+
+def _importtime(statement: str) -> dict:
+    """Run `statement` under `python -X importtime` and return {module: (depth, cumulative_us)}."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (len(name) - len(name.lstrip()) - 1, int(cumulative))
+    return modules
+
+def test_startup_defers_heavy_imports_within_budget():
+    """Test that importing main and the SDK stays within budget and never executes pybaseball or pandas."""
+    modules = _importtime("import main, pipeline.db.sdk")
+    loaded = sorted(name for name in modules if name.split('.')[0] in DEFERRED)
+    assert not loaded, f"Imported at startup: {loaded[:10]}"
+    total = sum(cumulative for depth, cumulative in modules.values() if depth == 0)
+    assert total < IMPORT_BUDGET_US, f"Startup imports took {total / 1000:.0f}ms (budget {IMPORT_BUDGET_US / 1000:.0f}ms)"
@@ -0,0 +1,54 @@
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from pipeline.db import lines, odds
+from tests.db.test_odds import FIXTURES
+
+def test_lines_as_of_matches_latest_snapshot(con):
+    """Test the ASOF lookup against a brute-force latest-before-cutoff over a random line history."""
+    rng = np.random.default_rng(7)
+    start = datetime(2024, 9, 29, 9)
+    history = pd.DataFrame({
+        'game_id': rng.choice(['LAD202409290', 'NYY202409290', 'ATL202409281'], 3000),
+        'book': rng.choice(['draftkings', 'fanduel', 'pinnacle'], 3000),
+        'market': 'moneyline',
+        'captured_at': [start + timedelta(seconds=int(s)) for s in rng.integers(0, 36_000, 3000)],
+        'line': None,
+        'home_price': rng.integers(-200, -100, 3000),
+        'away_price': rng.integers(100, 200, 3000),
+    })
+    lines.append_snapshots(con, history)
+    assert lines.append_snapshots(con, history) == 0  # re-polled snapshots are ignored
+
+    cutoff = start + timedelta(hours=4)
+    got = lines.lines_as_of(con, ['LAD202409290', 'NYY202409290', 'SEA202409290'], cutoff)
+    stored = con.execute("SELECT * FROM raw.odds_snapshots").fetchdf()
+    expected = (stored[stored['game_id'].isin(['LAD202409290', 'NYY202409290']) & (stored['captured_at'] <= cutoff)]
+                .sort_values('captured_at').groupby(['game_id', 'book']).tail(1)
+                .sort_values(['game_id', 'book']).reset_index(drop=True))
+    assert len(got) == 6
+    assert got['home_price'].tolist() == expected['home_price'].tolist()
+    assert (got['captured_at'] == expected['captured_at']).all()
+    assert lines.lines_as_of(con, ['LAD202409290'], start - timedelta(days=1)).empty
+    assert len(lines.lines_as_of(con, ['LAD202409290'], cutoff, books=['pinnacle'])) == 1
+
+    # Per-game cutoffs: each game is probed at its own time
+    per_game = lines.lines_as_of(con, ['LAD202409290', 'NYY202409290'],
+                                 {'LAD202409290': cutoff, 'NYY202409290': start - timedelta(days=1)})
+    assert per_game['game_id'].unique().tolist() == ['LAD202409290']
+    assert per_game['home_price'].tolist() == expected['home_price'][:3].tolist()
+
+def test_polled_pages_append_consensus_snapshots(con):
+    """Test that ingesting a live page with a capture time records both markets as snapshots."""
+    path = os.path.join(FIXTURES, 'mlb-2024-fixtures.html')
+    odds.ingest_odds([path], con, captured_at=datetime(2024, 9, 30, 12))
+    odds.ingest_odds([path], con, captured_at=datetime(2024, 9, 30, 15))
+    assert con.execute("SELECT COUNT(*) FROM raw.odds_snapshots").fetchone()[0] == 2 * 3
+    total = lines.lines_as_of(con, ['LAD202409300'], datetime(2024, 9, 30, 13), market='total')
+    assert (total['book'].item(), float(total['line'].item())) == ('consensus', 9.0)
+    assert total['captured_at'].item() == pd.Timestamp(2024, 9, 30, 12)
+    with pytest.raises(ValueError):
+        lines.lines_as_of(con, ['LAD202409300'], datetime(2024, 9, 30), market='runline')
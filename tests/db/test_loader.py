@@ -0,0 +1,77 @@
+import duckdb
+import pandas as pd
+import pytest
+from pipeline.db import fetch, games, loader
+from pipeline.db.cache import ParquetCache
+from pipeline.db.fetch import CachedBackend, PybaseballBackend
+
+def test_load_is_idempotent_upsert(offline):
+    """Test that loading two seasons writes every table per season and that reloading replaces rather than duplicates."""
+    con = duckdb.connect()
+    reports = loader.load([2023, 2024], con=con, teams=('LAD', 'NYY'), max_workers=4, min_interval=0)
+    rows = {r.table: r.rows for r in reports}
+    assert rows['raw.pybaseball_team_batting'] == 4
+    assert rows['raw.pybaseball_player_batting'] == 3 + 3
+    assert rows['raw.pybaseball_player_pitching'] == 3 + 2
+    # Both teams' schedules collapse to one row per game, unplayed games included
+    assert rows['raw.games'] == 3 + 4
+
+    loader.load([2024], con=con, teams=('LAD', 'NYY'), max_workers=4, min_interval=0)
+    assert con.execute("SELECT COUNT(*) FROM raw.pybaseball_team_batting").fetchone()[0] == 4
+    runs = con.execute("SELECT season, r FROM raw.pybaseball_team_batting WHERE team = 'LAD' ORDER BY season").fetchall()
+    assert runs == [(2023, 906), (2024, 842)]
+    trout = con.execute("SELECT player_id, avg FROM raw.pybaseball_player_batting "
+                        "WHERE season = 2024 AND player_name = 'Mike Trout'").fetchone()
+    assert trout[0] == 545361 and float(trout[1]) == pytest.approx(0.22)
+    assert con.execute("SELECT COUNT(*) FROM features.team_features").fetchone()[0] == 4
+    # Ohtani pitched in 2023 only, so only that season's features carry his pitching
+    ohtani = con.execute("""
+        SELECT season, pitching_win_strength FROM features.player_features WHERE player_id = 660271 ORDER BY season
+    """).fetchall()
+    assert ohtani[0] == (2023, pytest.approx(100 * 10 / 15)) and ohtani[1] == (2024, None)
+    cole = con.execute("SELECT season, k_per_inning FROM processed.pybaseball_player_pitching "
+                       "WHERE player_id = 543037 ORDER BY season").fetchall()
+    assert [season for season, _ in cole] == [2023, 2024] and cole[0][1] == pytest.approx(222 / 209)
+    con.close()
+
+class Live(PybaseballBackend):
+    """The live backend's class, answering from a synthetic league instead of the network."""
+
+    def __init__(self, league):
+        self.league, self.calls = league, []
+
+    def __getattribute__(self, name):
+        if name in ('league', 'calls') or name.startswith('_'):
+            return object.__getattribute__(self, name)
+        endpoint = getattr(self.league, name)
+        return lambda *args: self.calls.append(name) or endpoint(*args)
+
+def test_warm_restart_is_served_from_cache_without_throttling(tmp_path, synthetic, monkeypatch):
+    """Test that a load answered entirely by the response cache neither fetches nor waits on the rate limiter."""
+    sleeps = []
+    monkeypatch.setattr(games.time, 'sleep', sleeps.append)
+    con = duckdb.connect()
+    cold = Live(synthetic)
+    fetch.set_backend(CachedBackend(cold, ParquetCache(str(tmp_path))))
+    loader.load([2024], con=con, teams=synthetic.teams, max_workers=2, min_interval=30)
+    assert cold.calls.count('schedule_and_record') == len(synthetic.teams) and sleeps
+
+    sleeps.clear()
+    warm = Live(synthetic)
+    fetch.set_backend(CachedBackend(warm, ParquetCache(str(tmp_path))))
+    loader.load([2024], con=con, teams=synthetic.teams, max_workers=2, min_interval=30)
+    assert warm.calls == [] and sleeps == []
+    con.close()
+
+def test_upsert_keeps_the_last_row_per_key_and_warns_on_unregistered_players(con, capsys):
+    """Test that a repeated key keeps the batch's last row and that players missing from the register are reported."""
+    con.execute("INSERT INTO raw.player_register (name_norm, key_mlbam, key_fangraphs) VALUES ('mike trout', 545361, 10155)")
+    batch = pd.DataFrame([(2024, 'LAD', 800), (2024, 'NYY', 815), (2024, 'LAD', 842)], columns=['season', 'team', 'r'])
+    assert loader.upsert(con, 'raw.pybaseball_team_batting', batch) == 2
+    assert con.execute("SELECT r FROM raw.pybaseball_team_batting WHERE team = 'LAD'").fetchone()[0] == 842
+
+    players = pd.DataFrame([(2024, None, 'Mike Trout', '10155', 20), (2024, None, 'Mike Trout', '10155', 29),
+                            (2024, None, 'Nobody', '99999', 5)], columns=['season', 'player_id', 'player_name', 'idfg', 'g'])
+    assert loader.upsert(con, 'raw.pybaseball_player_batting', players) == 1
+    assert con.execute("SELECT player_id, g FROM raw.pybaseball_player_batting").fetchall() == [(545361, 29)]
+    assert "Dropping 1 raw.pybaseball_player_batting rows" in capsys.readouterr().out
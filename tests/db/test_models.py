@@ -0,0 +1,23 @@
+import pandas as pd
+from pipeline.db.models.batting import PlayerBattingStats, TeamBattingStats
+from pipeline.db.models.pitching import PlayerPitchingStats
+
+def test_from_frame_remaps_columns_once():
+    """Test bulk hydration: aliases win over plain columns, missing fields default to 0, values are Python scalars."""
+    df = pd.DataFrame({
+        'season': [2024, 2024], 'player_id': [545361, 660670], 'player_name': ['Mike Trout', 'Ronald Acuna'],
+        'team': ['LAA', 'ATL'], '2B': [3, 5], 'hr': [10, 4], 'avg': [0.0, 0.0], 'avg_clean': [0.220, 0.250],
+        'extra': ['ignored', 'ignored'],
+    })
+    trout, acuna = PlayerBattingStats.from_frame(df)
+    assert (trout.double, trout.hr, trout.avg, trout.rbi) == (3, 10, 0.220, 0)
+    assert type(trout.hr) is int and acuna.player_name == 'Ronald Acuna'
+    assert PlayerBattingStats.from_df(df, row_idx=1) == acuna
+    assert PlayerBattingStats.from_frame(df.iloc[:0]) == []
+
+def test_models_are_slotted():
+    """Test that models carry no per-instance __dict__."""
+    team = TeamBattingStats.from_frame(pd.DataFrame({'season': [2024], 'team': ['LAD'], 'obp': [0.335]}))[0]
+    pitcher = PlayerPitchingStats.from_row({'season': 2024, 'player_name': 'Tyler Glasnow', 'era': 3.49})
+    assert team == TeamBattingStats.from_row({'season': 2024, 'team': 'LAD', 'obp': 0.335})
+    assert not hasattr(team, '__dict__') and not hasattr(pitcher, '__dict__')
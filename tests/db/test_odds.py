@@ -0,0 +1,36 @@
+import glob
+import os
+
+import duckdb
+import pandas as pd
+from pipeline.db import odds
+from pipeline.db.schema import bootstrap
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'oddsportal')
+
+def test_parse_page_carries_dates_and_types_prices():
+    """Test that date headers carry forward, prices become American odds and doubleheaders are numbered by time."""
+    rows = odds.odds_rows(odds.parse_page(os.path.join(FIXTURES, 'mlb-2024-results-1.html'))).set_index('game_id')
+    assert len(rows) == 5  # the unknown teams' row is dropped
+    lad = rows.loc['LAD202409290']
+    assert (lad['away_team'], lad['home_score'], lad['away_score']) == ('COL', 2, 6)
+    assert (lad['moneyline_home'], lad['moneyline_away'], lad['total'], lad['bookmakers']) == (-185, 160, 9.5, 12)
+    # Decimal 1.67 / 2.25 convert to -149 / +125
+    assert tuple(rows.loc['NYY202409290', ['moneyline_home', 'moneyline_away']]) == (-149, 125)
+    assert rows.loc['ATL202409281', 'moneyline_home'] == -105  # 13:05 start is game one
+    assert rows.loc['ATL202409282', 'moneyline_home'] == -120
+    assert pd.isna(rows.loc['CHW202409280', 'total'])  # '-' is NULL
+
+def test_ingest_odds_upserts():
+    """Test that a directory of pages lands in raw.odds and re-ingesting replaces rows."""
+    con = duckdb.connect()
+    bootstrap(con)
+    paths = sorted(glob.glob(os.path.join(FIXTURES, '*.html')))
+    assert odds.ingest_odds(paths, con, max_workers=2) == 7
+    assert odds.ingest_odds(paths, con, max_workers=1) == 7
+    assert con.execute("SELECT COUNT(*) FROM raw.odds").fetchone()[0] == 7
+    upcoming = con.execute("""
+        SELECT home_score, moneyline_home, moneyline_away FROM raw.odds WHERE game_id = 'OAK202409300'
+    """).fetchone()
+    assert upcoming == (None, None, None)
+    con.close()
@@ -0,0 +1,41 @@
+import duckdb
+import pandas as pd
+import pytest
+from pipeline.db import fetch, loader
+from pipeline.db.offline import Recorder, Replay, SyntheticLeague
+
+def test_synthetic_league_is_deterministic_and_consistent(synthetic):
+    """Test that a synthetic league repeats itself and loads with team totals matching its games."""
+    again = SyntheticLeague(teams=6, seasons=(2024,), games=30, players=4)
+    pd.testing.assert_frame_equal(synthetic.schedule_and_record(2024, 'ATL'), again.schedule_and_record(2024, 'ATL'))
+    assert not synthetic.team_batting(2024).equals(SyntheticLeague(teams=6, games=30, seed=1).team_batting(2024))
+
+    con = duckdb.connect()
+    loader.load([2024], con=con, teams=synthetic.teams, min_interval=0)
+    assert con.execute("SELECT COUNT(*) FROM raw.games").fetchone()[0] == 6 * 30 // 2
+    mismatched = con.execute("""
+        WITH runs AS (
+            SELECT home_team AS team, home_runs AS runs FROM raw.games
+            UNION ALL
+            SELECT away_team, away_runs FROM raw.games
+        )
+        SELECT COUNT(*) FROM raw.pybaseball_team_batting b
+        JOIN (SELECT team, SUM(runs) AS runs FROM runs GROUP BY team) r USING (team)
+        WHERE b.r != r.runs
+    """).fetchone()[0]
+    assert mismatched == 0
+    # Every synthetic player resolves through the register
+    assert con.execute("SELECT COUNT(*) FROM raw.pybaseball_player_batting").fetchone()[0] == 6 * 2
+    assert con.execute("SELECT COUNT(*) FROM features.team_rolling").fetchone()[0] == 6 * 30
+    con.close()
+
+def test_recorded_responses_replay(tmp_path):
+    """Test that a recorded call replays the same frame and an unrecorded one fails loudly."""
+    league = SyntheticLeague(teams=4, games=10)
+    recorded = Recorder(league, str(tmp_path)).schedule_and_record(2024, 'ATL')
+    replay = Replay(str(tmp_path))
+    pd.testing.assert_frame_equal(replay.schedule_and_record(2024, 'ATL'), recorded, check_dtype=False)
+    with pytest.raises(FileNotFoundError):
+        replay.schedule_and_record(2024, 'LAD')
+    with pytest.raises(ValueError):
+        fetch.backend_from_spec('bogus')
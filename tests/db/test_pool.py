@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pipeline.db import sdk
+from pipeline.db.pool import ConnectionPool
+
+@pytest.fixture
+def database(tmp_path):
+    """Fixture providing a bootstrapped database file with a few team rows."""
+    path = str(tmp_path / 'baseball.duckdb')
+    pool = ConnectionPool(path)
+    with pool.cursor() as con:
+        con.execute("INSERT INTO raw.pybaseball_team_batting (season, team, obp) VALUES (2024, 'LAD', 0.335), (2024, 'NYY', 0.331)")
+    pool.close()
+    return path
+
+def test_cursors_serve_concurrent_requests(database):
+    """Test that many threads query through the pool at once and idle cursors are reused."""
+    pool = ConnectionPool(database, read_only=True, size=4)
+
+    def count(_):
+        with pool.cursor() as con:
+            return con.execute("SELECT COUNT(*) FROM raw.pybaseball_team_batting").fetchone()[0]
+
+    with ThreadPoolExecutor(max_workers=8) as workers:
+        assert list(workers.map(count, range(32))) == [2] * 32
+    assert pool._idle.qsize() <= 4
+    pool.close()
+    with pytest.raises(RuntimeError):
+        with pool.cursor():
+            pass
+
+def test_sdk_lifecycle(database):
+    """Test that the SDK opens a configured read-only pool, answers queries from threads and shuts down."""
+    sdk.init(database, read_only=True, pool_size=2)
+    try:
+        with pytest.raises(RuntimeError):
+            sdk.init(database)
+        query = "SELECT obp FROM raw.pybaseball_team_batting WHERE team = ?"
+        with ThreadPoolExecutor(max_workers=4) as workers:
+            frames = list(workers.map(lambda team: sdk.BaseballSDK.execute_query(query, [team]), ['LAD', 'NYY'] * 4))
+        assert [round(f['obp'].iloc[0], 3) for f in frames[:2]] == [0.335, 0.331]
+    finally:
+        sdk.shutdown()
+    assert sdk._pool is None
+
+def test_execute_query_formats(database):
+    """Test that execute_query returns Arrow, Polars and bounded record-batch streams, releasing cursors."""
+    pa = pytest.importorskip('pyarrow')
+    sdk.init(database, read_only=True, pool_size=1)
+    try:
+        query = "SELECT range AS n FROM range(10)"
+        assert isinstance(sdk.BaseballSDK.execute_query(query, format='arrow'), pa.Table)
+        batches = list(sdk.BaseballSDK.execute_query(query, format='batches', batch_size=4))
+        assert [b.num_rows for b in batches] == [4, 4, 2]
+        # An abandoned stream gives its cursor back, so the single-slot pool is not exhausted
+        stream = sdk.BaseballSDK.execute_query(query, format='batches', batch_size=4)
+        next(stream)
+        stream.close()
+        assert len(sdk.BaseballSDK.execute_query(query)) == 10
+        with pytest.raises(ValueError):
+            sdk.BaseballSDK.execute_query(query, format='csv')
+        pytest.importorskip('polars')
+        assert sdk.BaseballSDK.execute_query(query, format='polars')['n'].sum() == 45
+    finally:
+        sdk.shutdown()
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from pipeline.db import lines, pricing
+
+def test_devig_methods():
+    """Test that every method returns fair probabilities summing to 1 and treats favourites as documented."""
+    implied = pricing.implied_probability(pricing.american_to_decimal(np.array([[-110, -110], [-300, 240]])))
+    assert implied[0] == pytest.approx([110 / 210, 110 / 210])
+    fair = {method: pricing.devig(implied, method) for method in pricing.DEVIG_METHODS}
+    for probs in fair.values():
+        assert probs.sum(axis=1) == pytest.approx([1, 1])
+        assert probs[0] == pytest.approx([0.5, 0.5])
+    # Power and Shin both move more of the margin onto the longshot than proportional scaling does
+    assert fair['power'][1, 0] > fair['multiplicative'][1, 0]
+    assert fair['shin'][1, 0] > fair['multiplicative'][1, 0]
+    with pytest.raises(ValueError):
+        pricing.devig(implied, 'additive')
+
+def test_ev_and_kelly():
+    """Test expected value and fractional Kelly at even money."""
+    assert pricing.expected_value(0.55, 2.0) == pytest.approx(0.10)
+    assert pricing.kelly_stake(np.array([0.55, 0.45]), 2.0, fraction=0.5) == pytest.approx([0.05, 0.0])
+
+def test_reprice_writes_market_edges(con):
+    """Test that a day's latest lines are priced against model probabilities and upserted."""
+    start = datetime(2024, 9, 29, 12)
+    lines.append_snapshots(con, pd.DataFrame({
+        'game_id': ['LAD202409290', 'LAD202409290', 'LAD202409290', 'NYY202409290'],
+        'book': ['fanduel', 'fanduel', 'pinnacle', 'pinnacle'],
+        'market': 'moneyline',
+        'captured_at': [start, start + timedelta(hours=2), start, start],
+        'line': None,
+        'home_price': [-150, -185, -170, 120],
+        'away_price': [130, 160, 150, -140],
+    }))
+    model = pd.DataFrame({'game_id': ['LAD202409290'], 'home_prob': [0.70]})
+    assert pricing.reprice(con, start + timedelta(hours=3), model_probs=model, method='multiplicative') == 6
+    edges = con.execute("SELECT * FROM features.market_edges ORDER BY game_id, book, side").fetchdf()
+    fanduel_home = edges[(edges['book'] == 'fanduel') & (edges['side'] == 'home')].iloc[0]
+    assert fanduel_home['price'] == -185  # latest line, not the first
+    expected_fair = (1 / (1 + 100 / 185)) / (1 / (1 + 100 / 185) + 1 / 2.6)
+    assert fanduel_home['fair_prob'] == pytest.approx(expected_fair)
+    assert fanduel_home['ev'] == pytest.approx(0.70 * (1 + 100 / 185) - 1)
+    assert edges.loc[edges['game_id'] == 'NYY202409290', 'model_prob'].isna().all()
+
+    assert pricing.reprice(con, start + timedelta(hours=3), model_probs=model) == 6
+    assert con.execute("SELECT COUNT(*) FROM features.market_edges").fetchone()[0] == 6
@@ -0,0 +1,47 @@
+import pytest
+from pipeline.db.refresh import DERIVED_TABLES, mark_dirty, refresh
+from tests.db.conftest import fake_games, insert
+
+@pytest.fixture
+def con(con):
+    """Fixture seeding two teams into the bootstrapped database's raw layer and deriving the rest."""
+    con.execute("INSERT INTO raw.pybaseball_team_batting VALUES (2024, 'LAD', 162, 5500, 842, 1400, 233, 800, 136, 0.335, 0.446), (2024, 'NYY', 162, 5400, 815, 1350, 237, 780, 88, 0.331, 0.438);")
+    con.execute("INSERT INTO raw.pybaseball_team_pitching VALUES (2024, 'LAD', 98, 64, 3.90, 1450.0, 1500, 1.20, 3.95), (2024, 'NYY', 94, 68, 3.74, 1440.0, 1450, 1.19, 3.90);")
+    refresh(con, full=True)
+    return con
+
+def snapshot(con):
+    """Return the contents of every derived table, sorted for comparison."""
+    return {t.name: sorted(con.execute(f"SELECT * FROM {t.name}").fetchall(), key=str) for t in DERIVED_TABLES}
+
+def test_incremental_matches_full_rebuild(con):
+    """Test that refreshing only dirty partitions yields the same tables as a full rebuild."""
+    con.execute("CREATE TEMP TABLE new_batting AS SELECT 2024 AS season, 'BOS' AS team, 162 AS g, 5500 AS ab, 751 AS r, 1400 AS h, 194 AS hr, 720 AS rbi, 142 AS sb, 0.319 AS obp, 0.427 AS slg;")
+    con.execute("CREATE TEMP TABLE new_pitching AS SELECT 2024 AS season, 'BOS' AS team, 81 AS w, 81 AS l, 4.04 AS era, 1440.0 AS ip, 1400 AS so, 1.27 AS whip, 4.10 AS fip;")
+    con.execute("INSERT INTO raw.pybaseball_team_batting SELECT * FROM new_batting;")
+    con.execute("INSERT INTO raw.pybaseball_team_pitching SELECT * FROM new_pitching;")
+    con.execute("UPDATE raw.pybaseball_team_batting SET r = 900 WHERE team = 'LAD';")
+    con.execute("CREATE TEMP TABLE changed AS SELECT 2024 AS season, 'LAD' AS team;")
+    mark_dirty(con, 'raw.pybaseball_team_batting', 'new_batting')
+    mark_dirty(con, 'raw.pybaseball_team_pitching', 'new_pitching')
+    mark_dirty(con, 'raw.pybaseball_team_batting', 'changed')
+
+    assert refresh(con) > 0
+    incremental = snapshot(con)
+    refresh(con, full=True)
+    assert incremental == snapshot(con), "Incremental refresh diverged from full rebuild."
+    assert con.execute("SELECT COUNT(*) FROM meta.dirty_partitions").fetchone()[0] == 0
+
+def test_clean_partitions_untouched(con):
+    """Test that a refresh with nothing dirty does no work."""
+    assert refresh(con) == 0
+
+def test_games_refresh_team_rolling_from_dirty_partitions(con):
+    """Test that games written to raw.games are carried into features.team_rolling by refresh alone."""
+    insert(con, fake_games())
+    assert refresh(con) > 0
+    incremental = snapshot(con)
+    assert incremental['features.team_rolling'], "Dirty raw.games partitions should reach team_rolling."
+    refresh(con, full=True)
+    assert incremental == snapshot(con)
+    assert refresh(con) == 0
@@ -0,0 +1,46 @@
+import duckdb
+import pandas as pd
+import pytest
+from pipeline.db import fetch
+from pipeline.db.register import PlayerRegister, normalize_name
+
+CHADWICK_SAMPLE = pd.DataFrame({
+    'name_last': ['Trout', 'Acuña', 'Smith', 'Smith'],
+    'name_first': ['Mike', 'Ronald', 'Will', 'Will'],
+    'key_mlbam': [545361, 660670, 669257, 519293],
+    'key_retro': ['troum001', 'acunr001', 'smitw003', 'smitw002'],
+    'key_bbref': ['troutmi01', 'acunaro01', 'smithwi05', 'smithwi04'],
+    'key_fangraphs': [10155, 18401, 19197, -1],
+    'mlb_played_first': [2011, 2018, 2019, 2012],
+    'mlb_played_last': [2024, 2024, 2024, 2023],
+})
+
+@pytest.fixture
+def register(monkeypatch):
+    """Fixture providing a register loaded from a small in-memory Chadwick sample."""
+    monkeypatch.setattr(fetch, 'chadwick_register', lambda: CHADWICK_SAMPLE.copy())
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA raw;")
+    yield PlayerRegister(con)
+    con.close()
+
+def test_normalize_name():
+    """Test that accents, punctuation and suffixes are stripped."""
+    assert normalize_name("Ronald Acuña Jr.") == 'ronald acuna'
+    assert normalize_name("  Mike   TROUT ") == 'mike trout'
+
+def test_lookup_returns_all_ids(register):
+    """Test that a single probe returns MLBAM, FanGraphs and BBRef IDs."""
+    ids = register.lookup('Mike Trout')
+    assert (ids.mlbam, ids.fangraphs, ids.bbref) == (545361, 10155, 'troutmi01')
+
+def test_lookup_prefers_most_recent_player(register):
+    """Test that duplicate names resolve to the most recently active player."""
+    assert register.lookup('Will Smith').mlbam == 669257
+
+def test_resolve_ids_vectorized(register):
+    """Test bulk resolution, including fuzzy and unresolved names, preserves input order."""
+    df = register.resolve_ids(['Ronald Acuna Jr.', 'Mik Trou', 'Nobody Atall'])
+    assert list(df['player_name']) == ['Ronald Acuna Jr.', 'Mik Trou', 'Nobody Atall']
+    assert list(df['match'].fillna('none')) == ['exact', 'fuzzy', 'none']
+    assert df['key_mlbam'].iloc[1] == 545361
@@ -0,0 +1,48 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from pipeline.db import rolling
+from tests.db.conftest import FAKE_TEAMS, fake_games, insert
+
+def test_rolling_matches_pandas(con):
+    """Test window and EWMA features against a pandas shift-then-roll of each team's played games."""
+    insert(con, fake_games())
+    rolling.update_team_rolling(con)
+    stored = con.execute("SELECT * FROM features.team_rolling ORDER BY team, game_date").fetchdf()
+    for (team, season), rows in stored.groupby(['team', 'season']):
+        played = rows.dropna(subset=['runs_for']).reset_index(drop=True)
+        win = (played['runs_for'] > played['runs_against']).astype(float)
+        expected = pd.DataFrame({
+            'win_pct_l10': win.rolling(10, min_periods=1).mean(),
+            'runs_for_l30': played['runs_for'].astype(float).rolling(30, min_periods=1).mean(),
+            'runs_against_ewm': played['runs_against'].astype(float).ewm(halflife=10).mean(),
+        }).shift(1)
+        actual = played[expected.columns].astype(float)
+        assert np.allclose(actual, expected, equal_nan=True), f"{team} {season} diverged from pandas."
+        # Scheduled games carry the form after the team's last played game
+        upcoming = rows[rows['runs_for'].isna()]
+        if not upcoming.empty:
+            assert (upcoming['games_played'] == len(played)).all()
+            assert np.allclose(upcoming['win_pct'], win.mean())
+
+def test_incremental_update_keeps_past_rows(con):
+    """Test that recording results rewrites only later rows and matches a full rebuild."""
+    games = fake_games()
+    insert(con, games)
+    rolling.update_team_rolling(con)
+    assert rolling.update_team_rolling(con) == 0, "Nothing changed, nothing should be rewritten."
+    before = con.execute("SELECT * FROM features.team_rolling WHERE game_date < '2024-05-21'").fetchall()
+
+    results = games[games['game_date'] == date(2024, 5, 21)].assign(home_runs=4, away_runs=2)
+    insert(con, results)
+    rewritten = rolling.update_team_rolling(con)
+    assert 0 < rewritten <= len(FAKE_TEAMS) * 10
+    assert con.execute("SELECT * FROM features.team_rolling WHERE game_date < '2024-05-21'").fetchall() == before
+    incremental = con.execute("SELECT * FROM features.team_rolling ORDER BY game_id, team").fetchall()
+    rolling.update_team_rolling(con, full=True)
+    assert incremental == con.execute("SELECT * FROM features.team_rolling ORDER BY game_id, team").fetchall()
+
+    frame = rolling.game_features(con, seasons=[2024])
+    assert len(frame) == len(games[games['season'] == 2024])
+    assert frame['home_win'].isna().sum() == 2 * 9
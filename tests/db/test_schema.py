@@ -0,0 +1,57 @@
+import duckdb
+import pytest
+from pipeline.db import schema
+from pipeline.db.schema import bootstrap, expected_versions
+
+def test_bootstrap_is_noop_when_current():
+    """Test that a second bootstrap only probes the catalog and applies nothing."""
+    con = duckdb.connect()
+    assert bootstrap(con) is True, "First bootstrap should create the schema."
+    assert bootstrap(con) is False, "Bootstrap should be a no-op when versions are current."
+    recorded = dict(con.execute("SELECT object_name, sql_hash FROM meta.schema_versions").fetchall())
+    assert recorded == expected_versions()
+    con.close()
+
+def test_bootstrap_rebuilds_changed_table_and_dependents():
+    """Test that a changed derived-table hash rebuilds that table and everything downstream of it only."""
+    con = duckdb.connect()
+    bootstrap(con)
+    con.execute("UPDATE meta.schema_versions SET sql_hash = 'stale' WHERE object_name = 'processed.pybaseball_team_batting';")
+    before = dict(con.execute("SELECT object_name, applied_at FROM meta.schema_versions").fetchall())
+    assert bootstrap(con) is True
+    after = dict(con.execute("SELECT object_name, applied_at FROM meta.schema_versions").fetchall())
+    rebuilt = {name for name in after if after[name] != before[name]}
+    assert rebuilt == {'processed.pybaseball_team_batting', 'features.team_features'}
+    con.close()
+
+def test_team_rolling_is_versioned_on_its_select():
+    """Test that features.team_rolling is a derived table, rebuilt from raw.games when its SQL hash changes."""
+    con = duckdb.connect()
+    bootstrap(con)
+    assert 'features.team_rolling' not in schema.BASE_TABLES
+    con.execute("INSERT INTO raw.games (game_id, season, game_date, game_num, home_team, away_team) "
+                "VALUES ('LAD202406010', 2024, '2024-06-01', 0, 'LAD', 'NYY')")
+    con.execute("UPDATE meta.schema_versions SET sql_hash = 'stale' WHERE object_name = 'features.team_rolling';")
+    assert bootstrap(con) is True
+    assert con.execute("SELECT COUNT(*) FROM features.team_rolling").fetchone()[0] == 2
+    assert bootstrap(con) is False
+    con.close()
+
+def test_bootstrap_migrates_base_tables_or_refuses(monkeypatch):
+    """Test that a column added to a base table's DDL is applied, while any other change raises unrecorded."""
+    con = duckdb.connect()
+    bootstrap(con)
+    con.execute("INSERT INTO raw.pybaseball_team_batting (season, team, r) VALUES (2024, 'LAD', 842)")
+    ddl = schema.BASE_TABLES['raw.pybaseball_team_batting']
+    monkeypatch.setitem(schema.BASE_TABLES, 'raw.pybaseball_team_batting',
+                        ddl.replace("    PRIMARY KEY", "    bb INTEGER DEFAULT 0,\n    PRIMARY KEY"))
+    assert bootstrap(con) is True
+    assert con.execute("SELECT r, bb FROM raw.pybaseball_team_batting").fetchall() == [(842, 0)]
+    assert bootstrap(con) is False
+
+    monkeypatch.setitem(schema.BASE_TABLES, 'raw.pybaseball_team_batting', ddl.replace("g INTEGER", "g DOUBLE"))
+    with pytest.raises(RuntimeError, match='raw.pybaseball_team_batting'):
+        bootstrap(con)
+    recorded = dict(con.execute("SELECT object_name, sql_hash FROM meta.schema_versions").fetchall())
+    assert recorded['raw.pybaseball_team_batting'] != schema.expected_versions()['raw.pybaseball_team_batting']
+    con.close()
@@ -0,0 +1,31 @@
+from datetime import date
+
+import numpy as np
+import pytest
+from pipeline.db import rolling
+from tests.db.conftest import FAKE_TEAMS, fake_games, insert
+
+def test_slate_scorer_batches_predictions(con, tmp_path):
+    """Test that a saved booster scores a slate and the home/away matrix in single batched calls."""
+    xgb = pytest.importorskip('xgboost')
+    from pipeline.db.scoring import FEATURES, SlateScorer
+    insert(con, fake_games())
+    rolling.update_team_rolling(con)
+    train = rolling.game_features(con, seasons=[2023])
+    booster = xgb.train({'objective': 'binary:logistic', 'max_depth': 2},
+                        xgb.DMatrix(train[FEATURES].astype(float), label=train['home_win'].astype(float),
+                                    feature_names=FEATURES), num_boost_round=5)
+    path = str(tmp_path / 'model.json')
+    booster.save_model(path)
+
+    scorer = SlateScorer(path)
+    slate = scorer.score_slate(con, date(2024, 5, 25))
+    assert len(slate) == 2 and slate['home_prob'].between(0, 1).all()
+    one_by_one = [booster.predict(xgb.DMatrix(row[FEATURES].astype(float).to_frame().T, feature_names=FEATURES))[0]
+                  for _, row in rolling.game_features(con, game_date=date(2024, 5, 25)).iterrows()]
+    assert np.allclose(slate['home_prob'], one_by_one, atol=1e-6)
+
+    matrix = scorer.score_matrix(con, date(2024, 5, 25))
+    assert len(matrix) == len(FAKE_TEAMS) * (len(FAKE_TEAMS) - 1)
+    with pytest.raises(ValueError):
+        scorer.predict(slate)
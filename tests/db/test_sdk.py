@@ -3,16 +3,23 @@ from pipeline.db.sdk import BaseballSDK
 import duckdb
 
 @pytest.fixture(scope="module")
-def setup_db():
-    """Fixture to ensure database is set up before tests (call setup if needed)."""
-    from pipeline.db import setup, verify
+def setup_db(tmp_path_factory):
+    """Fixture loading the 2024 fixture responses into a temporary database and pointing the SDK at it."""
+    from pipeline.db import fetch, loader, sdk
+    from pipeline.db.offline import Replay
+    from tests.db.conftest import FIXTURES
+    path = str(tmp_path_factory.mktemp('sdk') / 'baseball.duckdb')
+    previous = fetch.set_backend(Replay(FIXTURES))
     try:
-        setup()
-        verify()  # Ensures integrity; will raise if issues
-    except duckdb.IOException as e:
-        pytest.skip(f"Database is in use: {e}")
-    except Exception as e:
-        pytest.skip(f"Database setup failed: {e}")
+        con = duckdb.connect(path)
+        loader.load([2024], con, teams=('LAD', 'NYY'), min_interval=0)
+        con.close()
+        sdk.shutdown()
+        sdk.init(path)
+        yield
+    finally:
+        sdk.shutdown()
+        fetch.set_backend(previous)
 
 def test_get_player(setup_db):
     """Test fetching player stats for Mike Trout; verifies insertion and basic metrics."""
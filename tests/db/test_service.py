@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import duckdb
+import pytest
+from pipeline.db import service
+
+@pytest.fixture
+def writer(tmp_path):
+    """Fixture providing a writer over a temporary database, queue and snapshot directory."""
+    w = service.Writer(str(tmp_path / 'baseball.duckdb'), str(tmp_path / 'queue'), str(tmp_path / 'snapshots'), keep=2)
+    yield w
+    w.close()
+
+def test_jobs_publish_snapshots_readable_while_writer_holds_lock(writer, offline):
+    """Test that queued jobs run in order, failures are parked, and readers attach the published snapshot."""
+    service.submit('load', writer.queue_dir, seasons=[2024], teams=['LAD', 'NYY'], min_interval=0)
+    service.submit('refresh', writer.queue_dir, bogus=True)
+    with pytest.raises(ValueError):
+        service.submit('drop', writer.queue_dir)
+
+    assert writer.run_once() == 1
+    assert writer.pending() == []
+    assert len(list((Path(writer.queue_dir) / 'failed').iterdir())) == 1
+
+    # The writer still owns baseball.duckdb; the snapshot opens read-only in parallel
+    first = service.latest_snapshot(writer.snapshot_dir)
+    readers = [service.connect_snapshot(writer.snapshot_dir) for _ in range(3)]
+    for con in readers:
+        assert con.execute("SELECT COUNT(*) FROM features.team_features").fetchone()[0] == 2
+        with pytest.raises(duckdb.Error):
+            con.execute("DELETE FROM raw.games")
+        con.close()
+
+    # Each successful batch publishes a new file; an idle pass publishes nothing
+    service.submit('refresh', writer.queue_dir, full=True)
+    assert writer.run_once() == 1
+    assert service.latest_snapshot(writer.snapshot_dir) != first
+    assert writer.run_once() == 0
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+from pipeline.db import fetch, statcast
+from pipeline.db.offline import SyntheticLeague
+
+class Flaky:
+    """Backend failing the first fetch of one window, as an interrupted backfill would."""
+
+    def __init__(self, league, fail_start):
+        self.league, self.fail_start, self.calls = league, fail_start, []
+
+    def statcast(self, start, end):
+        self.calls.append(start)
+        if start == self.fail_start and self.calls.count(start) == 1:
+            raise ConnectionError("connection reset")
+        return self.league.statcast(start, end)
+
+def test_backfill_resumes_from_checkpoints(con, synthetic):
+    """Test that a failed window is the only one refetched and every pitch lands once with narrowed types."""
+    expected = synthetic.statcast('2024-03-01', '2024-05-31')
+    backend = Flaky(synthetic, '2024-04-05')
+    previous = fetch.set_backend(backend)
+    today = date(2024, 6, 1)
+    windows = statcast.season_windows(2024, today=today)
+    # Windows ending within SETTLE_DAYS of today are rewritten by every run until Statcast has settled
+    unsettled = [start.isoformat() for start, end in windows if (today - end).days <= statcast.SETTLE_DAYS]
+    assert len(unsettled) == 2
+    try:
+        first = statcast.ingest_statcast(con, [2024], max_workers=2, today=today)
+        assert first.failures == 1 and first.chunks == len(windows) - 1
+        calls = len(backend.calls)
+        statcast.ingest_statcast(con, [2024], max_workers=2, today=today)
+        assert sorted(backend.calls[calls:]) == ['2024-04-05'] + unsettled
+        assert statcast.ingest_statcast(con, [2024], today=today).chunks == len(unsettled)
+    finally:
+        fetch.set_backend(previous)
+
+    assert con.execute("SELECT COUNT(*) FROM raw.statcast").fetchone()[0] == len(expected)
+    types = dict(con.execute("SELECT column_name, data_type FROM information_schema.columns "
+                             "WHERE table_name = 'statcast'").fetchall())
+    assert list(types) == [name for name, _ in statcast._arrow_types()]
+    assert types['pitch_number'] == 'TINYINT' and types['stand'].startswith('ENUM')
+    hits = con.execute("SELECT COUNT(*), ROUND(AVG(launch_speed), 1) FROM raw.statcast WHERE type = 'X'").fetchone()
+    assert hits == (expected['type'].eq('X').sum(), round(expected.loc[expected['type'] == 'X', 'launch_speed'].mean(), 1))
+
+def test_narrowing_rejects_values_that_do_not_fit(synthetic):
+    """Test that an out-of-range value fails the conversion rather than wrapping around."""
+    frame = synthetic.statcast('2024-03-28', '2024-03-28')
+    assert statcast.to_arrow(frame).num_rows == len(frame)
+    frame.loc[0, 'balls'] = 300
+    with pytest.raises(Exception):
+        statcast.to_arrow(frame)
+
+def test_full_refetch_only_forgets_requested_seasons(con):
+    """Test that --full drops the checkpoints of the requested seasons and keeps those of seasons in between."""
+    for season in (2019, 2021, 2024):
+        con.execute("INSERT INTO meta.statcast_chunks (start_date, end_date, rows) VALUES ($start, $end, 0)",
+                    {'start': date(season, 3, 1), 'end': date(season, 11, 30)})
+    previous = fetch.set_backend(SyntheticLeague(teams=2, seasons=(2019, 2024), games=1))
+    try:
+        statcast.ingest_statcast(con, [2019, 2024], full=True, today=date(2025, 1, 1))
+    finally:
+        fetch.set_backend(previous)
+    kept = con.execute("SELECT year(start_date), COUNT(*) FROM meta.statcast_chunks GROUP BY ALL ORDER BY 1").fetchall()
+    assert kept[1] == (2021, 1)
+    assert kept[0][1] == kept[2][1] == len(statcast.season_windows(2019))
@@ -0,0 +1,93 @@
+import duckdb
+import pytest
+from pipeline.db import fetch, loader, sdk, trace
+from pipeline.db.sdk import BaseballSDK
+
+@pytest.fixture
+def tracing():
+    """Fixture enabling tracing with an empty buffer, disabled again afterwards."""
+    trace.clear()
+    trace.enable()
+    yield
+    trace.disable()
+    trace.clear()
+
+@pytest.fixture
+def db(offline, tmp_path):
+    """Fixture loading the 2024 fixture responses into a temporary database behind the SDK."""
+    path = str(tmp_path / 'baseball.duckdb')
+    con = duckdb.connect(path)
+    loader.load([2024], con, teams=('LAD', 'NYY'), min_interval=0)
+    con.close()
+    sdk.init(path)
+    yield path
+    sdk.shutdown()
+
+def test_disabled_tracer_records_nothing(db):
+    """Test that calls made while tracing is off leave no spans and get untraced connections."""
+    trace.clear()
+    BaseballSDK.get_team_batting('LAD')
+    assert trace.spans().empty
+    con = duckdb.connect()
+    assert trace.connection(con) is con
+    con.close()
+
+def test_spans_nest_fetches_and_statements_under_sdk_calls(db, tracing, tmp_path):
+    """Test that SDK calls, their SQL and their fetches are timed, sized, nested, exported and logged."""
+    fetch.clear_cache()
+    sdk.shutdown()
+    sdk.init(db)
+    # Drop Trout's processed row so get_player must fetch the leaderboard and write it back
+    with sdk._get_pool().cursor() as con:
+        con.execute("DELETE FROM raw.pybaseball_player_batting; DELETE FROM processed.pybaseball_player_batting")
+    assert BaseballSDK.get_player('Mike Trout').hr == 10
+    assert len(BaseballSDK.execute_query("SELECT * FROM processed.pybaseball_team_batting", format='arrow')) == 2
+
+    spans = trace.spans()
+    outer = spans[spans['name'] == 'BaseballSDK.get_player'].iloc[0]
+    inner = spans[spans['name'] == 'BaseballSDK.get_players'].iloc[0]
+    assert inner['parent_id'] == outer['span_id'] and outer['seconds'] >= inner['seconds']
+    leaderboard = spans[(spans['kind'] == 'fetch') & (spans['name'] == 'batting_stats')].iloc[0]
+    assert leaderboard['parent_id'] == inner['span_id'] and leaderboard['rows'] == 3 and leaderboard['bytes'] > 0
+    query = spans[(spans['kind'] == 'sql') & spans['name'].str.startswith('SELECT * FROM processed.pybaseball_team')]
+    assert query['rows'].tolist() == [2]
+    assert (spans.loc[spans['kind'] == 'sql', 'parent_id'].notna()).all()
+
+    summary = trace.summary()
+    assert set(summary['kind']) == {'sdk', 'sql', 'fetch'} and summary['calls'].sum() == len(spans)
+    histograms = trace.histograms()
+    totals = histograms.groupby(['kind', 'name'])['count'].max()
+    assert totals.sum() == len(spans) and (histograms['le'] == float('inf')).sum() == len(summary)
+    assert 'baseball_call_seconds_bucket{kind="sdk",name="BaseballSDK.get_player",le="+Inf"} 1' in trace.prometheus()
+
+    con = duckdb.connect(str(tmp_path / 'log.duckdb'))
+    from pipeline.db.schema import bootstrap
+    bootstrap(con)
+    assert trace.flush(con) == len(spans)
+    assert trace.flush(con) == 0
+    assert con.execute("SELECT COUNT(*) FROM meta.query_log").fetchone()[0] == len(spans)
+    con.close()
+
+def test_profile_hook_dumps_outermost_sdk_calls(db, tmp_path):
+    """Test that the opt-in cProfile hook writes one profile per outermost SDK call."""
+    trace.enable(profile_dir=str(tmp_path / 'profiles'))
+    try:
+        BaseballSDK.get_team_batting('LAD')
+    finally:
+        trace.disable()
+        trace.clear()
+    assert [p.name.split('-')[0] for p in (tmp_path / 'profiles').iterdir()] == ['BaseballSDK.get_team_batting']
+
+def test_batch_streams_are_recorded_when_they_end(db, tracing):
+    """Test that a 'batches' query is one span covering its whole stream, recorded on exhaustion or close."""
+    query = "SELECT range AS n FROM range(10)"
+    stream = BaseballSDK.execute_query(query, format='batches', batch_size=4)
+    assert trace.spans('sdk').empty, "Nothing has been streamed yet."
+    assert sum(batch.num_rows for batch in stream) == 10
+    abandoned = BaseballSDK.execute_query(query, format='batches', batch_size=4)
+    next(abandoned)
+    abandoned.close()
+
+    spans = trace.spans('sdk')
+    assert spans['name'].tolist() == ['BaseballSDK.execute_query'] * 2
+    assert spans['rows'].tolist() == [10, 4] and (spans['bytes'] > 0).all() and spans['error'].isna().all()
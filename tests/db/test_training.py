@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from pipeline.db import rolling, training
+from tests.db.conftest import fake_games, insert
+
+def test_walk_forward_splits_never_train_on_the_future():
+    """Test that each fold trains only on games before its test window and folds tile the later games."""
+    days = np.repeat(np.arange(100), 3).astype(float)
+    splits = training.walk_forward_splits(days, test_days=10, min_train_games=60, gap_days=2)
+    assert len(splits) == 8
+    for train, test in splits:
+        assert days[train].max() < days[test].min() - 2
+        assert days[test].max() - days[test].min() < 10
+    assert np.array_equal(np.concatenate([np.arange(300)[test] for _, test in splits]), np.arange(60, 300))
+
+def test_search_records_every_fold(con, tmp_path):
+    """Test that parallel trials read the shared matrix and match a serial run, fold for fold."""
+    pytest.importorskip('xgboost')
+    games = fake_games()
+    insert(con, games)
+    rolling.update_team_rolling(con)
+    played = games.dropna(subset=['home_runs'])
+    con.execute("""
+        INSERT INTO raw.odds (game_id, season, game_date, moneyline_home, moneyline_away)
+        SELECT game_id, season, game_date, -130, 110 FROM raw.games WHERE home_runs IS NOT NULL
+    """)
+    trials = [{'max_depth': 2, 'eta': 0.3, 'num_boost_round': 5}, {'max_depth': 3, 'eta': 0.1, 'num_boost_round': 5}]
+    kwargs = dict(trials=trials, test_days=20, min_train_games=60, min_edge=0.0)
+    parallel = training.search(con, max_workers=2, run_id='parallel', **kwargs)
+    serial = training.search(con, max_workers=1, run_id='serial', **kwargs)
+
+    folds = parallel['fold'].nunique()
+    assert len(parallel) == len(trials) * folds
+    assert parallel['test_games'].sum() == len(trials) * (len(played) - 60)
+    assert np.allclose(parallel['log_loss'], serial['log_loss']) and np.allclose(parallel['brier'], serial['brier'])
+    assert (parallel['bets'] > 0).all() and parallel['roi'].notna().all()
+    assert con.execute("SELECT COUNT(*) FROM meta.backtest_results").fetchone()[0] == 2 * len(parallel)
+    assert len(training.summarize(parallel)) == len(trials)
+
+    booster = training.train_model(con, trials[0], str(tmp_path / 'model.json'))
+    assert booster.feature_names == training.FEATURES
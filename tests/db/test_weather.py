@@ -0,0 +1,157 @@
+import json
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+from pipeline.db import weather
+from pipeline.db.cache import ParquetCache
+from tests.db.conftest import insert
+
+def stub_temperature(latitude, hour):
+    return round(latitude / 2 + hour.hour / 10, 2)
+
+@pytest.fixture
+def stub():
+    """Fixture serving Open-Meteo-shaped hourly responses from localhost and recording each request.
+
+    Setting `limits['last_forecast_day']` makes the forecast endpoint reject later end dates, as Open-Meteo does.
+    """
+    requests = []
+    limits = {'last_forecast_day': None}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            requests.append((url.path, query))
+            start, end = date.fromisoformat(query['start_date']), date.fromisoformat(query['end_date'])
+            if url.path.endswith('/forecast') and limits['last_forecast_day'] and end > limits['last_forecast_day']:
+                body = json.dumps({'error': True, 'reason': 'Parameter end_date is out of allowed range'}).encode()
+                self.send_response(400)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            hours = [datetime(start.year, start.month, start.day) + timedelta(hours=h)
+                     for h in range(24 * ((end - start).days + 1))]
+            latitude = float(query['latitude'])
+            hourly = {'time': [h.strftime('%Y-%m-%dT%H:%M') for h in hours],
+                      'temperature_2m': [stub_temperature(latitude, h) for h in hours]}
+            hourly.update({name: [1.0] * len(hours) for name in query['hourly'].split(',') if name not in hourly})
+            body = json.dumps({'hourly': hourly}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    yield {'archive': f"{base}/v1/archive", 'forecast': f"{base}/v1/forecast"}, requests, limits
+    server.shutdown()
+
+def test_weather_batches_requests_caches_past_dates_and_skips_domes(con, stub, tmp_path):
+    """Test one request per park and run of dates, none for domes, and permanent caching once dates pass."""
+    urls, requests, _ = stub
+    games = [('LAD', date(2024, 6, 1), 'N'), ('LAD', date(2024, 6, 2), 'N'), ('NYY', date(2024, 6, 1), 'D'),
+             ('LAD', date(2024, 6, 20), 'D'), ('TBR', date(2024, 6, 1), 'N'), ('NYM', date(2024, 7, 5), 'N')]
+    insert(con, pd.DataFrame([(f"{team}{day:%Y%m%d}0", 2024, day, 0, team, 'ATL', None, None, None, dn)
+                              for team, day, dn in games],
+                             columns=['game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+                                      'home_runs', 'away_runs', 'innings', 'day_night']))
+    run = dict(urls=urls, today=date(2024, 7, 5), cache=ParquetCache(str(tmp_path)))
+
+    assert weather.update_weather(con, **run) == 6
+    assert sorted(path for path, _ in requests) == ['/v1/archive'] * 3 + ['/v1/forecast']
+    rows = con.execute("SELECT * FROM raw.weather ORDER BY game_id").fetchdf().set_index('game_id')
+    assert rows.loc['TBR202406010', 'source'] == 'dome' and pd.isna(rows.loc['TBR202406010', 'temperature_c'])
+    assert rows.loc['NYY202406010', 'temperature_c'] == stub_temperature(40.8296, datetime(2024, 6, 1, 13))
+    assert rows.loc['LAD202406020', 'game_hour'] == datetime(2024, 6, 2, 19)
+    assert rows.loc['NYM202407050', 'source'] == 'forecast'
+
+    # Only the forecast is pending, and it is still fresh in the cache
+    assert weather.update_weather(con, **run) == 1 and len(requests) == 4
+    # After a restart, archived park-days come from disk; the finished game is still only in the forecast
+    con.execute("DELETE FROM raw.weather WHERE game_id LIKE 'LAD%'")
+    run.update(today=date(2024, 7, 6), cache=ParquetCache(str(tmp_path)))
+    assert weather.update_weather(con, **run) == 4 and len(requests) == 4
+    assert con.execute("SELECT source FROM raw.weather WHERE game_id = 'NYM202407050'").fetchone()[0] == 'forecast'
+    # Once the archive has the date, it is fetched from there and settles as observed
+    run.update(today=date(2024, 7, 11))
+    assert weather.update_weather(con, **run) == 1 and requests[-1][0] == '/v1/archive'
+    assert con.execute("SELECT source FROM raw.weather WHERE game_id = 'NYM202407050'").fetchone()[0] == 'observed'
+    assert weather.update_weather(con, **run) == 0
+
+def test_recent_past_days_stay_forecasts_until_archived(con, stub, tmp_path):
+    """Test that a past day inside the archive lag is cached and stored as a forecast, not as observed."""
+    urls, requests, _ = stub
+    insert(con, pd.DataFrame([('LAD202406300', 2024, date(2024, 6, 30), 0, 'LAD', 'ATL', 3, 2, 9, 'N')],
+                             columns=['game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+                                      'home_runs', 'away_runs', 'innings', 'day_night']))
+    cache = ParquetCache(str(tmp_path))
+    assert weather.update_weather(con, urls=urls, today=date(2024, 7, 2), cache=cache) == 1
+    assert [path for path, _ in requests] == ['/v1/forecast']
+    assert con.execute("SELECT source FROM raw.weather").fetchone()[0] == 'forecast'
+    assert cache.contains('hourly', 'LOS03_2024-06-30_forecast') and not cache.contains('hourly', 'LOS03_2024-06-30_final')
+    assert weather.update_weather(con, urls=urls, today=date(2024, 7, 8), cache=cache) == 1
+    assert [path for path, _ in requests] == ['/v1/forecast', '/v1/archive']
+    assert con.execute("SELECT source FROM raw.weather").fetchone()[0] == 'observed'
+
+def test_parks_follow_seasons_and_neutral_sites(con, stub, tmp_path):
+    """Test that each game gets its season's home park or neutral site, and weather from the wrong park is redone."""
+    urls, requests, _ = stub
+    games = [('TBR', 'BOS', date(2024, 6, 1)), ('TBR', 'BOS', date(2025, 6, 1)), ('OAK', 'SEA', date(2024, 6, 1)),
+             ('OAK', 'SEA', date(2025, 6, 1)), ('SDP', 'LAD', date(2024, 3, 21)), ('PHI', 'NYM', date(2024, 6, 8)),
+             ('TEX', 'HOU', date(2019, 6, 1)), ('TOR', 'NYY', date(1985, 6, 1))]
+    insert(con, pd.DataFrame([(f"{home}{day:%Y%m%d}0", day.year, day, 0, home, away, None, None, None, 'N')
+                              for home, away, day in games],
+                             columns=['game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+                                      'home_runs', 'away_runs', 'innings', 'day_night']))
+    # Written before parks had seasons: the 2025 Athletics game with Oakland's weather
+    con.execute("""
+        INSERT INTO raw.weather (game_id, season, game_date, park_id, game_hour, roof, temperature_c, source)
+        VALUES ('OAK202506010', 2025, '2025-06-01', 'OAK01', '2025-06-01 19:00', 'open', 15.0, 'observed')
+    """)
+    run = dict(urls=urls, today=date(2025, 7, 1), cache=ParquetCache(str(tmp_path)))
+    assert weather.update_weather(con, **run) == len(games) - 1
+    rows = con.execute("SELECT game_id, park_id, source, temperature_c FROM raw.weather").fetchdf().set_index('game_id')
+    assert rows['park_id'].to_dict() == {
+        'TBR202406010': 'STP01', 'TBR202506010': 'TMP01', 'OAK202406010': 'OAK01', 'OAK202506010': 'SAC01',
+        'SDP202403210': 'SEO01', 'PHI202406080': 'LON01', 'TEX201906010': 'ARL02',
+    }
+    assert rows.loc['TBR202406010', 'source'] == 'dome' and rows.loc['SDP202403210', 'source'] == 'dome'
+    assert rows.loc['TBR202506010', 'source'] == 'observed'
+    assert rows.loc['OAK202506010', 'temperature_c'] == stub_temperature(38.5804, datetime(2025, 6, 1, 19))
+    assert rows.loc['PHI202406080', 'temperature_c'] == stub_temperature(51.5387, datetime(2024, 6, 8, 19))
+    assert len(requests) == 5
+
+def test_games_past_the_forecast_horizon_wait_for_a_later_run(con, stub, tmp_path):
+    """Test that a season's unplayed games beyond the forecast horizon are deferred, not requested."""
+    urls, requests, limits = stub
+    days = [date(2024, 7, 5) + timedelta(days=7 * week) for week in range(12)]
+    insert(con, pd.DataFrame([(f"LAD{day:%Y%m%d}0", 2024, day, 0, 'LAD', 'ATL', None, None, None, 'N') for day in days],
+                             columns=['game_id', 'season', 'game_date', 'game_num', 'home_team', 'away_team',
+                                      'home_runs', 'away_runs', 'innings', 'day_night']))
+    today = date(2024, 7, 5)
+    limits['last_forecast_day'] = today + timedelta(days=weather.FORECAST_HORIZON_DAYS - 1)
+    run = dict(urls=urls, cache=ParquetCache(str(tmp_path)))
+
+    # Today's slate and the two games within the horizon get forecasts; the rest stay pending
+    assert weather.update_weather(con, today=today, **run) == 3
+    assert [(path, q['start_date'], q['end_date']) for path, q in requests] == [
+        ('/v1/forecast', '2024-07-05', '2024-07-19')]
+    assert len(weather.pending_games(con)) == len(days)
+    assert con.execute("SELECT max(game_date) FROM raw.weather").fetchone()[0] == date(2024, 7, 19)
+    # As the season goes on, the July games settle from the archive and later games come into range
+    today = date(2024, 8, 1)
+    limits['last_forecast_day'] = today + timedelta(days=weather.FORECAST_HORIZON_DAYS - 1)
+    assert weather.update_weather(con, today=today, **run) == 7
+    assert sorted(path for path, _ in requests[1:]) == ['/v1/archive', '/v1/forecast']
+    assert con.execute("SELECT max(game_date) FROM raw.weather").fetchone()[0] == date(2024, 8, 16)